@@ -0,0 +1,213 @@
+"""
+End to end throughput, peak memory and tail latency of Downloader.download against the fake site of every driver,
+across concurrency settings. Results are stored as JSON; given a baseline, the regressions are listed and the run
+fails. Run with: python -m benchmarks.download [--images 1 4 16] [--output new.json] [--baseline old.json]
+"""
+
+# Standard Library
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from typing import Any
+
+# Dependencies
+from pydantic import BaseModel
+
+# From apps
+from mangadanga.downloader.config import CatalogConfig, ConcurrencyConfig, MetricsConfig, RetryConfig, StoreConfig
+from mangadanga.downloader.events import EventManager
+from mangadanga.downloader.metrics import Metrics
+
+# Local imports
+from .site import LAYOUTS, FakeMangaSite
+
+# Injected errors are retried at once, and never open the circuit of the only host
+RETRIES = RetryConfig(base_delay=0.01, max_delay=0.05, failure_threshold=1_000_000)
+# Relative change past which a measure is a regression
+TOLERANCE = 0.15
+
+
+class SiteSettings(BaseModel):
+    chapters: int = 4
+    pages: int = 20
+    image_size: int = 64 * 1024
+    latency: float = 0.02
+    bandwidth: int = 0
+    error_rate: float = 0.0
+
+
+class CaseResult(BaseModel):
+    layout: str
+    images: int
+    threads: int
+    elapsed_seconds: float
+    images_per_second: float
+    bytes_per_second: float
+    peak_memory_mib: float
+    chapter_p50: float
+    chapter_p99: float
+    request_p50: float
+    request_p95: float
+    request_p99: float
+    retries: float
+    failed_chapters: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.layout} images={self.images} threads={self.threads}"
+
+
+async def download(layout: str, images: int, threads: int, site: SiteSettings) -> tuple[float, dict[str, Any], int]:
+    """Downloads the fake series into a temporary directory. Returns the elapsed time, metrics and failed chapters"""
+    fake_site = FakeMangaSite(layout, **site.model_dump())
+    async with fake_site:
+        with tempfile.TemporaryDirectory() as path:
+            config = fake_site.config(
+                path=path,
+                threads=threads,
+                concurrency=ConcurrencyConfig(images=images, pages=images, per_host=images),
+                retry=RETRIES,
+                store=StoreConfig(enabled=False),
+                catalog=CatalogConfig(enabled=False),
+            )
+            metrics = Metrics(MetricsConfig(summary=False))
+            downloader = fake_site.driver()(config, EventManager(), metrics=metrics)
+            start = time.perf_counter()
+            report = await downloader.download()
+            elapsed_time = time.perf_counter() - start
+    if report.error is not None:
+        raise RuntimeError(f"{layout}: {report.error}")
+    return elapsed_time, metrics.summary(), len(report.failed)
+
+
+def run_case(layout: str, images: int, threads: int, site: SiteSettings, repetitions: int) -> CaseResult:
+    # The fastest run is the least disturbed by the rest of the machine
+    runs = [asyncio.run(download(layout, images, threads, site)) for _ in range(repetitions)]
+    elapsed_time, summary, failed_chapters = min(runs, key=lambda run: run[0])
+    # Memory is measured on a run of its own, tracemalloc slows down the timed runs
+    tracemalloc.start()
+    try:
+        asyncio.run(download(layout, images, threads, site))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    [host] = summary["hosts"].values()
+    chapter_seconds, request_seconds = summary["chapters"]["seconds"], host["seconds"]
+    return CaseResult(
+        layout=layout,
+        images=images,
+        threads=threads,
+        elapsed_seconds=elapsed_time,
+        images_per_second=summary["images"] / elapsed_time,
+        bytes_per_second=summary["bytes"] / elapsed_time,
+        peak_memory_mib=peak / 2**20,
+        chapter_p50=chapter_seconds.get("p50", 0.0),
+        chapter_p99=chapter_seconds.get("p99", 0.0),
+        request_p50=request_seconds.get("p50", 0.0),
+        request_p95=request_seconds.get("p95", 0.0),
+        request_p99=request_seconds.get("p99", 0.0),
+        retries=summary["retries"],
+        failed_chapters=failed_chapters,
+    )
+
+
+def compare(results: list[CaseResult], baseline: list[CaseResult], tolerance: float = TOLERANCE) -> list[str]:
+    """Regressions of 'results' against the same cases of 'baseline'"""
+    baseline_by_key = {result.key: result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline_by_key.get(result.key)
+        if previous is None:
+            continue
+        if result.images_per_second < previous.images_per_second * (1 - tolerance):
+            regressions.append(
+                f"{result.key}: throughput {previous.images_per_second:.1f} -> {result.images_per_second:.1f} images/s"
+            )
+        if result.request_p99 > previous.request_p99 * (1 + tolerance):
+            regressions.append(
+                f"{result.key}: p99 request latency {previous.request_p99 * 1000:.1f} -> "
+                f"{result.request_p99 * 1000:.1f} ms"
+            )
+        if result.peak_memory_mib > previous.peak_memory_mib * (1 + tolerance):
+            regressions.append(
+                f"{result.key}: peak memory {previous.peak_memory_mib:.1f} -> {result.peak_memory_mib:.1f} MiB"
+            )
+        if result.failed_chapters > previous.failed_chapters:
+            regressions.append(f"{result.key}: {result.failed_chapters} failed chapters")
+    return regressions
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def read_results(path: str) -> list[CaseResult]:
+    with open(path, encoding="utf-8") as file:
+        return [CaseResult(**result) for result in json.load(file)["results"]]
+
+
+def write_results(path: str, results: list[CaseResult], site: SiteSettings) -> None:
+    document = {
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "commit": get_commit()},
+        "site": site.model_dump(),
+        "results": [result.model_dump() for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2)
+
+
+def run(args: Namespace) -> int:
+    site = SiteSettings(
+        chapters=args.chapters,
+        pages=args.pages,
+        image_size=args.image_size,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        error_rate=args.error_rate,
+    )
+    results = []
+    for layout in args.layouts:
+        for images in args.images:
+            result = run_case(layout, images, args.threads, site, args.repetitions)
+            results.append(result)
+            print(
+                f"{layout:>10} images={images:<3}: {result.images_per_second:7.1f} images/s "
+                f"{result.bytes_per_second / 2**20:6.2f} MiB/s, peak {result.peak_memory_mib:6.1f} MiB, "
+                f"request p50/p95/p99 {result.request_p50 * 1000:.1f}/{result.request_p95 * 1000:.1f}/"
+                f"{result.request_p99 * 1000:.1f} ms, chapter p99 {result.chapter_p99:.2f} s"
+            )
+    if args.output:
+        write_results(args.output, results, site)
+    if not args.baseline:
+        return 0
+    regressions = compare(results, read_results(args.baseline), args.tolerance)
+    for regression in regressions:
+        print(f"regression: {regression}")
+    return len(regressions)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--layouts", nargs="+", default=list(LAYOUTS), choices=LAYOUTS)
+    parser.add_argument("--images", nargs="+", default=[1, 4, 16], type=int, help="Images downloaded at once")
+    parser.add_argument("--threads", default=2, type=int)
+    parser.add_argument("--repetitions", default=3, type=int)
+    parser.add_argument("--chapters", default=4, type=int)
+    parser.add_argument("--pages", default=20, type=int)
+    parser.add_argument("--image-size", default=64 * 1024, type=int)
+    parser.add_argument("--latency", default=0.02, type=float, help="Seconds added to every response")
+    parser.add_argument("--bandwidth", default=0, type=int, help="Bytes per second of each image, 0 is unlimited")
+    parser.add_argument("--error-rate", default=0.0, type=float, help="Share of the requests failing with a 500")
+    parser.add_argument("--output", help="File where the results are stored")
+    parser.add_argument("--baseline", help="Results of a previous run to compare with")
+    parser.add_argument("--tolerance", default=TOLERANCE, type=float)
+    sys.exit(1 if run(parser.parse_args()) else 0)
@@ -0,0 +1,97 @@
+"""
+Measures the startup cost of the headless entry points with 'python -X importtime': the total import time of
+each one, its heaviest imports, and whether it imported modules a headless run never needs (Tk, the GUI, the
+drivers). Run with: python -m benchmarks.import_time [repetitions] [--budget-ms MS]
+"""
+
+# Standard Library
+import re
+import subprocess
+import sys
+from argparse import ArgumentParser
+from typing import NamedTuple
+
+# Imports the CLI, a batch of series and a library sync (daemon) pay before doing anything
+ENTRY_POINTS = {
+    "cli": "mangadanga.main_cli",
+    "batch": "mangadanga.downloader.batch",
+    "sync": "mangadanga.downloader.sync",
+}
+# Packages no headless entry point may import: the Tk stack, the GUI and the driver modules
+HEADLESS_FORBIDDEN = ("tkinter", "_tkinter", "mangadanga.gui", "mangadanga.downloader.drivers.")
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure_imports(module: str) -> list[ImportTime]:
+    """Every module imported by a fresh interpreter importing 'module', in the order they finished importing"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is not None:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append(ImportTime(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return imports
+
+
+def get_total_us(imports: list[ImportTime], package: str = "mangadanga") -> int:
+    """Import time of a package and everything it imported, leaving out what the interpreter imports on startup"""
+    return sum(entry.cumulative_us for entry in imports if entry.depth == 0 and entry.module.split(".")[0] == package)
+
+
+def get_self_us_by_package(imports: list[ImportTime]) -> dict[str, int]:
+    """Import time spent in the modules of each top level package"""
+    packages: dict[str, int] = dict()
+    for entry in imports:
+        package = entry.module.split(".")[0]
+        packages[package] = packages.get(package, 0) + entry.self_us
+    return packages
+
+
+def is_forbidden(module: str) -> bool:
+    return any(module == package or module.startswith(package.rstrip(".") + ".") for package in HEADLESS_FORBIDDEN)
+
+
+def get_forbidden(imports: list[ImportTime]) -> list[str]:
+    return [entry.module for entry in imports if is_forbidden(entry.module)]
+
+
+def run(repetitions: int, budget_ms: float | None) -> int:
+    failures = 0
+    for name, module in ENTRY_POINTS.items():
+        # The fastest run is the least disturbed by the rest of the machine
+        runs = [measure_imports(module) for _ in range(repetitions)]
+        imports = min(runs, key=get_total_us)
+        total_ms = get_total_us(imports) / 1000
+        print(f"{name:>6} ({module}): {total_ms:.1f} ms")
+        packages = get_self_us_by_package(imports)
+        for package in sorted(packages, key=lambda package: -packages[package])[:5]:
+            print(f"{'':>8}{package:<24} {packages[package] / 1000:.1f} ms")
+        forbidden = get_forbidden(imports)
+        if forbidden:
+            print(f"{'':>8}imports modules a headless run does not need: {', '.join(forbidden)}")
+            failures += 1
+        if budget_ms is not None and total_ms > budget_ms:
+            print(f"{'':>8}over the budget of {budget_ms:.1f} ms")
+            failures += 1
+    return failures
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("repetitions", nargs="?", default=5, type=int)
+    parser.add_argument("--budget-ms", type=float)
+    args = parser.parse_args()
+    sys.exit(1 if run(args.repetitions, args.budget_ms) else 0)
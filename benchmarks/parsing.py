@@ -0,0 +1,55 @@
+"""
+Times the extraction of every driver on the saved fixture pages, for each parser backend, parsing the whole page
+or only the parts the driver selectors read. Run with: python -m benchmarks.parsing [repetitions]
+"""
+
+# Standard Library
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+# Dependencies
+from bs4 import BeautifulSoup
+
+# From apps
+from mangadanga.downloader import Asurascans, DownloaderConfig, Mangadoom, Manganato, Mangatown
+from mangadanga.downloader.base import Downloader
+from mangadanga.downloader.config import ParserConfig
+from mangadanga.downloader.parsing import LXML_AVAILABLE, PageKind
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def get_extractors(downloader: Downloader) -> dict[PageKind, Callable[[BeautifulSoup], object]]:
+    extractors: dict[PageKind, Callable[[BeautifulSoup], object]] = {
+        "series": downloader.get_all_chapters_to_url,
+    }
+    if hasattr(downloader, "get_images_src_from_page"):
+        extractors["chapter"] = downloader.get_images_src_from_page
+    else:
+        extractors["chapter"] = downloader.get_pages_urls  # type: ignore[attr-defined]
+        extractors["page"] = downloader.get_page_image_src  # type: ignore[attr-defined]
+    return extractors
+
+
+def run(repetitions: int) -> None:
+    backends = ["html.parser", "lxml"] if LXML_AVAILABLE else ["html.parser"]
+    for driver_class in (Manganato, Mangatown, Mangadoom, Asurascans):
+        driver = driver_class.__name__.lower()
+        for page in get_extractors(driver_class(DownloaderConfig())):
+            html_doc = (FIXTURES / driver / f"{page}.html").read_text()
+            for backend in backends:
+                for partial in (False, True):
+                    downloader = driver_class(DownloaderConfig(parser=ParserConfig(backend=backend, partial=partial)))
+                    extract = get_extractors(downloader)[page]
+                    start = time.perf_counter()
+                    for _ in range(repetitions):
+                        extract(downloader.html_parser.parse(html_doc, page))
+                    ellapsed_time = (time.perf_counter() - start) / repetitions
+                    mode = "partial" if partial else "full"
+                    print(f"{driver:>10} {page:>7} {backend:>11} {mode:>7}: {ellapsed_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
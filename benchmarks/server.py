@@ -0,0 +1,167 @@
+# Standard Library
+import asyncio
+import random
+import time
+from types import TracebackType
+from typing import Any, Awaitable, Callable
+
+# Dependencies
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from bs4 import BeautifulSoup
+
+# From apps
+from mangadanga.downloader.base import Downloader
+from mangadanga.downloader.config import DownloaderConfig, RateLimitConfig
+from mangadanga.downloader.models import ChapterIndex
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+class StandInServer:
+    """
+    Local aiohttp server standing in for a manga site. It records every TCP connection it accepts.
+    'errors' fails the first requests, 'error_rate' a random share of all of them, and 'bandwidth' caps the bytes
+    per second of each image response
+    """
+
+    def __init__(
+        self,
+        chapters: int = 3,
+        pages: int = 10,
+        image_size: int = 16 * 1024,
+        latency: float = 0.0,
+        throttled: int = 0,
+        retry_after: str = "0",
+        errors: int = 0,
+        missing: set[str] | None = None,
+        title: str = "Stand-in",
+        credits: int = 0,
+        error_rate: float = 0.0,
+        bandwidth: int = 0,
+        seed: int = 0,
+    ) -> None:
+        self.chapters = chapters
+        self.pages = pages
+        self.image_size = image_size
+        self.latency = latency
+        self.throttled = throttled
+        self.retry_after = retry_after
+        self.errors = errors
+        self.missing = missing or set()
+        self.title = title
+        # Pages appended to every chapter, the same url and content in each of them
+        self.credits = credits
+        self.error_rate = error_rate
+        self.bandwidth = bandwidth
+        self.random = random.Random(seed)
+        self.connections: set[tuple[str, int]] = set()
+        self.requests = 0
+        self.paths: list[str] = []
+        # Monotonic time at which each request arrived
+        self.times: list[float] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = web.Application(middlewares=[self.count_connections])
+        self.add_routes()
+        self.server = TestServer(self.app, host="127.0.0.1")
+
+    def add_routes(self) -> None:
+        self.app.router.add_get("/", self.handle_series)
+        self.app.router.add_get("/chapter/{chapter}", self.handle_chapter)
+        self.app.router.add_get("/image/{name}", self.handle_image)
+
+    async def __aenter__(self) -> "StandInServer":
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        await self.server.close()
+
+    def url(self, path: str = "/") -> str:
+        return str(self.server.make_url(path))
+
+    def config(self, **kwargs: Any) -> DownloaderConfig:
+        """Configuration pointing at the series page. The stand-in server is not rate limited"""
+        unlimited = RateLimitConfig(requests_per_second=10_000, burst=10_000, max_rate=10_000)
+        return DownloaderConfig(**{"url": self.url(), "rate_limit": unlimited, **kwargs})
+
+    @web.middleware
+    async def count_connections(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        if request.transport is not None:
+            self.connections.add(request.transport.get_extra_info("peername"))
+        self.requests += 1
+        self.paths.append(request.path)
+        self.times.append(time.monotonic())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.throttled > 0:
+                self.throttled -= 1
+                return web.Response(status=429, text="Too Many Requests", headers={"Retry-After": self.retry_after})
+            if self.errors > 0:
+                self.errors -= 1
+                return web.Response(status=500, text="Internal Server Error")
+            if self.error_rate and self.random.random() < self.error_rate:
+                return web.Response(status=500, text="Internal Server Error")
+            if request.path in self.missing:
+                return web.Response(status=404, text="Not Found")
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    def image_body(self, name: str) -> bytes:
+        seed = name.encode()
+        return (seed * (self.image_size // len(seed) + 1))[: self.image_size]
+
+    async def handle_series(self, request: web.Request) -> web.Response:
+        links = "".join(f'<a href="{self.url(f"/chapter/{i}")}">{i}</a>' for i in range(self.chapters, 0, -1))
+        html = f'<h1 class="title">{self.title}</h1><div class="chapter-list">{links}</div>'
+        return web.Response(text=html, content_type="text/html")
+
+    async def handle_chapter(self, request: web.Request) -> web.Response:
+        chapter = request.match_info["chapter"]
+        images = "".join(f'<img src="{self.url(f"/image/{chapter}-{i}.jpg")}">' for i in range(self.pages))
+        images += "".join(f'<img src="{self.url(f"/image/credits-{i}.jpg")}">' for i in range(self.credits))
+        html = f'<h1 class="title">Chapter {chapter}</h1><div class="reader">{images}</div>'
+        return web.Response(text=html, content_type="text/html")
+
+    async def send_image(self, request: web.Request, body: bytes) -> web.StreamResponse:
+        """Image response, streamed in ten chunks per second when the bandwidth is capped"""
+        if not self.bandwidth or request.method == "HEAD":
+            return web.Response(body=body, content_type="image/jpeg")
+        response = web.StreamResponse(headers={"Content-Type": "image/jpeg"})
+        response.content_length = len(body)
+        await response.prepare(request)
+        chunk_size = max(1, self.bandwidth // 10)
+        for start in range(0, len(body), chunk_size):
+            chunk = body[start : start + chunk_size]
+            await response.write(chunk)
+            await asyncio.sleep(len(chunk) / self.bandwidth)
+        await response.write_eof()
+        return response
+
+    async def handle_image(self, request: web.Request) -> web.StreamResponse:
+        return await self.send_image(request, self.image_body(request.match_info["name"]))
+
+
+class StandInDownloader(Downloader):
+    DOMAINS = {"127.0.0.1"}
+
+    def get_title(self, data: BeautifulSoup) -> str:
+        return data.find(class_="title").string
+
+    def get_all_chapters_to_url(self, data: BeautifulSoup) -> dict[ChapterIndex, str]:
+        chapter_content = data.find(class_="chapter-list").find_all("a")
+        chapter_content.reverse()
+        return {ChapterIndex(a.string): a["href"] for a in chapter_content}
+
+    def get_chapter_filename(self, index: int, data: BeautifulSoup) -> str:
+        return f"{index}_{data.find(class_='title').string.replace(' ', '_')}.zip"
+
+    async def get_images_src(self, data: BeautifulSoup) -> list[str]:
+        return [img["src"] for img in data.find(class_="reader").find_all("img")]
@@ -0,0 +1,47 @@
+"""
+Compares one aiohttp session per request (the old behaviour) against the pooled session owned by the
+Downloader. Run with: python -m benchmarks.session_reuse [requests]
+"""
+
+# Standard Library
+import asyncio
+import sys
+import time
+
+# Dependencies
+import aiohttp
+
+# Local imports
+from .server import StandInDownloader, StandInServer
+
+
+async def per_request_session(downloader: StandInDownloader, urls: list[str]) -> None:
+    async def fetch(url: str) -> bytes:
+        async with aiohttp.ClientSession(headers=downloader.get_headers()) as session:
+            async with session.get(url) as response:
+                return await response.read()
+
+    await asyncio.gather(*(fetch(url) for url in urls))
+
+
+async def pooled_session(downloader: StandInDownloader, urls: list[str]) -> None:
+    async with downloader.open_session():
+        await asyncio.gather(*(downloader.download_image(url) for url in urls))
+
+
+async def run(requests: int) -> None:
+    for name, strategy in (("per-request", per_request_session), ("pooled", pooled_session)):
+        async with StandInServer() as server:
+            downloader = StandInDownloader(server.config())
+            urls = [server.url(f"/image/{i}.jpg") for i in range(requests)]
+            start = time.perf_counter()
+            await strategy(downloader, urls)
+            ellapsed_time = time.perf_counter() - start
+            print(
+                f"{name:>12}: {requests} requests, {len(server.connections)} connections, "
+                f"{ellapsed_time:.3f} seconds ({requests / ellapsed_time:.0f} req/s)"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
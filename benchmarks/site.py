@@ -0,0 +1,152 @@
+"""
+Local fake manga site serving synthetic series with the html layout of each driver, so the real drivers download
+from it end to end, without touching the network
+"""
+
+# Standard Library
+from typing import Any
+
+# Dependencies
+from aiohttp import web
+from bs4 import BeautifulSoup
+
+# From apps
+from mangadanga.downloader import Asurascans, Mangadoom, Manganato, Mangatown
+from mangadanga.downloader.base import Downloader
+
+# Local imports
+from .server import StandInServer
+
+LAYOUTS = ("manganato", "mangatown", "mangadoom", "asurascans")
+TITLE = "Solo Leveling"
+SLUG = "solo-leveling"
+
+
+class FakeMangaSite(StandInServer):
+    """
+    Series of 'chapters' chapters of 'pages' images of 'image_size' bytes, laid out like the site 'layout'.
+    Sites that show one page per request (mangatown, mangadoom) also serve every page of a chapter.
+    Latency, bandwidth and error injection are those of the stand-in server
+    """
+
+    def __init__(self, layout: str = "manganato", **kwargs: Any) -> None:
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout '{layout}', expected one of {', '.join(LAYOUTS)}")
+        self.layout = layout
+        super().__init__(title=TITLE, **kwargs)
+
+    def add_routes(self) -> None:
+        router = self.app.router
+        router.add_get("/", self.handle_series)
+        router.add_get("/image/{chapter}/{name}", self.handle_image)
+        if self.layout == "manganato":
+            router.add_get(f"/{SLUG}/chapter-{{chapter}}", self.handle_chapter)
+        elif self.layout == "mangatown":
+            router.add_get(f"/manga/{SLUG}/c{{chapter}}/", self.handle_chapter)
+            router.add_get(f"/manga/{SLUG}/c{{chapter}}/{{page}}.html", self.handle_page)
+        elif self.layout == "mangadoom":
+            router.add_get(f"/{SLUG}/{{chapter}}", self.handle_chapter)
+            router.add_get(f"/{SLUG}/{{chapter}}/{{page}}", self.handle_page)
+        else:
+            router.add_get(f"/2226495089-{SLUG}-chapter-{{chapter}}/", self.handle_chapter)
+
+    @property
+    def images(self) -> int:
+        return self.chapters * self.pages
+
+    def chapter_url(self, chapter: int) -> str:
+        if self.layout == "manganato":
+            return self.url(f"/{SLUG}/chapter-{chapter}")
+        if self.layout == "mangatown":
+            # Relative, the driver prefixes its own url
+            return f"/manga/{SLUG}/c{chapter:03}/"
+        if self.layout == "mangadoom":
+            return self.url(f"/{SLUG}/{chapter}")
+        return self.url(f"/2226495089-{SLUG}-chapter-{chapter}/")
+
+    def page_url(self, chapter: int, page: int) -> str:
+        if self.layout == "mangatown":
+            return f"/manga/{SLUG}/c{chapter:03}/{page}.html"
+        return self.url(f"/{SLUG}/{chapter}/{page}")
+
+    def image_url(self, chapter: int, page: int) -> str:
+        # Numbered after the page, the way the drivers predict the image urls of paged sites
+        if self.layout == "mangatown":
+            return "//" + self.url(f"/image/{chapter}/sl_{chapter:02}_{page:02}.jpg").split("//", 1)[1]
+        return self.url(f"/image/{chapter}/{page:03}.jpg")
+
+    def get_series_html(self) -> str:
+        chapters = range(self.chapters, 0, -1)
+        links = "".join(
+            f'<li><a href="{self.chapter_url(chapter)}">Chapter {chapter}</a></li>' for chapter in chapters
+        )
+        if self.layout == "manganato":
+            return (
+                f'<div class="story-info-right"><h1>{TITLE}</h1></div>'
+                f'<ul class="panel-story-chapter-list">{links}</ul>'
+            )
+        if self.layout == "mangatown":
+            return f'<h1 class="title-top">{TITLE}</h1><ul class="chapter_list">{links}</ul>'
+        if self.layout == "mangadoom":
+            return f'<div class="widget-heading">{TITLE}</div><ul class="chapter-list">{links}</ul>'
+        return f'<h1 class="entry-title">{TITLE}</h1><div class="eplister"><ul>{links}</ul></div>'
+
+    def get_chapter_html(self, chapter: int) -> str:
+        if self.layout in ("manganato", "asurascans"):
+            images = "".join(f'<img src="{self.image_url(chapter, page)}">' for page in range(1, self.pages + 1))
+            if self.layout == "manganato":
+                return (
+                    f'<div class="panel-chapter-info-top"><h1>{TITLE} Chapter {chapter}</h1></div>'
+                    f'<div class="container-chapter-reader">{images}</div>'
+                )
+            return f'<h1 class="entry-title">{TITLE} Chapter {chapter}</h1><div class="rdminimal">{images}</div>'
+        return self.get_page_html(chapter, 1)
+
+    def get_page_html(self, chapter: int, page: int) -> str:
+        options = "".join(
+            f'<option value="{self.page_url(chapter, number)}">{number}</option>'
+            for number in range(1, self.pages + 1)
+        )
+        image = self.image_url(chapter, page)
+        if self.layout == "mangatown":
+            featured = f'<option value="/manga/{SLUG}/c{chapter:03}/featured.html">Featured</option>'
+            return (
+                f'<div class="title"><h1>{TITLE} {chapter}</h1></div>'
+                f'<select class="page_select">{options}{featured}</select>'
+                f'<div class="read_img"><img src="{image}" id="image"></div>'
+            )
+        return (
+            f'<div class="col-md-8 col-xs-12"> {TITLE} {chapter} </div>'
+            f'<select class="selectPage pull-right chapter-page1">{options}</select>'
+            f'<img class="img-responsive" src="{image}">'
+        )
+
+    async def handle_series(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.get_series_html(), content_type="text/html")
+
+    async def handle_chapter(self, request: web.Request) -> web.Response:
+        chapter = int(request.match_info["chapter"])
+        return web.Response(text=self.get_chapter_html(chapter), content_type="text/html")
+
+    async def handle_page(self, request: web.Request) -> web.Response:
+        chapter, page = int(request.match_info["chapter"]), int(request.match_info["page"])
+        return web.Response(text=self.get_page_html(chapter, page), content_type="text/html")
+
+    async def handle_image(self, request: web.Request) -> web.StreamResponse:
+        name = f"{request.match_info['chapter']}-{request.match_info['name']}"
+        return await self.send_image(request, self.image_body(name))
+
+    def driver(self) -> type[Downloader]:
+        """The driver of the layout, pointed at this site"""
+        driver_class = {"manganato": Manganato, "mangatown": Mangatown, "mangadoom": Mangadoom}.get(
+            self.layout, Asurascans
+        )
+        attributes: dict[str, Any] = {"URL": self.url().rstrip("/"), "DOMAINS": {"127.0.0.1"}}
+        if self.layout == "mangatown":
+            attributes["get_page_image_src"] = get_local_page_image_src
+        return type(f"Local{driver_class.__name__}", (driver_class,), attributes)
+
+
+def get_local_page_image_src(self: Mangatown, data: BeautifulSoup) -> str:
+    # Mangatown image urls are scheme relative and the driver assumes https, the fake site is plain http
+    return str(Mangatown.get_page_image_src(self, data)).replace("https:", "http:", 1)
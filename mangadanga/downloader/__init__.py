@@ -1,32 +1,89 @@
-from .base import Downloader
+from typing import Any
 
-from .drivers import (
-    Mangadoom,
-    Manganato,
-    Mangatown,
-    Asurascans,
-)
+from .base import Downloader, PagedDownloader
+
+from . import drivers
 
 from .chapter_selection import (
     ChapterSelectionStrategy,
+    ChapterSelection,
     ChapterListSelection,
     ChapterRangeSelection,
+    LatestChaptersSelection,
     AllChaptersSelection,
     chapters_selection_factory,
 )
 
-from .config import DownloaderConfig
+from .config import (
+    ArchiveConfig,
+    CatalogConfig,
+    ConcurrencyConfig,
+    ConnectionConfig,
+    DownloaderConfig,
+    MetricsConfig,
+    PipelineConfig,
+    RateLimitConfig,
+    RetryConfig,
+    StoreConfig,
+    TracingConfig,
+)
+
+from .downloader_factory import downloader_factory, get_downloaders
+
+from .events import EVENT_MANAGER, Event, EventManager, ProgressEvent
+
+from .registry import REGISTRY, DriverRegistry
+
+from .exceptions import CircuitOpenException, DownloadCancelledException, DownloaderException, RequestException
+
+from .control import DownloadControl
+
+from .concurrency import Scheduler, gather_with_concurrency
+
+from .ratelimit import RateLimiter, TokenBucket
+
+from .retry import CircuitBreaker, RetryPolicy
+
+from .models import BatchReport, ChapterFailure, ChapterIndex, DownloadReport, SeriesFailure, SeriesSummary
+
+from .archive import ArchiveWriter, FolderWriter
+
+from .extrapolation import UrlExtrapolator
+
+from .pipeline import Pipeline
+
+from .manifest import Manifest
+
+from .store import ImageStore
+
+from .catalog import Catalog
+
+from .metrics import Metrics
+
+from .tracing import Tracer
+
+from .profiling import Profiler
+
+from .batch import Batch
+
+from .sync import LibrarySync, read_watchlist
 
-from .downloader_factory import DOWNLOADERS, downloader_factory
+from .service import DownloadService
 
-from .exceptions import DownloaderException
 
-from .concurrency import gather_with_concurrency
+def __getattr__(name: str) -> Any:
+    # Drivers, and the set of them, are imported on first use
+    if name in drivers.__all__:
+        return getattr(drivers, name)
+    if name == "DOWNLOADERS":
+        return get_downloaders()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 
 __all__ = [
     # .base
     "Downloader",
+    "PagedDownloader",
     # .drivers
     "Mangadoom",
     "Manganato",
@@ -37,14 +94,80 @@ __all__ = [
     "AllChaptersSelection",
     "ChapterListSelection",
     "ChapterRangeSelection",
+    "ChapterSelection",
+    "LatestChaptersSelection",
     "chapters_selection_factory",
     # .config
+    "ArchiveConfig",
+    "CatalogConfig",
+    "ConcurrencyConfig",
+    "ConnectionConfig",
     "DownloaderConfig",
+    "MetricsConfig",
+    "PipelineConfig",
+    "RateLimitConfig",
+    "RetryConfig",
+    "StoreConfig",
+    "TracingConfig",
     # .downloader_factory
     "downloader_factory",
+    "get_downloaders",
     "DOWNLOADERS",
+    # .registry
+    "DriverRegistry",
+    "REGISTRY",
+    # .events
+    "EVENT_MANAGER",
+    "Event",
+    "EventManager",
+    "ProgressEvent",
     # .exceptions
+    "CircuitOpenException",
+    "DownloadCancelledException",
     "DownloaderException",
+    "RequestException",
+    # .control
+    "DownloadControl",
     # .concurrence
     "gather_with_concurrency",
+    "Scheduler",
+    # .ratelimit
+    "RateLimiter",
+    "TokenBucket",
+    # .retry
+    "CircuitBreaker",
+    "RetryPolicy",
+    # .models
+    "BatchReport",
+    "ChapterFailure",
+    "ChapterIndex",
+    "DownloadReport",
+    "SeriesFailure",
+    "SeriesSummary",
+    # .archive
+    "ArchiveWriter",
+    "FolderWriter",
+    # .extrapolation
+    "UrlExtrapolator",
+    # .pipeline
+    "Pipeline",
+    # .manifest
+    "Manifest",
+    # .store
+    "ImageStore",
+    # .catalog
+    "Catalog",
+    # .metrics
+    "Metrics",
+    # .tracing
+    "Tracer",
+    # .profiling
+    "Profiler",
+    # .batch
+    "Batch",
+    # .sync
+    "LibrarySync",
+    "read_watchlist",
+    # .service
+    "DownloadService",
 ]
@@ -0,0 +1,161 @@
+# Standard Library
+import asyncio
+import hashlib
+import os
+import shutil
+import time
+from types import TracebackType
+from typing import IO
+from zipfile import ZIP_DEFLATED, ZIP_STORED, BadZipFile, ZipFile, ZipInfo
+
+# Local imports
+from .resources import Worker
+from .store import ImageStore, hash_file
+from .tracing import Tracer
+
+# Formats that are already compressed: deflating them again only burns CPU
+STORED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".avif"}
+
+
+def get_compress_type(name: str) -> int:
+    extension = os.path.splitext(name)[1].lower()
+    return ZIP_STORED if extension in STORED_EXTENSIONS else ZIP_DEFLATED
+
+
+def read_entries(path: str) -> dict[str, int] | None:
+    """Size of every entry of an archive or folder, None if the archive is missing or was never closed"""
+    try:
+        if os.path.isdir(path):
+            return {name: os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)}
+        with ZipFile(path) as zipf:
+            return {info.filename: info.file_size for info in zipf.infolist()}
+    except (OSError, BadZipFile):
+        return None
+
+
+def remove_path(path: str) -> None:
+    """Removes an archive or a folder"""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def replace_path(source: str, destination: str) -> None:
+    """Renames an archive or a folder, replacing the destination"""
+    if os.path.isdir(destination):
+        shutil.rmtree(destination)
+    os.replace(source, destination)
+
+
+class ArchiveWriter:
+    """
+    Writes a chapter archive from its own thread, so disk I/O never blocks the event loop. Entries are appended in
+    completion order; 'queue_size' bounds the entries waiting to be written and pushes back on the downloads.
+    Mode "a" appends to an existing archive.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        chunk_size: int = 64 * 1024,
+        queue_size: int = 4,
+        mode: str = "w",
+        tracer: Tracer | None = None,
+    ) -> None:
+        self.path = path
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.tracer = tracer
+        self.pending = asyncio.Semaphore(queue_size)
+        self.worker = Worker("archive-writer")
+        self.zipf: ZipFile | None = None
+
+    async def open(self) -> None:
+        self.worker.start()
+        self.zipf = await self.worker.run(ZipFile, self.path, self.mode, ZIP_DEFLATED)
+
+    async def close(self) -> None:
+        try:
+            if self.zipf is not None:
+                await self.worker.run(self.zipf.close)
+        finally:
+            self.worker.stop()
+
+    async def __aenter__(self) -> "ArchiveWriter":
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        await self.close()
+
+    def write_entry(self, name: str, file: IO[bytes]) -> tuple[int, str]:
+        if self.zipf is None:
+            raise ValueError(f"Archive '{self.path}' is not open")
+        entry_info = ZipInfo(name, date_time=time.localtime()[:6])
+        entry_info.compress_type = get_compress_type(name)
+        file.seek(0)
+        size = 0
+        digest = hashlib.sha256()
+        with self.zipf.open(entry_info, "w") as entry:
+            while chunk := file.read(self.chunk_size):
+                entry.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        return size, digest.hexdigest()
+
+    async def write(self, name: str, file: IO[bytes]) -> tuple[int, str]:
+        """
+        Appends a file to the archive. Returns the size and sha256 of the entry once it is on disk and the file
+        can be released
+        """
+        async with self.pending:
+            write_entry = self.write_entry
+            if self.tracer is not None:
+                write_entry = self.tracer.wrap("write_entry", write_entry, path=self.path, entry=name)
+            return await self.worker.run(write_entry, name, file)
+
+
+class FolderWriter(ArchiveWriter):
+    """
+    Writes a chapter as a folder of images instead of an archive. With an image store, every image is kept in
+    the store and hardlinked into the folder, so an image repeated across chapters is on disk once
+    """
+
+    def __init__(
+        self,
+        path: str,
+        chunk_size: int = 64 * 1024,
+        queue_size: int = 4,
+        mode: str = "w",
+        store: ImageStore | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
+        super().__init__(path, chunk_size, queue_size, mode, tracer)
+        self.store = store
+
+    def create_folder(self) -> None:
+        if self.mode == "w" and os.path.exists(self.path):
+            remove_path(self.path)
+        os.makedirs(self.path, exist_ok=True)
+
+    async def open(self) -> None:
+        self.worker.start()
+        await self.worker.run(self.create_folder)
+
+    async def close(self) -> None:
+        self.worker.stop()
+
+    def write_entry(self, name: str, file: IO[bytes]) -> tuple[int, str]:
+        size, sha256 = hash_file(file, self.chunk_size)
+        entry_path = os.path.join(self.path, name)
+        if self.store is not None:
+            self.store.put_object(sha256, file)
+            self.store.link_object(sha256, entry_path)
+        else:
+            file.seek(0)
+            with open(entry_path, "wb") as entry:
+                shutil.copyfileobj(file, entry, self.chunk_size)
+        return size, sha256
@@ -1,53 +1,218 @@
 # Standard Library
+import asyncio
 import logging
 import os
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from pathlib import PurePath
-from zipfile import ZipFile
-import time
+from typing import IO, Any, AsyncGenerator, AsyncIterator, Callable, TypeVar
 
 # Dependencies
 import aiohttp
-import asyncio
-from bs4 import BeautifulSoup
-
-
-from mangadanga.gui.events import (
-    EVENT_MANAGER,
-    EventManager,
-    OnChapterDownloadFinished,
-    OnDownloadFinished,
-    OnMangaInfoUpdate,
-)
+from bs4 import BeautifulSoup, Tag
 
 # Local imports
 from . import utils
-from .concurrency import gather_with_concurrency
-from .models import ChapterIndex
-from .config import DownloaderConfig
+from .catalog import CATALOG_NAME, Catalog
 from .chapter_selection import chapters_selection_factory
+from .concurrency import Scheduler, cancel_all
+from .config import ConnectionConfig, DownloaderConfig
+from .control import DownloadControl
+from .events import EVENT_MANAGER, EventManager, OnDownloadFinished, OnMangaInfoUpdate
+from .exceptions import DownloadCancelledException, DownloaderException, RequestException
+from .extrapolation import UrlExtrapolator
+from .metrics import Metrics
+from .models import ChapterIndex, DownloadReport
+from .parsing import HtmlParser, PageKind
+from .pipeline import Pipeline
+from .ratelimit import THROTTLE_STATUSES, RateLimiter, parse_retry_after
+from .retry import RetryPolicy
+from .store import STORE_NAME, ImageStore
+from .tracing import Tracer
+from .utils import get_host
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+def create_connector(connection: ConnectionConfig) -> aiohttp.TCPConnector:
+    """Connector that keeps connections and DNS lookups alive between requests"""
+    return aiohttp.TCPConnector(
+        limit=connection.limit,
+        limit_per_host=connection.limit_per_host,
+        keepalive_timeout=connection.keepalive_timeout,
+        use_dns_cache=connection.use_dns_cache,
+        ttl_dns_cache=connection.ttl_dns_cache,
+    )
+
 
 class Downloader(ABC):
     DOMAINS: set[str] = set()
     EXTRA_HEADERS: dict[str, str] = dict()
+    # Css selector of each element the driver reads, and the selectors read on each kind of page
+    SELECTORS: dict[str, str] = dict()
+    PAGE_SELECTORS: dict[PageKind, list[str]] = dict()
 
-    def __init__(self, config: DownloaderConfig, event_manager: EventManager = EVENT_MANAGER) -> None:
+    def __init__(
+        self,
+        config: DownloaderConfig,
+        event_manager: EventManager = EVENT_MANAGER,
+        scheduler: Scheduler | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        parser_executor: Executor | None = None,
+        connector: aiohttp.BaseConnector | None = None,
+        store: ImageStore | None = None,
+        catalog: Catalog | None = None,
+        control: DownloadControl | None = None,
+        metrics: Metrics | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
         super().__init__()
         self.config = config
         self.chapter_selection_strategy = chapters_selection_factory(config.chapter_strategy)
         self.event_manager = event_manager
+        self.scheduler = scheduler or Scheduler.from_config(config.threads, config.concurrency)
+        self.rate_limiter = rate_limiter or RateLimiter(config.rate_limit)
+        self.rate_limiter.add_site(self.DOMAINS)
+        self.metrics = metrics or Metrics.from_config(config)
+        self.retry_policy = retry_policy or RetryPolicy(config.retry, metrics=self.metrics)
+        self.tracer = tracer or Tracer.from_config(config)
+        self.url_extrapolator = UrlExtrapolator()
+        # A parser pool given by the caller is shared with other downloaders, and shut down by the caller
+        self.owns_parser_executor = parser_executor is None
+        self.parser_executor = parser_executor or self.create_parser_executor()
+        self.html_parser = HtmlParser(self.SELECTORS, self.PAGE_SELECTORS, config.parser)
+        # A connector given by the caller is shared with other downloaders, and closed by the caller
+        self.connector = connector
+        self.store = store
+        if self.store is None and config.store.enabled:
+            self.store = ImageStore(
+                config.store.path or os.path.join(config.path, STORE_NAME), config.archive.chunk_size
+            )
+        self.catalog = catalog
+        if self.catalog is None and config.catalog.enabled:
+            self.catalog = Catalog(config.catalog.path or os.path.join(config.path, CATALOG_NAME))
+        # Cancel and pause tokens, shared with the other downloads the caller controls together
+        self.control = control or DownloadControl()
+        self.session: aiohttp.ClientSession | None = None
+
+    def create_parser_executor(self) -> Executor:
+        return ThreadPoolExecutor(max_workers=self.config.parser.workers, thread_name_prefix="parser")
+
+    def create_session(self) -> aiohttp.ClientSession:
+        """Creates a session whose connector keeps connections and DNS lookups alive between requests"""
+        if self.connector is not None:
+            return aiohttp.ClientSession(connector=self.connector, connector_owner=False, headers=self.get_headers())
+        return aiohttp.ClientSession(connector=create_connector(self.config.connection), headers=self.get_headers())
+
+    @asynccontextmanager
+    async def open_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Keeps a pooled session open while the context lasts. A session that is already open is reused as is"""
+        if self.session is not None:
+            yield self.session
+            return
+        self.session = self.create_session()
+        try:
+            yield self.session
+        finally:
+            await self.session.close()
+            self.session = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None:
+            raise DownloaderException("There is no open session. Requests must run inside 'open_session()'")
+        return self.session
 
-    async def scrape_url(self, url: str) -> BeautifulSoup:
-        # Creates a context manager to execute the request
-        async with aiohttp.ClientSession(headers=self.get_headers()) as session:
-            async with session.get(url) as response:
+    @asynccontextmanager
+    async def slot(self, kind: str, url: str) -> AsyncIterator[None]:
+        """
+        Image or page slot of the scheduler. A slot handed over while the download is paused goes back to the
+        other jobs at once, and is waited for again once the download resumes
+        """
+        slot = self.scheduler.image_slot if kind == "image" else self.scheduler.page_slot
+        while True:
+            await self.control.checkpoint()
+            async with slot(url, self.config.url):
+                if self.control.paused:
+                    continue
+                yield
+                return
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Request paced by the host rate limiter. Throttled responses are retried once the host allows it,
+        any other error status raises a 'RequestException'. Each attempt is timed from the moment it gets its token,
+        and waits there while the download is paused
+        """
+        host = get_host(url)
+        for _ in range(self.config.rate_limit.max_throttle_retries + 1):
+            await self.rate_limiter.acquire(url)
+            # A request that waited for its token while the download was paused does not go out before it resumes
+            await self.control.checkpoint()
+            # Latency until the headers arrive, the time the rate limiter held the request back is not the host's
+            started_at = time.monotonic()
+            self.metrics.inc("requests_total", host=host)
+            try:
+                async with self.retry_policy.attempt(), self.get_session().request(method, url) as response:
+                    self.metrics.observe("request_seconds", time.monotonic() - started_at, host=host)
+                    if response.status in THROTTLE_STATUSES:
+                        self.metrics.inc("throttled_total", host=host)
+                        self.rate_limiter.throttle(url, parse_retry_after(response.headers.get("Retry-After")))
+                        continue
+                    if response.status >= 400:
+                        raise RequestException(url, response.status)
+                    self.rate_limiter.succeed(url)
+                    yield response
+                    return
+            except (RequestException, aiohttp.ClientError, asyncio.TimeoutError):
+                self.metrics.inc("request_errors_total", host=host)
+                raise
+        raise RequestException(url, response.status)
+
+    def get(self, url: str) -> AbstractAsyncContextManager[aiohttp.ClientResponse]:
+        return self.request("GET", url)
+
+    async def url_exists(self, url: str) -> bool:
+        """Checks with a HEAD request that a url points to an image"""
+        try:
+            async with self.slot("image", url), self.request("HEAD", url) as response:
+                return response.content_type != "text/html"
+        except DownloadCancelledException:
+            raise
+        except (DownloaderException, aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+    async def fetch_html(self, url: str) -> str:
+        async with self.slot("page", url), self.get(url) as response:
+            with self.tracer.span("fetch_html", url=url):
                 # The "ignore" parameter is used to ignore encoding errors
-                html_doc = await response.text("utf-8", "ignore")
-                web_data = BeautifulSoup(html_doc, "html.parser")
-                return web_data
+                return await response.text("utf-8", "ignore")
+
+    async def run_parser(self, function: Callable[..., T], *args: Any) -> T:
+        """Runs CPU bound parsing or extraction in the parser pool, so the event loop never stalls on it"""
+        function = self.tracer.wrap(getattr(function, "__name__", "parser"), function)
+        return await asyncio.get_running_loop().run_in_executor(self.parser_executor, function, *args)
+
+    async def scrape_url(self, url: str, page: PageKind | None = None) -> BeautifulSoup:
+        """Fetches and parses a page. Knowing the kind of page lets the parser skip what the driver never reads"""
+        with self.tracer.span("scrape_url", url=url, page=page):
+            html_doc = await self.retry_policy.call(url, lambda: self.fetch_html(url), self.control.checkpoint)
+            web_data = await self.run_parser(self.html_parser.parse, html_doc, page)
+        return web_data
+
+    def select(self, data: BeautifulSoup, name: str) -> list[Tag]:
+        return data.select(self.SELECTORS[name])
+
+    def select_one(self, data: BeautifulSoup, name: str) -> Tag:
+        element = data.select_one(self.SELECTORS[name])
+        if element is None:
+            raise DownloaderException(f"Element '{name}' ({self.SELECTORS[name]}) not found in the page")
+        return element
 
     def create_directory(self, dir_name: str) -> None:
         """Creates a directory on the path specified (default path: '.'). Returns directory path"""
@@ -78,20 +243,41 @@ class Downloader(ABC):
         return src_numbers_suffix
 
     def get_chapter_number_to_url(self, all_chapters: dict[ChapterIndex, str]) -> dict[ChapterIndex, str]:
-        filtered_chapters = {
-            chapter: url
-            for chapter, url in all_chapters.items()
-            if self.chapter_selection_strategy.chapter_in_selection(chapter)
-        }
-        return filtered_chapters
+        """Selected chapters, in numeric order"""
+        return self.chapter_selection_strategy.select(all_chapters)
+
+    async def fetch_image(self, image_url: str) -> bytes:
+        async with self.slot("image", image_url), self.get(image_url) as response:
+            logger.info(f"Downloading image: {image_url}")
+            with self.tracer.span("fetch_image", url=image_url):
+                image_data = await response.read()
+            return image_data
 
     async def download_image(self, image_url: str) -> bytes:
         """Downloads an image from a url and returns it as bytes"""
-        async with aiohttp.ClientSession(headers=self.get_headers()) as session:
-            async with session.get(image_url) as response:
-                logger.info(f"Downloading image: {image_url}")
-                image_data = await response.read()
-                return image_data
+        with self.tracer.span("download_image", url=image_url):
+            return await self.retry_policy.call(
+                image_url, lambda: self.fetch_image(image_url), self.control.checkpoint
+            )
+
+    async def stream_image(self, image_url: str, file: IO[bytes]) -> int:
+        file.seek(0)
+        file.truncate()
+        size = 0
+        async with self.slot("image", image_url), self.get(image_url) as response:
+            logger.info(f"Downloading image: {image_url}")
+            with self.tracer.span("fetch_image", url=image_url):
+                async for chunk in response.content.iter_chunked(self.config.archive.chunk_size):
+                    file.write(chunk)
+                    size += len(chunk)
+        return size
+
+    async def download_image_to(self, image_url: str, file: IO[bytes]) -> int:
+        """Downloads an image from a url chunk by chunk into a file. Returns the image size"""
+        with self.tracer.span("download_image", url=image_url):
+            return await self.retry_policy.call(
+                image_url, lambda: self.stream_image(image_url, file), self.control.checkpoint
+            )
 
     def get_image_name(self, index: int, image_url: str) -> str:
         image_basename = os.path.basename(image_url)
@@ -99,70 +285,132 @@ class Downloader(ABC):
         image_name = f"{index:04}{image_extension}"
         return image_name
 
-    async def get_all_chapter_images(self, urls: list[str]) -> list[tuple[str, bytes]]:
-        get_images_tasks = [self.download_image(url) for url in urls]
-        images = await asyncio.gather(*get_images_tasks)
-        image_names = [self.get_image_name(index, url) for index, url in enumerate(urls)]
-        named_images = list(zip(image_names, images))
-        return named_images
-
-    async def download_chapter(self, data: BeautifulSoup, zipf: ZipFile) -> None:
-        """Gets chapter data, creates a zip file by its name, and downloads and stores its images to the zip file"""
-        images_urls = await self.get_images_src(data)
-        images = await self.get_all_chapter_images(images_urls)
-        for image_filename, image_data in images:
-            zipf.writestr(image_filename, image_data)
-
-    async def process_chapter(self, index: int, chapter_url: str, manga_title: str) -> None:
-        chapter_data = await self.scrape_url(chapter_url)
-        chapter_filename = self.get_chapter_filename(index, chapter_data)
-        chapter_full_path = os.path.join(self.config.path, manga_title, chapter_filename)
-        logger.info(f"Downloading chapter: {chapter_filename}")
-        with ZipFile(chapter_full_path, "w") as zipf:
-            await self.download_chapter(chapter_data, zipf)
-        OnChapterDownloadFinished(self.event_manager).emit()
-
-    # TODO: Independent decorators for logger and for time.time()
-    async def download(self) -> None:
+    async def iter_images_src(self, data: BeautifulSoup) -> AsyncGenerator[tuple[int, str], None]:
+        """Yields (page index, image url) as soon as each url is known. Drivers that scrape every page override it"""
+        with self.tracer.span("get_images_src"):
+            images_src = await self.get_images_src(data)
+        for index, image_url in enumerate(images_src):
+            yield index, image_url
+
+    async def scrape_pages(
+        self, pages_urls: list[str], get_page_image_src: Callable[[BeautifulSoup], str]
+    ) -> AsyncGenerator[tuple[int, str], None]:
+        """Scrapes the pages of a chapter concurrently and yields (page index, image url) in completion order"""
+
+        async def scrape_page(index: int, page_url: str) -> tuple[int, str]:
+            return index, await self.run_parser(get_page_image_src, await self.scrape_url(page_url, "page"))
+
+        tasks = [asyncio.ensure_future(scrape_page(index, url)) for index, url in enumerate(pages_urls)]
+        try:
+            for page in asyncio.as_completed(tasks):
+                yield await page
+        finally:
+            await cancel_all(tasks)
+
+    async def speculate_images_src(
+        self, pages_urls: list[str], first_src: str, get_page_image_src: Callable[[BeautifulSoup], str]
+    ) -> AsyncGenerator[tuple[int, str], None]:
+        """
+        Predicts the image url of every page from the first one, using the numbering learned for the series, and
+        checks the predictions with concurrent HEAD requests. Only the pages whose prediction fails are scraped.
+        Yields (page index, image url) in completion order
+        """
+        yield 0, first_src
+        first_page = 1
+        if len(pages_urls) > 1 and not self.url_extrapolator.knows_pattern:
+            # The second page teaches which numbers of the url follow the page
+            second_src = await self.run_parser(get_page_image_src, await self.scrape_url(pages_urls[1], "page"))
+            if not self.url_extrapolator.learn(first_src, second_src):
+                self.url_extrapolator.learn_default(first_src)
+            yield 1, second_src
+            first_page = 2
+
+        async def resolve_page(index: int) -> tuple[int, str, bool]:
+            predicted_src = self.predict_image_src(first_src, index)
+            if predicted_src is not None and await self.url_exists(predicted_src):
+                return index, predicted_src, True
+            page_data = await self.scrape_url(pages_urls[index], "page")
+            return index, await self.run_parser(get_page_image_src, page_data), False
+
+        tasks = [asyncio.ensure_future(resolve_page(index)) for index in range(first_page, len(pages_urls))]
+        mispredictions = 0
+        try:
+            for page in asyncio.as_completed(tasks):
+                index, image_src, predicted = await page
+                mispredictions += not predicted
+                yield index, image_src
+        finally:
+            await cancel_all(tasks)
+        if mispredictions:
+            logger.info(f"{mispredictions} of {len(pages_urls)} image urls were not predicted. Relearning pattern")
+            self.url_extrapolator.forget()
+
+    def predict_image_src(self, first_src: str, page_index: int) -> str | None:
+        """Image url of a page predicted from the first one. None when the numbering of the series is unknown"""
+        return self.url_extrapolator.predict(first_src, page_index)
+
+    @staticmethod
+    async def collect_pages(pages: AsyncIterator[tuple[int, str]]) -> list[str]:
+        page_index_to_src = {index: image_url async for index, image_url in pages}
+        return [page_index_to_src[index] for index in sorted(page_index_to_src)]
+
+    async def download(self) -> DownloadReport:
         """Creates a directory and downloads chapters, in other words: MangaDanga!"""
         status = "success"
         message = ""
+        report = DownloadReport(title=self.config.url)
+        self.control.bind()
+        await self.metrics.open()
+        await self.tracer.open()
         try:
-            logger.info(f"Scrapping information for: {self.config.url}")
-            web_data = await self.scrape_url(self.config.url)
-            title = self.get_title(web_data)
-            logger.info(f"Title: {title}")
-            sanitized_title = utils.format_name(title)
-            self.create_directory(sanitized_title)
-            # timed_get_all_chapters_to_url
-            scrap_chapters_info_start = time.time()
-            all_chapters = self.get_all_chapters_to_url(web_data)
-            scrap_chapters_info_end = time.time()
-            ellapsed_time = scrap_chapters_info_end - scrap_chapters_info_start
-            logger.info(f"Scrapped chapters info in: {ellapsed_time:.2f} seconds")
-            #
-            logger.info(f"Starting download for: {title}")
-            # Otra funcion
-            download_chapters_start = time.time()
-            chapter_number_to_url = self.get_chapter_number_to_url(all_chapters)
-            chapters_tasks = [
-                self.process_chapter(index, url, sanitized_title) for index, url in chapter_number_to_url.items()
-            ]
-            OnMangaInfoUpdate(self.event_manager).emit(len(chapters_tasks))
-            await gather_with_concurrency(self.config.threads, *chapters_tasks)
-            download_chapters_end = time.time()
-            ellapsed_time = download_chapters_end - download_chapters_start
-            logger.info(f"Finished downloading: {title} in {ellapsed_time:.2f} seconds")
-            #
-            # y nos olvidamos del tiempo medio por capítulo
-            # average_time_per_chapter = ellapsed_time / len(chapter_number_to_url)
-            # logger.info(f"Average time per chapter: {average_time_per_chapter:.2f} seconds")
+            await self.control.checkpoint()
+            async with self.open_session():
+                logger.info(f"Scrapping information for: {self.config.url}")
+                web_data = await self.scrape_url(self.config.url, "series")
+                title = await self.run_parser(self.get_title, web_data)
+                logger.info(f"Title: {title}")
+                sanitized_title = utils.format_name(title)
+                self.create_directory(sanitized_title)
+                all_chapters = await self.run_parser(self.get_all_chapters_to_url, web_data)
+                logger.info(f"Starting download for: {title}")
+                started_at = time.monotonic()
+                chapter_number_to_url = self.get_chapter_number_to_url(all_chapters)
+                OnMangaInfoUpdate(self.event_manager).emit(len(chapter_number_to_url))
+                with self.tracer.span("pipeline", title=title, chapters=len(chapter_number_to_url)):
+                    report = await Pipeline(self).run(chapter_number_to_url, sanitized_title)
+                elapsed_time = time.monotonic() - started_at
+                self.metrics.observe("series_seconds", elapsed_time)
+                logger.info(f"Finished downloading: {title} in {elapsed_time:.2f} seconds")
+                if report.failed:
+                    status = "warning"
+                    message = report.summary
+                    logger.warning(message)
+        except (asyncio.CancelledError, DownloadCancelledException) as e:
+            if not self.control.cancelled:
+                raise
+            if isinstance(e, asyncio.CancelledError):
+                asyncio.current_task().uncancel()  # type: ignore[union-attr]
+            # Unfinished chapters keep their partial archives, the next run resumes them
+            status = "warning"
+            message = f"Download of {self.config.url} cancelled"
+            report.error = message
+            report.cancelled = True
+            logger.warning(message)
         except Exception as e:
             status = "error"
             message = str(e)
+            report.error = message or repr(e)
             logger.exception(e)
         finally:
+            self.control.unbind()
+            await self.metrics.close()
+            await self.tracer.close()
+            if self.owns_parser_executor:
+                # Its threads are stopped, a new pool only starts threads if the downloader runs again
+                self.parser_executor.shutdown(wait=False)
+                self.parser_executor = self.create_parser_executor()
             OnDownloadFinished(self.event_manager).emit(status, message)
+        return report
 
     @abstractmethod
     def get_title(self, data: BeautifulSoup) -> str:
@@ -183,3 +431,31 @@ class Downloader(ABC):
     def get_all_chapters_to_url(self, data: BeautifulSoup) -> dict[ChapterIndex, str]:
         """Scrapes chapters urls. Returns a dict of chapter index to chapters urls"""
         pass
+
+
+class PagedDownloader(Downloader):
+    """Driver of a site that shows one image per page, the chapter url being its first page"""
+
+    async def get_images_src(self, data: BeautifulSoup) -> list[str]:
+        images_src = await self.collect_pages(self.iter_images_src(data))
+        return images_src
+
+    async def iter_images_src(self, data: BeautifulSoup) -> AsyncGenerator[tuple[int, str], None]:
+        # The chapter url is the first page: its image is the base of the predictions for the others
+        pages_urls = await self.run_parser(self.get_pages_urls, data)
+        first_src = await self.run_parser(self.get_page_image_src, data)
+        async for page in self.speculate_images_src(pages_urls, first_src, self.get_page_image_src):
+            yield page
+
+    async def get_images_src_exhaustive_search(self, data: BeautifulSoup) -> list[str]:
+        return await self.collect_pages(self.scrape_pages(self.get_pages_urls(data), self.get_page_image_src))
+
+    @abstractmethod
+    def get_pages_urls(self, data: BeautifulSoup) -> list[str]:
+        """Scrapes the urls of the pages of a chapter, in order"""
+        pass
+
+    @abstractmethod
+    def get_page_image_src(self, data: BeautifulSoup) -> str:
+        """Scrapes the image url of a page"""
+        pass
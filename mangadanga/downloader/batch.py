@@ -0,0 +1,123 @@
+# Standard Library
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Type
+
+# Dependencies
+import aiohttp
+
+# Local imports
+from .base import Downloader, create_connector
+from .catalog import CATALOG_NAME, Catalog
+from .concurrency import Scheduler
+from .config import DownloaderConfig
+from .control import DownloadControl
+from .downloader_factory import downloader_factory
+from .events import EVENT_MANAGER, EventManager
+from .metrics import Metrics
+from .models import BatchReport, SeriesFailure
+from .ratelimit import RateLimiter
+from .registry import REGISTRY, DriverRegistry
+from .retry import RetryPolicy
+from .store import STORE_NAME, ImageStore
+from .tracing import Tracer
+
+logger = logging.getLogger(__name__)
+
+
+class Batch:
+    """
+    Downloads many series, possibly from different sites, concurrently in one event loop. All series share the
+    concurrency budget of 'config': the scheduler, rate limiter, retry policy, parser pool, connection pool,
+    metrics and tracer, and its image store and catalog when they are enabled. 'control' pauses or cancels the
+    whole batch. The scheduler serves the series in turn, so a long series does not starve the others, and a slow
+    site only holds its own host slots. 'series' optionally bounds the series running at the same time.
+    """
+
+    def __init__(
+        self,
+        config: DownloaderConfig,
+        series_configs: list[DownloaderConfig],
+        series: int | None = None,
+        event_manager: EventManager = EVENT_MANAGER,
+        downloaders: set[Type[Downloader]] | None = None,
+        control: DownloadControl | None = None,
+    ) -> None:
+        self.config = config
+        self.series_configs = series_configs
+        self.series = asyncio.Semaphore(series or max(1, len(series_configs)))
+        self.event_manager = event_manager
+        self.control = control or DownloadControl()
+        # Drivers are looked up by domain once per series, a batch of given drivers gets its own registry
+        self.registry = DriverRegistry.from_drivers(downloaders) if downloaders is not None else REGISTRY
+        self.scheduler = Scheduler.from_config(config.threads, config.concurrency)
+        self.rate_limiter = RateLimiter(config.rate_limit)
+        self.metrics = Metrics.from_config(config)
+        self.retry_policy = RetryPolicy(config.retry, metrics=self.metrics)
+        self.tracer = Tracer.from_config(config)
+        self.parser_executor = ThreadPoolExecutor(max_workers=config.parser.workers, thread_name_prefix="parser")
+        self.store: ImageStore | None = None
+        if config.store.enabled:
+            store_path = config.store.path or os.path.join(config.path, STORE_NAME)
+            self.store = ImageStore(store_path, config.archive.chunk_size)
+        self.catalog: Catalog | None = None
+        if config.catalog.enabled:
+            self.catalog = Catalog(config.catalog.path or os.path.join(config.path, CATALOG_NAME))
+
+    @classmethod
+    def from_urls(cls, config: DownloaderConfig, urls: list[str], **kwargs: Any) -> "Batch":
+        """Batch of series downloaded with the same configuration"""
+        return cls(config, [config.model_copy(update={"url": url}) for url in urls], **kwargs)
+
+    def create_downloader(
+        self, config: DownloaderConfig, connector: aiohttp.BaseConnector, control: DownloadControl | None = None
+    ) -> Downloader:
+        return downloader_factory(
+            config,
+            registry=self.registry,
+            event_manager=self.event_manager,
+            scheduler=self.scheduler,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            parser_executor=self.parser_executor,
+            connector=connector,
+            store=self.store,
+            catalog=self.catalog,
+            control=control or self.control,
+            metrics=self.metrics,
+            tracer=self.tracer,
+        )
+
+    async def download_series(
+        self, config: DownloaderConfig, connector: aiohttp.BaseConnector, report: BatchReport
+    ) -> None:
+        async with self.series:
+            try:
+                downloader = self.create_downloader(config, connector)
+                series_report = await downloader.download()
+            except Exception as e:
+                logger.error(f"Could not download '{config.url}': {e!r}")
+                report.failed.append(SeriesFailure(url=config.url, error=str(e) or repr(e)))
+                return
+            if series_report.error is not None:
+                report.failed.append(SeriesFailure(url=config.url, error=series_report.error))
+            else:
+                report.series.append(series_report)
+
+    async def run(self) -> BatchReport:
+        report = BatchReport()
+        connector = create_connector(self.config.connection)
+        # Held open for the whole batch, the summary covers every series
+        await self.metrics.open()
+        await self.tracer.open()
+        try:
+            await asyncio.gather(*(self.download_series(config, connector, report) for config in self.series_configs))
+        finally:
+            await self.metrics.close()
+            await self.tracer.close()
+            await connector.close()
+            self.parser_executor.shutdown(wait=False)
+        logger.info(report.summary)
+        return report
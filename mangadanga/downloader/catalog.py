@@ -0,0 +1,173 @@
+# Standard Library
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+
+# Local imports
+from .models import ChapterIndex, ImageRecord, SeriesSummary
+from .resources import SharedResource, Worker
+
+logger = logging.getLogger(__name__)
+
+CATALOG_NAME = ".mangadanga-catalog.sqlite3"
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    directory TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chapters (
+    id INTEGER PRIMARY KEY,
+    series_id INTEGER NOT NULL REFERENCES series(id) ON DELETE CASCADE,
+    chapter TEXT NOT NULL,
+    url TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    UNIQUE (series_id, chapter)
+);
+CREATE TABLE IF NOT EXISTS images (
+    id INTEGER PRIMARY KEY,
+    chapter_id INTEGER NOT NULL REFERENCES chapters(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    UNIQUE (chapter_id, name)
+);
+CREATE INDEX IF NOT EXISTS images_sha256 ON images (sha256);
+CREATE INDEX IF NOT EXISTS images_url ON images (url);
+CREATE INDEX IF NOT EXISTS chapters_path ON chapters (path);
+"""
+
+
+def get_archive_digest(path: str, images: dict[str, ImageRecord], chunk_size: int = 64 * 1024) -> tuple[int, str]:
+    """
+    Size and sha256 of a chapter. An archive is hashed as a file, a folder by the sorted names and hashes of its
+    images, which the manifest already knows
+    """
+    if os.path.isdir(path):
+        digest = hashlib.sha256()
+        for name in sorted(images):
+            digest.update(f"{name}:{images[name].sha256}\n".encode())
+        return sum(image.size for image in images.values()), digest.hexdigest()
+    size = 0
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+class Catalog(SharedResource):
+    """SQLite catalog of the library: series -> chapters -> images, written from its own thread"""
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        self.worker = Worker("catalog")
+        self.connection: sqlite3.Connection | None = None
+
+    async def setup(self) -> None:
+        self.worker.start()
+        await self.worker.run(self.connect)
+
+    async def teardown(self) -> None:
+        try:
+            if self.connection is not None:
+                await self.worker.run(self.connection.close)
+                self.connection = None
+        finally:
+            self.worker.stop()
+
+    def connect(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def get_connection(self) -> sqlite3.Connection:
+        if self.connection is None:
+            raise ValueError(f"Catalog '{self.path}' is not open")
+        return self.connection
+
+    def upsert_series(self, url: str, title: str, directory: str) -> int:
+        # Paths are stored absolute, the library is read from any working directory
+        directory = os.path.abspath(directory)
+        connection = self.get_connection()
+        with connection:
+            connection.execute(
+                "INSERT INTO series (url, title, directory, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET title = excluded.title, directory = excluded.directory, "
+                "updated_at = excluded.updated_at",
+                (url, title, directory, time.time()),
+            )
+        (series_id,) = connection.execute("SELECT id FROM series WHERE url = ?", (url,)).fetchone()
+        return int(series_id)
+
+    def add_chapter(
+        self, series_id: int, chapter: ChapterIndex, url: str, path: str, images: dict[str, ImageRecord]
+    ) -> None:
+        path = os.path.abspath(path)
+        size, sha256 = get_archive_digest(path, images)
+        connection = self.get_connection()
+        with connection:
+            # A chapter downloaded again replaces the previous one, and its images with it
+            connection.execute("DELETE FROM chapters WHERE series_id = ? AND chapter = ?", (series_id, chapter))
+            cursor = connection.execute(
+                "INSERT INTO chapters (series_id, chapter, url, path, size, sha256, completed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (series_id, chapter, url, path, size, sha256, time.time()),
+            )
+            connection.executemany(
+                "INSERT INTO images (chapter_id, name, url, size, sha256) VALUES (?, ?, ?, ?, ?)",
+                [(cursor.lastrowid, name, image.url, image.size, image.sha256) for name, image in images.items()],
+            )
+            connection.execute("UPDATE series SET updated_at = ? WHERE id = ?", (time.time(), series_id))
+
+    def get_chapters(self, series_url: str) -> dict[ChapterIndex, str]:
+        """Chapter -> archive path of every chapter of a series in the catalog"""
+        rows = self.get_connection().execute(
+            "SELECT chapters.chapter, chapters.path FROM chapters "
+            "JOIN series ON series.id = chapters.series_id WHERE series.url = ?",
+            (series_url,),
+        )
+        return {ChapterIndex(chapter): path for chapter, path in rows}
+
+    def get_summary(self) -> list[SeriesSummary]:
+        rows = self.get_connection().execute(
+            "SELECT series.url, series.title, COUNT(DISTINCT chapters.id), COALESCE(SUM(chapters.size), 0), "
+            "(SELECT COUNT(*) FROM images JOIN chapters AS c ON c.id = images.chapter_id WHERE c.series_id = series.id) "
+            "FROM series LEFT JOIN chapters ON chapters.series_id = series.id "
+            "GROUP BY series.id ORDER BY series.title"
+        )
+        return [
+            SeriesSummary(url=url, title=title, chapters=chapters, size=size, images=images)
+            for url, title, chapters, size, images in rows
+        ]
+
+    async def register_series(self, url: str, title: str, directory: str) -> int:
+        return await self.worker.run(self.upsert_series, url, title, directory)
+
+    async def record_chapter(
+        self, series_id: int, chapter: ChapterIndex, url: str, path: str, images: dict[str, ImageRecord]
+    ) -> None:
+        await self.worker.run(self.add_chapter, series_id, chapter, url, path, images)
+
+    async def completed_chapters(self, series_url: str) -> dict[ChapterIndex, str]:
+        return await self.worker.run(self.get_chapters, series_url)
+
+    async def summary(self) -> list[SeriesSummary]:
+        return await self.worker.run(self.get_summary)
@@ -1,3 +1,6 @@
+from bisect import bisect_right
+from typing import Iterable
+
 from ..downloader.config import ChapterStrategyConfig
 from .models import ChapterIndex
 from abc import ABC, abstractmethod
@@ -9,43 +12,97 @@ class ChapterSelectionStrategy(ABC):
     def chapter_in_selection(self, chapter: ChapterIndex) -> bool:
         pass
 
+    def select(self, all_chapters: dict[ChapterIndex, str]) -> dict[ChapterIndex, str]:
+        """Selected chapters of a series, in numeric order"""
+        chapters = sorted(ChapterIndex(chapter) for chapter in all_chapters)
+        return {chapter: all_chapters[chapter] for chapter in chapters if self.chapter_in_selection(chapter)}
+
 
 class AllChaptersSelection(ChapterSelectionStrategy):
     def chapter_in_selection(self, _: ChapterIndex) -> bool:
         return True
 
 
-class ChapterListSelection(ChapterSelectionStrategy):
-    def __init__(self, chapters: list[ChapterIndex]) -> None:
+class ChapterSelection(ChapterSelectionStrategy):
+    """
+    Union of chapters, chapter ranges and the latest chapters of a series, compiled once: listed chapters into
+    sets, ranges into sorted disjoint intervals searched by bisection. Numbered chapters match by number, so
+    "10" also selects "10.0", the others by name
+    """
+
+    def __init__(
+        self,
+        chapters: Iterable[str] = (),
+        ranges: Iterable[tuple[str, str]] = (),
+        latest: int = 0,
+    ) -> None:
         super().__init__()
-        self.chapters = chapters
+        listed = [ChapterIndex(chapter) for chapter in chapters]
+        self.numbers = {chapter.number for chapter in listed if chapter.number is not None}
+        self.names = {str(chapter) for chapter in listed if chapter.number is None}
+        self.starts: list[float] = []
+        self.ends: list[float] = []
+        for lower_bound, upper_bound in sorted(self.parse_range(*bounds) for bounds in ranges):
+            if self.ends and lower_bound <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], upper_bound)
+            else:
+                self.starts.append(lower_bound)
+                self.ends.append(upper_bound)
+        self.latest = latest
+
+    @staticmethod
+    def parse_range(lower_bound: str, upper_bound: str) -> tuple[float, float]:
+        lower, upper = ChapterIndex(lower_bound).number, ChapterIndex(upper_bound).number
+        if lower is None or upper is None:
+            raise DownloaderException(f"Invalid range pattern. '{lower_bound}' to '{upper_bound}' are not numbers")
+        if lower > upper:
+            raise DownloaderException(f"Invalid range pattern. '{lower}' is greater than '{upper}'")
+        return lower, upper
+
+    def in_ranges(self, number: float) -> bool:
+        index = bisect_right(self.starts, number) - 1
+        return index >= 0 and number <= self.ends[index]
 
     def chapter_in_selection(self, chapter: ChapterIndex) -> bool:
-        return chapter in self.chapters
+        """Whether a chapter is listed or in a range. The latest chapters depend on the series, see 'select'"""
+        chapter = ChapterIndex(chapter)
+        if chapter.number is None:
+            return chapter in self.names
+        return chapter.number in self.numbers or self.in_ranges(chapter.number)
 
+    def select(self, all_chapters: dict[ChapterIndex, str]) -> dict[ChapterIndex, str]:
+        chapters = sorted(ChapterIndex(chapter) for chapter in all_chapters)
+        # The latest chapters are the highest numbered ones, extras without a number do not count
+        numbered = [chapter for chapter in chapters if chapter.number is not None]
+        latest = set(numbered[-self.latest :]) if self.latest > 0 else set()
+        return {
+            chapter: all_chapters[chapter]
+            for chapter in chapters
+            if chapter in latest or self.chapter_in_selection(chapter)
+        }
 
-class ChapterRangeSelection(ChapterSelectionStrategy):
-    @staticmethod
-    def remove_non_numeric(string: str) -> str:
-        return "".join(char for char in string if char.isnumeric() or char == ".")
 
+class ChapterListSelection(ChapterSelection):
+    def __init__(self, chapters: list[ChapterIndex]) -> None:
+        super().__init__(chapters=chapters)
+
+
+class ChapterRangeSelection(ChapterSelection):
     def __init__(self, lower_bound: ChapterIndex, upper_bound: ChapterIndex) -> None:
-        super().__init__()
-        self.lower_bound = float(self.remove_non_numeric(lower_bound))
-        self.upper_bound = float(self.remove_non_numeric(upper_bound))
-        if self.lower_bound > self.upper_bound:
-            raise DownloaderException(
-                f"Invalid range pattern. '{self.lower_bound}' is greater than '{self.upper_bound}'"
-            )
+        super().__init__(ranges=[(lower_bound, upper_bound)])
+
 
-    def chapter_in_selection(self, chapter: float) -> bool:
-        return self.lower_bound <= float(self.remove_non_numeric(chapter)) <= self.upper_bound
+class LatestChaptersSelection(ChapterSelection):
+    def __init__(self, count: int) -> None:
+        super().__init__(latest=count)
 
 
 STRATEGIES: dict[str, type[ChapterSelectionStrategy]] = {
     "all": AllChaptersSelection,
     "list": ChapterListSelection,
     "range": ChapterRangeSelection,
+    "latest": LatestChaptersSelection,
+    "selection": ChapterSelection,
 }
 
 
@@ -1,4 +1,10 @@
 import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Iterable
+
+from .config import ConcurrencyConfig
+from .utils import get_host
 
 
 async def gather_with_concurrency(n, *coros):
@@ -9,3 +15,117 @@ async def gather_with_concurrency(n, *coros):
             return await coro
 
     return await asyncio.gather(*(sem_coro(c) for c in coros))
+
+
+async def cancel_all(futures: Iterable["asyncio.Future[Any]"]) -> None:
+    tasks = list(futures)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def gather_or_cancel(*aws: Awaitable[Any]) -> list[Any]:
+    """Like 'asyncio.gather', but the remaining tasks are cancelled and awaited as soon as one of them fails"""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        await cancel_all(tasks)
+        raise
+
+
+class FairSemaphore:
+    """
+    Semaphore that hands the released slots to its flows in turn instead of in arrival order. A flow queuing
+    many waiters, like a series with a thousand chapters, gets one slot per turn like any other flow.
+    """
+
+    def __init__(self, value: int = 1) -> None:
+        self.value = value
+        # Flow -> its waiters. The order of the dict is the order of the turns
+        self.waiters: dict[str, deque[asyncio.Future[None]]] = dict()
+
+    def locked(self) -> bool:
+        return self.value == 0
+
+    async def acquire(self, flow: str = "") -> None:
+        if self.value > 0 and not self.waiters:
+            self.value -= 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(flow, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right before the cancellation
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self.value += 1
+        self.wake()
+
+    def wake(self) -> None:
+        while self.value > 0 and self.waiters:
+            flow, flow_waiters = next(iter(self.waiters.items()))
+            waiter = flow_waiters.popleft()
+            # The flow goes to the back of the turns
+            del self.waiters[flow]
+            if flow_waiters:
+                self.waiters[flow] = flow_waiters
+            if waiter.done():
+                continue
+            self.value -= 1
+            waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, flow: str = "") -> AsyncIterator[None]:
+        await self.acquire(flow)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class Scheduler:
+    """
+    Bounds the work in flight with separate global limits for chapters, images and page scrapes, plus a cap of
+    requests per host. A request holds one global slot and one host slot, so the total number of requests in
+    flight never exceeds 'images + pages' whatever the size of the chapters.
+
+    Slots are shared fairly between flows, the series of a batch: each flow is served in turn. The host slot is
+    taken before the global one, so requests queued behind a slow host never hold a slot other hosts could use.
+    """
+
+    def __init__(self, chapters: int = 1, images: int = 8, pages: int = 4, per_host: int = 6) -> None:
+        self.chapters = FairSemaphore(chapters)
+        self.images = FairSemaphore(images)
+        self.pages = FairSemaphore(pages)
+        self.per_host = per_host
+        self.hosts: dict[str, FairSemaphore] = dict()
+
+    @classmethod
+    def from_config(cls, chapters: int, config: ConcurrencyConfig) -> "Scheduler":
+        return cls(chapters=chapters, images=config.images, pages=config.pages, per_host=config.per_host)
+
+    def host(self, url: str) -> FairSemaphore:
+        host = get_host(url)
+        if host not in self.hosts:
+            self.hosts[host] = FairSemaphore(self.per_host)
+        return self.hosts[host]
+
+    @asynccontextmanager
+    async def chapter_slot(self, flow: str = "") -> AsyncIterator[None]:
+        async with self.chapters.slot(flow):
+            yield
+
+    @asynccontextmanager
+    async def image_slot(self, url: str, flow: str = "") -> AsyncIterator[None]:
+        async with self.host(url).slot(flow), self.images.slot(flow):
+            yield
+
+    @asynccontextmanager
+    async def page_slot(self, url: str, flow: str = "") -> AsyncIterator[None]:
+        async with self.host(url).slot(flow), self.pages.slot(flow):
+            yield
@@ -7,8 +7,111 @@ class ChapterStrategyConfig(BaseModel):
     config: dict[str, Any] = {}
 
 
+class ConnectionConfig(BaseModel):
+    limit: int = 100
+    limit_per_host: int = 8
+    keepalive_timeout: float = 30.0
+    use_dns_cache: bool = True
+    ttl_dns_cache: int = 300
+
+
+class ConcurrencyConfig(BaseModel):
+    images: int = 8
+    pages: int = 4
+    per_host: int = 6
+
+
+class RateLimitConfig(BaseModel):
+    requests_per_second: float = 8.0
+    burst: int = 8
+    min_rate: float = 0.2
+    max_rate: float = 50.0
+    increase_step: float = 0.5
+    decrease_factor: float = 0.5
+    max_throttle_retries: int = 5
+
+
+class RetryConfig(BaseModel):
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    jitter: bool = True
+    attempt_timeout: float = 60.0
+    deadline: float = 300.0
+    failure_threshold: int = 8
+    reset_timeout: float = 30.0
+
+
+class ArchiveConfig(BaseModel):
+    chunk_size: int = 64 * 1024
+    spool_max_size: int = 512 * 1024
+    write_queue_size: int = 4
+    # "zip" writes an archive per chapter, "folder" a folder of images
+    format: str = "zip"
+
+
+class StoreConfig(BaseModel):
+    # Keep repeated images once in a content-addressed store shared by the whole library. Folder output hardlinks
+    # them from the store; zip output also keeps a copy of each repeated image in the store, to skip fetching it
+    enabled: bool = False
+    # Defaults to '.mangadanga-store' in the download path
+    path: str = ""
+
+
+class CatalogConfig(BaseModel):
+    # Record every finished chapter in a SQLite catalog of the library
+    enabled: bool = True
+    # Defaults to '.mangadanga-catalog.sqlite3' in the download path
+    path: str = ""
+
+
+class MetricsConfig(BaseModel):
+    # Write a JSON summary of the throughput at the end of each run
+    summary: bool = True
+    # Defaults to '.mangadanga-metrics.json' in the download path
+    summary_path: str = ""
+    # Prometheus text file rewritten every 'interval' seconds while downloads run. Disabled when empty
+    prometheus_path: str = ""
+    interval: float = 15.0
+
+
+class TracingConfig(BaseModel):
+    # Chrome trace of the spans of every stage, written at the end of a run. Disabled when empty
+    path: str = ""
+    # Spans recorded at most, the trace of a huge run keeps its beginning
+    max_events: int = 1_000_000
+
+
+class PipelineConfig(BaseModel):
+    resolvers: int = 2
+    writers: int = 2
+    chapters_queue_size: int = 2
+    images_queue_size: int = 32
+    archive_queue_size: int = 8
+    report_interval: float = 10.0
+
+
+class ParserConfig(BaseModel):
+    workers: int = 2
+    # "auto" picks lxml when it is installed, html.parser otherwise
+    backend: str = "auto"
+    # Build only the parts of each page the driver selectors read
+    partial: bool = True
+
+
 class DownloaderConfig(BaseModel):
     url: str = ""
     path: str = "."
     chapter_strategy: ChapterStrategyConfig = ChapterStrategyConfig()
     threads: int = 1
+    concurrency: ConcurrencyConfig = ConcurrencyConfig()
+    connection: ConnectionConfig = ConnectionConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
+    retry: RetryConfig = RetryConfig()
+    archive: ArchiveConfig = ArchiveConfig()
+    store: StoreConfig = StoreConfig()
+    catalog: CatalogConfig = CatalogConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    tracing: TracingConfig = TracingConfig()
+    pipeline: PipelineConfig = PipelineConfig()
+    parser: ParserConfig = ParserConfig()
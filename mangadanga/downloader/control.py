@@ -0,0 +1,92 @@
+# Standard Library
+import asyncio
+import logging
+from typing import Any
+
+# Local imports
+from .exceptions import DownloadCancelledException
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadControl:
+    """
+    Cancel and pause tokens of one or more downloads, driven from any thread (the GUI) and checked by the
+    download stages before they take a network slot:
+
+    - Pausing holds every stage at its next checkpoint. Requests in flight finish and images already fetched are
+      still archived, but no new request starts, so the network slots go to the other jobs until it resumes. The
+      pipelines also give their chapter slots back while paused.
+    - Cancelling also cancels the running downloads, which closes their connections at once. Chapters left
+      unfinished keep their partial archive and manifest entries, so the next run resumes them.
+    """
+
+    def __init__(self) -> None:
+        self.cancelled = False
+        self.paused = False
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.tasks: set[asyncio.Task[Any]] = set()
+        self.resumed: asyncio.Event | None = None
+        self.pausing: asyncio.Event | None = None
+
+    def bind(self) -> None:
+        """Registers the current task as a download this control cancels"""
+        task = asyncio.current_task()
+        assert task is not None
+        self.loop = asyncio.get_running_loop()
+        self.tasks.add(task)
+        if self.resumed is None:
+            self.resumed = asyncio.Event()
+            self.pausing = asyncio.Event()
+
+    def unbind(self) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self.tasks.discard(task)
+
+    def call_soon(self, function: Any, *args: Any) -> None:
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(function, *args)
+
+    def pause(self) -> None:
+        logger.info("Pausing downloads")
+        self.paused = True
+        self.call_soon(self.suspend)
+
+    def resume(self) -> None:
+        logger.info("Resuming downloads")
+        self.paused = False
+        self.call_soon(self.wake)
+
+    def cancel(self) -> None:
+        logger.info("Cancelling downloads")
+        self.cancelled = True
+        self.paused = False
+        self.call_soon(self.cancel_tasks)
+
+    def wake(self) -> None:
+        if self.resumed is not None:
+            self.resumed.set()
+
+    def suspend(self) -> None:
+        if self.pausing is not None:
+            self.pausing.set()
+
+    def cancel_tasks(self) -> None:
+        self.wake()
+        for task in self.tasks:
+            task.cancel()
+
+    async def checkpoint(self) -> None:
+        """Waits while paused. Raises 'DownloadCancelledException' once cancelled"""
+        while self.paused and self.resumed is not None:
+            self.resumed.clear()
+            await self.resumed.wait()
+        if self.cancelled:
+            raise DownloadCancelledException("The download was cancelled")
+
+    async def wait_for_pause(self) -> None:
+        """Returns once the downloads are paused"""
+        while not self.paused and self.pausing is not None:
+            self.pausing.clear()
+            await self.pausing.wait()
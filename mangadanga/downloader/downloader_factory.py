@@ -1,43 +1,46 @@
-from typing import Type
+from typing import Any, Type
 import urllib.parse
 from .exceptions import DownloaderException
 from .base import Downloader, DownloaderConfig
-from .drivers import Mangadoom, Manganato, Mangatown, Asurascans
+from .registry import REGISTRY, DriverRegistry
 
 
-DOWNLOADERS: set[Type[Downloader]] = {
-    Mangadoom,
-    Manganato,
-    Mangatown,
-    Asurascans,
-}
+def get_downloaders() -> set[Type[Downloader]]:
+    """Every driver of the default registry, imported"""
+    return REGISTRY.load_all()
+
+
+def __getattr__(name: str) -> Any:
+    if name == "DOWNLOADERS":
+        return get_downloaders()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 
 def get_domain(url: str) -> str:
-    domain = urllib.parse.urlparse(url).netloc
+    domain = urllib.parse.urlparse(url).hostname or ""
     return domain
 
 
-def downloader_factory(config: DownloaderConfig, downloaders: set[Type[Downloader]] = DOWNLOADERS) -> Downloader:
-    domain = get_domain(config.url)
-
-    # for downloader_cls in downloaders:
-    #     if domain in downloader_cls.DOMAINS:
-    #         return downloader_cls(config)
-
-    try:
-        downloader_cls = next(downloader for downloader in downloaders if domain in downloader.DOMAINS)
-        return downloader_cls(config)
-    except StopIteration:
-        valid_urls = sum(((list(downloader.DOMAINS)) for downloader in downloaders), start=[])
-        message_lines = (
-            [
-                f"'{config.url}' is not covered (yet) by Mangadanga.",
-                "",
-                "Valid domain names:",
-            ]
-            + [" - " + valid_url for valid_url in valid_urls]
-            + ["", "Our door is always open for a good cup of coffee!", "buymeacoffee@needmoney.co"]
-        )
-        message = "\n".join(message_lines)
-        raise DownloaderException(message)
+def downloader_factory(
+    config: DownloaderConfig,
+    downloaders: set[Type[Downloader]] | None = None,
+    registry: DriverRegistry | None = None,
+    **kwargs: Any,
+) -> Downloader:
+    """Downloader of the site of 'config.url', from the given drivers or else from the registry of every driver"""
+    if registry is None:
+        registry = DriverRegistry.from_drivers(downloaders) if downloaders is not None else REGISTRY
+    downloader_cls = registry.get(get_domain(config.url))
+    if downloader_cls is not None:
+        return downloader_cls(config, **kwargs)
+    message_lines = (
+        [
+            f"'{config.url}' is not covered (yet) by Mangadanga.",
+            "",
+            "Valid domain names:",
+        ]
+        + [" - " + valid_url for valid_url in registry.domains()]
+        + ["", "Our door is always open for a good cup of coffee!", "buymeacoffee@needmoney.co"]
+    )
+    message = "\n".join(message_lines)
+    raise DownloaderException(message)
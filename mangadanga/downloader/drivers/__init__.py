@@ -1,12 +1,24 @@
-from .mangadoom import Mangadoom
-from .manganato import Manganato
-from .mangatown import Mangatown
-from .asurascans import Asurascans
+import importlib
+from typing import Any
+
+# Drivers are only imported once they are used, not along with the downloader package
+LAZY_IMPORTS = {
+    "Manganato": ".manganato",
+    "Mangatown": ".mangatown",
+    "Mangadoom": ".mangadoom",
+    "Asurascans": ".asurascans",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in LAZY_IMPORTS:
+        return getattr(importlib.import_module(LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 
 __all__ = [
     "Manganato",
     "Mangatown",
     "Mangadoom",
-    "Asurascans"
+    "Asurascans",
 ]
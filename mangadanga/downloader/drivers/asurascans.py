@@ -9,13 +9,20 @@ class Asurascans(Downloader):
     URL = "https://asura.gg/"
     DOMAINS = {"www.asurascans.com", "asura.gg"}
     EXTRA_HEADERS = {"Referer": f"{URL}"}
+    SELECTORS = {
+        "title": ".entry-title",
+        "chapters": ".eplister a",
+        "chapter_title": ".entry-title",
+        "images": ".rdminimal img",
+    }
+    PAGE_SELECTORS = {"series": ["title", "chapters"], "chapter": ["chapter_title", "images"]}
 
     def get_title(self, data: BeautifulSoup) -> str:
-        title = data.find(class_="entry-title").string
+        title = self.select_one(data, "title").string
         return title
 
     def get_all_chapters_to_url(self, data: BeautifulSoup) -> dict[ChapterIndex, str]:
-        chapter_content = data.find(class_="eplister").find_all("a")
+        chapter_content = self.select(data, "chapters")
         chapter_content.reverse()
         old_str = f"2226495089-{self.get_title(data).replace(' ', '-').lower()}-chapter-"
         # Better to do an enumerate
@@ -25,12 +32,16 @@ class Asurascans(Downloader):
         return chapter_number_to_url
 
     def get_chapter_filename(self, index: int, data: BeautifulSoup) -> str:
-        chapter_title = data.find(class_="entry-title").string
+        chapter_title = self.select_one(data, "chapter_title").string
         formatted_chapter_title = utils.format_name(chapter_title)
         chapter_filename = f"{index}_{formatted_chapter_title}.zip"
         return chapter_filename
 
     async def get_images_src(self, data: BeautifulSoup) -> list[str]:
-        images = data.find(class_="rdminimal").find_all("img")
+        images_src = await self.run_parser(self.get_images_src_from_page, data)
+        return images_src
+
+    def get_images_src_from_page(self, data: BeautifulSoup) -> list[str]:
+        images = self.select(data, "images")
         images_src = [img["src"] for img in images]
         return images_src
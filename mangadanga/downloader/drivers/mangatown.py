@@ -5,23 +5,34 @@ from pathlib import PurePath
 
 from .. import utils
 from ..models import ChapterIndex
-from ..base import Downloader
-
+from ..base import PagedDownloader
 
 logger = logging.getLogger("MangatownDownloader")
 
 
-class Mangatown(Downloader):
+class Mangatown(PagedDownloader):
     URL = "https://www.mangatown.com/"
     DOMAINS = {"www.mangatown.com"}
     EXTRA_HEADERS = {"Referer": f"{URL}"}
+    SELECTORS = {
+        "title": ".title-top",
+        "chapters": ".chapter_list a",
+        "chapter_title": ".title h1",
+        "pages": ".page_select option",
+        "page_image": ".read_img img",
+    }
+    PAGE_SELECTORS = {
+        "series": ["title", "chapters"],
+        "chapter": ["chapter_title", "pages", "page_image"],
+        "page": ["page_image"],
+    }
 
     def get_title(self, data: BeautifulSoup) -> str:
-        title = data.find(class_="title-top").string
+        title = self.select_one(data, "title").string
         return title
 
     def get_all_chapters_to_url(self, data: BeautifulSoup) -> dict[ChapterIndex, str]:
-        chapter_content = data.find(class_="chapter_list").find_all("a")
+        chapter_content = self.select(data, "chapters")
         chapter_content.reverse()
         chapter_number_to_url = {
             ChapterIndex(PurePath(data["href"]).name.replace("c", "").lstrip("0")): f"{self.URL}" + data["href"]
@@ -30,7 +41,7 @@ class Mangatown(Downloader):
         return chapter_number_to_url
 
     def get_chapter_filename(self, index: int, data: BeautifulSoup) -> str:
-        chapter_title = data.find(class_="title").find("h1").string
+        chapter_title = self.select_one(data, "chapter_title").string
         formatted_chapter_title = utils.format_name(chapter_title)
         chapter_filename = f"{index}_{formatted_chapter_title}.zip"
         return chapter_filename
@@ -50,48 +61,20 @@ class Mangatown(Downloader):
         new_url = f"{path}/{new_name}"
         return new_url
 
-    async def get_images_src(self, data: BeautifulSoup) -> list[str]:
-        data.find(class_="page_select").find("option", string="Featured").extract()  # Unnecessary Ad element
-        # Not downloading the images using this algorithm. Maybe async issues.
-        # number_of_imgs = len(data.find(class_="page_select").find_all("option"))
-        # first_img_src: str = "https:" + data.find(class_="read_img").find("img")["src"]
-        # src_numbers_suffix = self.get_src_numbers_suffix(first_img_src)
-
-        # base_index = int(src_numbers_suffix)
-        # padding = len(src_numbers_suffix)
-        # images_src = [
-        #     self.extrapolate_image_url(first_img_src, i, padding) for i in range(base_index, number_of_imgs + 1)
-        # ]
-
-        # Works but its slow
-        images_src = await self.get_images_src_exhaustive_search(data)
-
-        # if images_src != images_src_safe:
-        #     # print differences in images_src and images_src_safe
-        #     logger.error(f"images_src and images_src_safe are different. {images_src} != {images_src_safe}")
-        #     logger.error(set(images_src) - set(images_src_safe))
-        #     logger.error(set(images_src_safe) - set(images_src))
-        #     raise Exception("images_src and images_src_safe are different")
-        return images_src
-
-    # async def get_images_src_old(self, data: BeautifulSoup) -> list[str]:
-    #     data.find(class_="page_select").find("option", string="Featured").extract()  # Unnecessary Ad element
-    #     try:
-    #         # Not downloading the images using this algorithm. Maybe async issues.
-    #         number_of_imgs = len(data.find(class_="page_select").find_all("option"))
-    #         first_img_src: str = "https:" + data.find(class_="read_img").find("img")["src"]
-    #         src_numbers_suffix = self.get_src_numbers_suffix(first_img_src)
-    #         images_src = [first_img_src]
-    #         for i in range(1, number_of_imgs):
-    #             new_suffix = str(int(src_numbers_suffix) + i).zfill(len(src_numbers_suffix))
-    #             images_src.append(first_img_src.replace(src_numbers_suffix, new_suffix))
-    #     except:
-    #         # Works but its slow
-    #         images_src = await self.get_images_src_exhaustive_search(data)
-    #     return images_src
-
-    async def get_images_src_exhaustive_search(self, data: BeautifulSoup) -> list[str]:
-        data_options = data.find(class_="page_select").find_all("option")
-        chapter_data = [await self.scrape_url(self.URL + url["value"]) for url in data_options]
-        images_src = ["https:" + data.find(class_="read_img").find("img")["src"] for data in chapter_data]
-        return images_src
+    def predict_image_src(self, first_src: str, page_index: int) -> str | None:
+        predicted_src = super().predict_image_src(first_src, page_index)
+        if predicted_src is not None:
+            return predicted_src
+        # Chapters numbered unlike the learned pattern still end in the page number: ".../fma_03_01.jpg"
+        suffix = self.get_src_numbers_suffix(first_src)
+        if not suffix or PurePath(first_src).stem.rsplit("_", 1)[-1] != suffix:
+            return None
+        return self.extrapolate_image_url(first_src, int(suffix) + page_index, len(suffix))
+
+    def get_pages_urls(self, data: BeautifulSoup) -> list[str]:
+        # The "Featured" option is an unnecessary Ad element
+        options = [option for option in self.select(data, "pages") if option.string != "Featured"]
+        return [self.URL + option["value"] for option in options]
+
+    def get_page_image_src(self, data: BeautifulSoup) -> str:
+        return "https:" + self.select_one(data, "page_image")["src"]
@@ -0,0 +1,158 @@
+# Standard Library
+import logging
+import threading
+import time
+from queue import Empty, Full, Queue
+from typing import Any, Callable
+
+logger = logging.getLogger("EventManager")
+
+
+class EventManager:
+    """
+    Event bus between the downloads and the GUI. Any thread or coroutine may emit, without blocking; listeners run
+    where 'process_queue' is called, the Tk thread.
+
+    - Discrete events (a download started or finished...) go through a bounded queue, in order.
+    - Progress events (chapters, images and bytes done) are high frequency counters: they are summed as they are
+      emitted and listeners get one snapshot of each per call to 'process_queue', however many were emitted.
+
+    Events nobody listens to are dropped when they are emitted, so headless runs that never process the queue do
+    not pile them up: subscribe before starting a download. 'dropped' counts them, and the events lost to a full
+    queue.
+    """
+
+    def __init__(self, max_queued_events: int = 10_000) -> None:
+        self.running = False
+        self.events_queue: Queue[tuple[str, tuple, dict[str, Any]]] = Queue(max_queued_events)
+        self.progress: dict[str, tuple[int, ...]] = dict()
+        self.progress_lock = threading.Lock()
+        self.listeners: dict[str, list[Callable[..., None]]] = dict()
+        self.dropped = 0
+
+    def subscribe(self, event: str, listener: Callable[..., None]):
+        if event not in self.listeners:
+            self.listeners[event] = []
+        self.listeners[event].append(listener)
+
+    def unsubscribe(self, event: str, listener: Callable[..., None]):
+        if event in self.listeners:
+            self.listeners[event].remove(listener)
+
+    def has_listeners(self, event: str) -> bool:
+        return bool(self.listeners.get(event))
+
+    def emit(self, event: str, *args, **kwargs):
+        if not self.has_listeners(event):
+            self.dropped += 1
+            return
+        logger.debug(f"Emitting event {event}")
+        try:
+            self.events_queue.put_nowait((event, args, kwargs))
+        except Full:
+            self.dropped += 1
+            logger.warning(f"Event queue is full, dropping event {event}")
+
+    def emit_progress(self, event: str, *amounts: int):
+        """Adds to the next snapshot of a progress event"""
+        if not self.has_listeners(event):
+            self.dropped += 1
+            return
+        with self.progress_lock:
+            total = self.progress.get(event)
+            self.progress[event] = amounts if total is None else tuple(map(sum, zip(total, amounts)))
+
+    def take_snapshots(self) -> dict[str, tuple[int, ...]]:
+        """Progress emitted since the last snapshot"""
+        with self.progress_lock:
+            snapshots, self.progress = self.progress, dict()
+        return snapshots
+
+    def process_event(self, event, *args, **kwargs):
+        if event in self.listeners:
+            for listener in self.listeners[event]:
+                try:
+                    listener(*args, **kwargs)
+                except Exception as e:
+                    logger.exception(f"Exception raised while processing event {event}: {e}")
+        else:
+            logger.warning(f"Event {event} has no listeners")
+
+    def process_queue(self, budget: float | None = None):
+        """
+        Delivers the queued events, then the progress snapshots. With a budget in seconds, the events left once it
+        is spent wait for the next call, so the caller's thread is never held for long
+        """
+        deadline = time.monotonic() + budget if budget is not None else None
+        while not self.events_queue.empty():
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            event, args, kwargs = self.events_queue.get_nowait()
+            logger.debug(f"Processing event for {event}")
+            self.process_event(event, *args, **kwargs)
+        for event, amounts in self.take_snapshots().items():
+            if self.has_listeners(event):
+                self.process_event(event, *amounts)
+
+    def stop(self):
+        self.running = False
+
+    def purge_events(self):
+        # Drained in place, threads still emitting into the queue would miss a new one
+        while True:
+            try:
+                self.events_queue.get_nowait()
+            except Empty:
+                break
+        self.take_snapshots()
+
+
+EVENT_MANAGER = EventManager()
+
+
+class Event:
+    NAME = None
+
+    def __init__(self, manager: EventManager = EVENT_MANAGER):
+        self.manager = manager
+
+    def emit(self, *args, **kwargs):
+        if self.NAME is None:
+            raise NotImplementedError("An event needs a name...")
+        self.manager.emit(self.NAME, *args, **kwargs)
+
+    def subscribe(self, listener: Callable[..., None]):
+        self.manager.subscribe(self.NAME, listener)
+
+    def unsubscribe(self, listener: Callable[..., None]):
+        self.manager.unsubscribe(self.NAME, listener)
+
+
+class ProgressEvent(Event):
+    """Counters emitted at high frequency. Listeners receive the sum of every amount emitted since the last tick"""
+
+    def emit(self, *amounts: int):
+        if self.NAME is None:
+            raise NotImplementedError("An event needs a name...")
+        self.manager.emit_progress(self.NAME, *(amounts or (1,)))
+
+
+# Download progress events
+class OnMangaInfoUpdate(Event):
+    NAME = "manga_info_updated"
+
+
+class OnChapterDownloadFinished(ProgressEvent):
+    """Chapters finished"""
+
+    NAME = "chapter_download_finished"
+
+
+class OnImageDownloaded(ProgressEvent):
+    """Images archived, and their bytes"""
+
+    NAME = "image_downloaded"
+
+
+class OnDownloadFinished(Event):
+    NAME = "download_finished"
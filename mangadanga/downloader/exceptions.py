@@ -1,2 +1,23 @@
 class DownloaderException(Exception):
     pass
+
+
+class RequestException(DownloaderException):
+    """Raised when a host answers with an error status"""
+
+    def __init__(self, url: str, status: int) -> None:
+        super().__init__(f"'{url}' answered with status {status}")
+        self.url = url
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        return self.status >= 500 or self.status in {408, 429}
+
+
+class CircuitOpenException(DownloaderException):
+    """Raised instead of sending a request to a host that keeps failing"""
+
+
+class DownloadCancelledException(DownloaderException):
+    """Raised at the next checkpoint of a download that was cancelled"""
@@ -0,0 +1,68 @@
+# Standard Library
+import re
+
+DIGITS = re.compile(r"(\d+)")
+
+
+def split_numbers(url: str) -> list[str]:
+    """Splits a url into alternating text and number tokens: numbers sit at the odd positions"""
+    return DIGITS.split(url)
+
+
+class UrlExtrapolator:
+    """
+    Learns how the image urls of a series are numbered from the first pages of a chapter: which numbers of the url
+    move from one page to the next, and by how much. The learned pattern is kept for the following chapters, which
+    then only need the url of their first image to predict the others.
+    """
+
+    def __init__(self) -> None:
+        self.tokens_count: int | None = None
+        self.steps: dict[int, int] = dict()
+
+    @property
+    def knows_pattern(self) -> bool:
+        return self.tokens_count is not None
+
+    def learn(self, first_src: str, second_src: str) -> bool:
+        """Learns the pattern from two consecutive pages. Returns False when their urls cannot be matched"""
+        first_tokens, second_tokens = split_numbers(first_src), split_numbers(second_src)
+        if len(first_tokens) != len(second_tokens):
+            self.forget()
+            return False
+        steps = dict()
+        for position, (first_token, second_token) in enumerate(zip(first_tokens, second_tokens)):
+            if first_token == second_token:
+                continue
+            if position % 2 == 0 or int(second_token) <= int(first_token):
+                self.forget()
+                return False
+            steps[position] = int(second_token) - int(first_token)
+        if not steps:
+            self.forget()
+            return False
+        self.tokens_count = len(first_tokens)
+        self.steps = steps
+        return True
+
+    def learn_default(self, first_src: str) -> None:
+        """Without a second page, guesses that the last number of the file name is the page number"""
+        tokens = split_numbers(first_src)
+        file_name_start = len(split_numbers(first_src.rsplit("/", 1)[0]))
+        number_positions = [position for position in range(file_name_start, len(tokens)) if position % 2 == 1]
+        if number_positions:
+            self.tokens_count = len(tokens)
+            self.steps = {number_positions[-1]: 1}
+
+    def forget(self) -> None:
+        self.tokens_count = None
+        self.steps = dict()
+
+    def predict(self, first_src: str, page_index: int) -> str | None:
+        tokens = split_numbers(first_src)
+        if len(tokens) != self.tokens_count:
+            return None
+        for position, step in self.steps.items():
+            number = int(tokens[position]) + step * page_index
+            tokens[position] = f"{number:0{len(tokens[position])}d}"
+        return "".join(tokens)
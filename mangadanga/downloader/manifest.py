@@ -0,0 +1,150 @@
+# Standard Library
+import json
+import logging
+import os
+from typing import IO, Any
+
+# Local imports
+from .archive import read_entries, remove_path
+from .models import ChapterIndex, ChapterRecord, ImageRecord
+from .resources import Worker
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".mangadanga-manifest.jsonl"
+# Archives are written under a temporary name and renamed once every image is in
+PART_SUFFIX = ".part"
+
+
+class Manifest:
+    """
+    Record of the chapters and images of a series already on disk, kept next to its archives so a re-run only
+    downloads what is missing. It is an append-only log of json lines written from its own thread: a crash loses
+    at most the line being written. Opening the manifest replays the log and compacts it.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self.chapters: dict[ChapterIndex, ChapterRecord] = dict()
+        # Archives and folders found on disk, named '<chapter>_<title>.zip' or '<chapter>_<title>'
+        self.archives: set[str] = set()
+        self.archived_chapters: set[ChapterIndex] = set()
+        self.worker = Worker("manifest")
+        self.file: IO[str] | None = None
+
+    async def open(self) -> None:
+        self.worker.start()
+        await self.worker.run(self.load)
+
+    async def close(self) -> None:
+        try:
+            if self.file is not None:
+                await self.worker.run(self.file.close)
+                self.file = None
+        finally:
+            self.worker.stop()
+
+    def load(self) -> None:
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                is_folder = os.path.isdir(os.path.join(self.directory, name)) and not name.startswith(".")
+                if name.endswith(".zip") or (is_folder and not name.endswith(PART_SUFFIX)):
+                    self.archives.add(name)
+                    self.archived_chapters.add(ChapterIndex(name.split("_", 1)[0]))
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        self.apply(json.loads(line))
+                    except (ValueError, KeyError) as e:
+                        # The tail of a log cut by a crash
+                        logger.warning(f"Ignoring unreadable manifest line in '{self.path}': {e!r}")
+        self.compact()
+
+    def compact(self) -> None:
+        """Rewrites the log with one line per chapter and image still recorded"""
+        compact_path = f"{self.path}.tmp"
+        with open(compact_path, "w", encoding="utf-8") as file:
+            for chapter, record in self.chapters.items():
+                for entry in self.get_entries(chapter, record):
+                    file.write(json.dumps(entry) + "\n")
+        os.replace(compact_path, self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    @staticmethod
+    def get_entries(chapter: ChapterIndex, record: ChapterRecord) -> list[dict[str, Any]]:
+        entries: list[dict[str, Any]] = [
+            {"event": "chapter", "chapter": chapter, "url": record.url, "filename": record.filename}
+        ]
+        for name, image in record.images.items():
+            entries.append({"event": "image", "chapter": chapter, "name": name, **image.model_dump()})
+        if record.completed:
+            entries.append({"event": "completed", "chapter": chapter})
+        return entries
+
+    def apply(self, entry: dict[str, Any]) -> None:
+        event, chapter = entry["event"], entry["chapter"]
+        if event == "chapter":
+            self.chapters[chapter] = ChapterRecord(url=entry["url"], filename=entry["filename"])
+        elif event == "image":
+            self.chapters[chapter].images[entry["name"]] = ImageRecord(
+                size=entry["size"], sha256=entry["sha256"], url=entry.get("url", "")
+            )
+        elif event == "completed":
+            self.chapters[chapter].completed = True
+        else:
+            raise KeyError(event)
+
+    def append(self, entry: dict[str, Any]) -> None:
+        if self.file is None:
+            raise ValueError(f"Manifest '{self.path}' is not open")
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+
+    async def record(self, entry: dict[str, Any]) -> None:
+        """Applies an entry right away and returns once it is written to the log"""
+        self.apply(entry)
+        await self.worker.run(self.append, entry)
+
+    def get_part_path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename + PART_SUFFIX)
+
+    def is_completed(self, chapter: ChapterIndex) -> bool:
+        record = self.chapters.get(chapter)
+        if record is None:
+            # Archives downloaded before the manifest existed were only kept once complete
+            return chapter in self.archived_chapters
+        return record.completed and record.filename in self.archives
+
+    def get_images(self, chapter: ChapterIndex) -> dict[str, ImageRecord]:
+        record = self.chapters.get(chapter)
+        return dict(record.images) if record is not None else dict()
+
+    def has_images(self, chapter: ChapterIndex) -> bool:
+        record = self.chapters.get(chapter)
+        return record is not None and bool(record.images)
+
+    async def resume_chapter(self, chapter: ChapterIndex, url: str, filename: str) -> set[str]:
+        """
+        Names of the images already in the partial archive of a chapter. When the partial archive does not match
+        the record, a crash left it unreadable or the chapter was renamed, the chapter starts over
+        """
+        record = self.chapters.get(chapter)
+        if record is not None and record.filename == filename and not record.completed and record.images:
+            entries = await self.worker.run(read_entries, self.get_part_path(filename))
+            sizes = {name: image.size for name, image in record.images.items()}
+            if entries == sizes:
+                logger.info(f"Resuming chapter {chapter}: {len(entries)} images already downloaded")
+                return set(entries)
+            logger.warning(f"Partial archive of chapter {chapter} does not match the manifest, starting over")
+        if record is not None and os.path.exists(self.get_part_path(record.filename)):
+            await self.worker.run(remove_path, self.get_part_path(record.filename))
+        await self.record({"event": "chapter", "chapter": chapter, "url": url, "filename": filename})
+        return set()
+
+    async def record_image(self, chapter: ChapterIndex, name: str, image: ImageRecord) -> None:
+        await self.record({"event": "image", "chapter": chapter, "name": name, **image.model_dump()})
+
+    async def complete_chapter(self, chapter: ChapterIndex) -> None:
+        await self.record({"event": "completed", "chapter": chapter})
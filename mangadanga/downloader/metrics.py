@@ -0,0 +1,237 @@
+# Standard Library
+import asyncio
+import bisect
+import json
+import logging
+import os
+import time
+from typing import Any
+
+# Local imports
+from .config import DownloaderConfig, MetricsConfig
+from .resources import SharedResource
+
+logger = logging.getLogger(__name__)
+
+METRICS_NAME = ".mangadanga-metrics.json"
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+PREFIX = "mangadanga_"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra is not None else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class Histogram:
+    """Counts observations in cumulative buckets, like a Prometheus histogram, and keeps their exact extremes"""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        # The last count is the implicit +Inf bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, quantile: float) -> float:
+        """Estimate interpolated inside the bucket the quantile falls in"""
+        if not self.count:
+            return 0.0
+        rank = quantile * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self.min), self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count,
+            "min": self.min,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class Metrics(SharedResource):
+    """Counters, gauges and latency histograms of the downloads, written as a JSON summary and a Prometheus file"""
+
+    def __init__(self, config: MetricsConfig, summary_path: str = "") -> None:
+        super().__init__()
+        self.config = config
+        self.summary_path = summary_path
+        self.counters: dict[tuple[str, Labels], float] = dict()
+        self.gauges: dict[tuple[str, Labels], float] = dict()
+        self.histograms: dict[tuple[str, Labels], Histogram] = dict()
+        # Seconds with downloads running, the idle time of a long-lived service does not dilute the rates
+        self.busy_time = 0.0
+        self.opened_at = time.monotonic()
+        self.exporter: asyncio.Task[None] | None = None
+
+    @classmethod
+    def from_config(cls, config: DownloaderConfig) -> "Metrics":
+        summary_path = ""
+        if config.metrics.summary:
+            summary_path = config.metrics.summary_path or os.path.join(config.path, METRICS_NAME)
+        return cls(config.metrics, summary_path)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def set_max(self, name: str, value: float, **labels: str) -> None:
+        """Gauge keeping the highest value, of every pipeline sharing the metrics"""
+        key = (name, tuple(sorted(labels.items())))
+        self.gauges[key] = max(self.gauges.get(key, value), value)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def get_counter(self, name: str, **labels: str) -> float:
+        """Sum of the counter over every label set matching 'labels'"""
+        return sum(
+            value
+            for (counter_name, counter_labels), value in self.counters.items()
+            if counter_name == name and labels.items() <= dict(counter_labels).items()
+        )
+
+    def elapsed(self) -> float:
+        if self.users > 0:
+            return self.busy_time + time.monotonic() - self.opened_at
+        return self.busy_time
+
+    async def setup(self) -> None:
+        self.opened_at = time.monotonic()
+        if self.config.prometheus_path:
+            self.exporter = asyncio.ensure_future(self.export_periodically())
+
+    async def teardown(self) -> None:
+        self.busy_time += time.monotonic() - self.opened_at
+        if self.exporter is not None:
+            self.exporter.cancel()
+            await asyncio.gather(self.exporter, return_exceptions=True)
+            self.exporter = None
+        summary = self.summary()
+        logger.info(
+            f"Downloaded {summary['images']:.0f} images, {summary['bytes'] / 2**20:.1f} MiB in "
+            f"{summary['elapsed_seconds']:.2f} seconds ({summary['images_per_second']:.1f} images/s, "
+            f"{summary['bytes_per_second'] / 2**20:.2f} MiB/s)"
+        )
+        await self.export()
+
+    async def export_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.interval)
+            await self.export()
+
+    async def export(self) -> None:
+        """Writes the files in a thread"""
+        summary = json.dumps(self.summary(), indent=2)
+        prometheus = self.to_prometheus()
+        try:
+            if self.summary_path:
+                await asyncio.get_running_loop().run_in_executor(None, write_file, self.summary_path, summary)
+            if self.config.prometheus_path:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, write_file, self.config.prometheus_path, prometheus
+                )
+        except OSError as e:
+            logger.warning(f"Could not write the metrics: {e!r}")
+
+    def summary(self) -> dict[str, Any]:
+        elapsed = self.elapsed()
+        images = self.get_counter("images_total")
+        size = self.get_counter("bytes_total")
+        hosts = sorted({dict(labels)["host"] for name, labels in self.counters if name == "requests_total"})
+        return {
+            "elapsed_seconds": elapsed,
+            "images": images,
+            "bytes": size,
+            "images_per_second": images / elapsed if elapsed else 0.0,
+            "bytes_per_second": size / elapsed if elapsed else 0.0,
+            "chapters": {
+                "completed": self.get_counter("chapters_total", status="completed"),
+                "failed": self.get_counter("chapters_total", status="failed"),
+                "seconds": self.histograms.get(("chapter_seconds", ()), Histogram()).summary(),
+            },
+            "hosts": {
+                host: {
+                    "requests": self.get_counter("requests_total", host=host),
+                    "errors": self.get_counter("request_errors_total", host=host),
+                    "throttled": self.get_counter("throttled_total", host=host),
+                    "retries": self.get_counter("retries_total", host=host),
+                    "seconds": self.histograms.get(("request_seconds", (("host", host),)), Histogram()).summary(),
+                }
+                for host in hosts
+            },
+            "retries": self.get_counter("retries_total"),
+            "queues": {
+                dict(labels)["stage"]: value for (name, labels), value in self.gauges.items() if name == "queue_peak"
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        for metric_type, metrics in (("counter", self.counters), ("gauge", self.gauges)):
+            for name in sorted({name for name, _ in metrics}):
+                lines.append(f"# TYPE {PREFIX}{name} {metric_type}")
+                for (metric_name, labels), value in sorted(metrics.items()):
+                    if metric_name == name:
+                        lines.append(f"{PREFIX}{name}{format_labels(labels)} {value:g}")
+        for name in sorted({name for name, _ in self.histograms}):
+            lines.append(f"# TYPE {PREFIX}{name} histogram")
+            for (histogram_name, labels), histogram in sorted(self.histograms.items()):
+                if histogram_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{PREFIX}{name}_bucket{format_labels(labels, ('le', le))} {cumulative}")
+                lines.append(f"{PREFIX}{name}_sum{format_labels(labels)} {histogram.sum:g}")
+                lines.append(f"{PREFIX}{name}_count{format_labels(labels)} {histogram.count}")
+        lines.append(f"# TYPE {PREFIX}elapsed_seconds gauge")
+        lines.append(f"{PREFIX}elapsed_seconds {self.elapsed():g}")
+        return "\n".join(lines) + "\n"
+
+
+def write_file(path: str, content: str) -> None:
+    """Replaces the file at once, a collector never reads half of it"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        file.write(content)
+    os.replace(temporary_path, path)
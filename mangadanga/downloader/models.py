@@ -1 +1,112 @@
-ChapterIndex = str
+import math
+import re
+from typing import Any
+
+from pydantic import BaseModel, GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+CHAPTER_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+class ChapterIndex(str):
+    """
+    Chapter identifier as the site names it ("10", "10.5", "extra"...). It is still a string, so it keys dicts,
+    manifests and the catalog as before, but it is parsed once: 'number' is the first number in it, and chapters
+    compare by 'key', numbers in numeric order followed by chapters without a number
+    """
+
+    number: float | None
+    key: tuple[float, str]
+
+    def __new__(cls, value: str) -> "ChapterIndex":
+        if type(value) is cls:
+            return value
+        chapter = super().__new__(cls, value)
+        match = CHAPTER_NUMBER.search(chapter)
+        chapter.number = float(match.group()) if match is not None else None
+        chapter.key = (chapter.number if chapter.number is not None else math.inf, str(chapter))
+        return chapter
+
+    def __lt__(self, other: str) -> bool:
+        return self.key < ChapterIndex(other).key
+
+    def __le__(self, other: str) -> bool:
+        return self.key <= ChapterIndex(other).key
+
+    def __gt__(self, other: str) -> bool:
+        return self.key > ChapterIndex(other).key
+
+    def __ge__(self, other: str) -> bool:
+        return self.key >= ChapterIndex(other).key
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_after_validator_function(
+            cls, core_schema.str_schema(), serialization=core_schema.plain_serializer_function_ser_schema(str)
+        )
+
+
+class ChapterFailure(BaseModel):
+    chapter: ChapterIndex
+    url: str
+    error: str
+
+
+class DownloadReport(BaseModel):
+    title: str = ""
+    completed: list[ChapterIndex] = []
+    failed: list[ChapterFailure] = []
+    # Chapters found complete on disk, that were not downloaded again
+    skipped: list[ChapterIndex] = []
+    # Set when the series itself could not be downloaded
+    error: str | None = None
+    cancelled: bool = False
+
+    @property
+    def summary(self) -> str:
+        total = len(self.completed) + len(self.failed)
+        lines = [f"{len(self.failed)} of {total} chapters could not be downloaded:"]
+        lines += [f" - {failure.chapter}: {failure.error}" for failure in self.failed]
+        return "\n".join(lines)
+
+
+class ImageRecord(BaseModel):
+    size: int
+    sha256: str
+    url: str = ""
+
+
+class ChapterRecord(BaseModel):
+    url: str
+    filename: str
+    images: dict[str, ImageRecord] = {}
+    completed: bool = False
+
+
+class SeriesSummary(BaseModel):
+    url: str
+    title: str
+    chapters: int = 0
+    images: int = 0
+    size: int = 0
+
+
+class SeriesFailure(BaseModel):
+    url: str
+    error: str
+
+
+class BatchReport(BaseModel):
+    series: list[DownloadReport] = []
+    failed: list[SeriesFailure] = []
+
+    @property
+    def summary(self) -> str:
+        new_chapters = sum(len(report.completed) for report in self.series)
+        failed_chapters = sum(len(report.failed) for report in self.series)
+        lines = [
+            f"Downloaded {len(self.series)} series: {new_chapters} new chapters downloaded, "
+            f"{failed_chapters} chapters failed"
+        ]
+        lines += [f" - {failure.url}: {failure.error}" for failure in self.failed]
+        return "\n".join(lines)
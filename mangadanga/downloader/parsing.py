@@ -0,0 +1,83 @@
+# Standard Library
+import logging
+import re
+from typing import Iterable, Literal
+
+# Dependencies
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Local imports
+from .config import ParserConfig
+
+logger = logging.getLogger(__name__)
+
+try:
+    # Dependencies
+    import lxml  # noqa: F401
+
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+BACKENDS = {"html.parser", "lxml"}
+
+# Kinds of page a driver scrapes: the series index, the first page of a chapter and any other page of a chapter
+PageKind = Literal["series", "chapter", "page"]
+
+CLASS_SELECTOR = re.compile(r"\.([\w-]+)")
+
+
+def get_backend(name: str) -> str:
+    """Resolves 'auto' to the fastest backend installed"""
+    if name == "auto":
+        return "lxml" if LXML_AVAILABLE else "html.parser"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}', expected one of: auto, {', '.join(sorted(BACKENDS))}")
+    if name == "lxml" and not LXML_AVAILABLE:
+        logger.warning("lxml is not installed, falling back to html.parser")
+        return "html.parser"
+    return name
+
+
+def get_selector_classes(selector: str) -> set[str]:
+    """Classes of the outermost element of a css selector, the root of the subtree it needs"""
+    outermost = re.split(r"[\s>+~]+", selector.strip())[0]
+    return set(CLASS_SELECTOR.findall(outermost))
+
+
+def build_strainer(selectors: Iterable[str]) -> SoupStrainer | None:
+    """
+    Strainer that only builds the subtrees rooted at the elements the selectors start from.
+    Returns None, a full parse, if any selector is not rooted at a class
+    """
+    classes: set[str] = set()
+    for selector in selectors:
+        selector_classes = get_selector_classes(selector)
+        if not selector_classes:
+            return None
+        classes |= selector_classes
+    if not classes:
+        return None
+
+    def has_class(value: str | None) -> bool:
+        return value is not None and not classes.isdisjoint(value.split())
+
+    return SoupStrainer(class_=has_class)
+
+
+class HtmlParser:
+    """Parses pages with the configured backend, keeping only the parts of each kind of page the driver reads"""
+
+    def __init__(
+        self, selectors: dict[str, str], page_selectors: dict[PageKind, list[str]], config: ParserConfig
+    ) -> None:
+        self.backend = get_backend(config.backend)
+        self.strainers: dict[PageKind, SoupStrainer | None] = dict()
+        if config.partial:
+            self.strainers = {
+                page: build_strainer(selectors[name] for name in names) for page, names in page_selectors.items()
+            }
+
+    def parse(self, html_doc: str, page: PageKind | None = None) -> BeautifulSoup:
+        strainer = self.strainers.get(page) if page is not None else None
+        return BeautifulSoup(html_doc, self.backend, parse_only=strainer)
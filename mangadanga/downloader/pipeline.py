@@ -0,0 +1,456 @@
+# Standard Library
+import asyncio
+import logging
+import os
+import time
+from contextlib import aclosing
+from tempfile import SpooledTemporaryFile
+from typing import IO, TYPE_CHECKING, Any, Awaitable, Callable, Generic, NamedTuple, TypeVar
+
+# Dependencies
+from bs4 import BeautifulSoup
+
+# Local imports
+from .archive import ArchiveWriter, FolderWriter, remove_path, replace_path
+from .concurrency import cancel_all
+from .events import OnChapterDownloadFinished, OnImageDownloaded
+from .exceptions import DownloadCancelledException
+from .manifest import Manifest
+from .models import ChapterFailure, ChapterIndex, DownloadReport, ImageRecord
+from .tracing import NULL_SPAN, Tracer
+
+if TYPE_CHECKING:
+    # Local imports
+    from .base import Downloader
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ChapterJob:
+    """A chapter travelling through the pipeline. It is finished once every image it queued has been archived"""
+
+    def __init__(self, chapter: ChapterIndex, url: str, manga_title: str) -> None:
+        self.chapter = chapter
+        self.url = url
+        self.manga_title = manga_title
+        self.data: BeautifulSoup | None = None
+        self.path = ""
+        self.part_path = ""
+        # Images already in the partial archive of an interrupted download
+        self.existing_images: set[str] = set()
+        self.writer: ArchiveWriter | None = None
+        self.holds_slot = False
+        self.resolved = False
+        self.finished = False
+        self.pending = 0
+        self.started_at = 0.0
+        self.error: Exception | None = None
+        self.done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+    def fail(self, error: Exception) -> None:
+        if self.error is None:
+            logger.error(f"Chapter {self.chapter} failed: {error!r}")
+            self.error = error
+
+
+class ImageJob(NamedTuple):
+    chapter_job: ChapterJob
+    page: int
+    url: str
+
+
+def get_span_args(item: Any) -> dict[str, Any]:
+    """Identifiers of the chapter and image a stage works on"""
+    if isinstance(item, tuple) and item and isinstance(item[0], ImageJob):
+        item = item[0]
+    if isinstance(item, ImageJob):
+        return {"chapter": item.chapter_job.chapter, "image": item.page, "url": item.url}
+    if isinstance(item, ChapterJob):
+        return {"chapter": item.chapter, "url": item.url}
+    return dict()
+
+
+class Stage(Generic[T]):
+    """A pool of workers consuming a bounded queue. The depth of the queue shows whether the stage keeps up"""
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        handler: Callable[[T], Awaitable[None]],
+        queue_size: int = 0,
+        tracer: Tracer | None = None,
+    ) -> None:
+        self.name = name
+        self.workers = workers
+        self.handler = handler
+        self.tracer = tracer
+        self.queue: asyncio.Queue[T] = asyncio.Queue(queue_size)
+        self.peak_depth = 0
+        self.tasks: list[asyncio.Future[None]] = []
+
+    async def put(self, item: T) -> None:
+        await self.queue.put(item)
+        self.peak_depth = max(self.peak_depth, self.queue.qsize())
+
+    async def work(self) -> None:
+        while True:
+            item = await self.queue.get()
+            span = self.tracer.span(self.name, **get_span_args(item)) if self.tracer is not None else NULL_SPAN
+            try:
+                with span:
+                    await self.handler(item)
+            except Exception as e:
+                logger.exception(f"Unexpected error in stage '{self.name}': {e}")
+            finally:
+                self.queue.task_done()
+
+    def start(self) -> None:
+        self.tasks = []
+        for _ in range(self.workers):
+            task = asyncio.create_task(self.work())
+            # Names the rows of the trace after the stage
+            task.set_name(f"{self.name} {task.get_name()}")
+            self.tasks.append(task)
+
+    async def stop(self) -> None:
+        await cancel_all(self.tasks)
+
+    def depth(self) -> str:
+        maxsize = self.queue.maxsize or "∞"
+        return f"{self.name} {self.queue.qsize()}/{maxsize} (peak {self.peak_depth})"
+
+
+class Pipeline:
+    """
+    Downloads chapters through streaming stages connected by bounded queues, so scraping, image downloads and
+    archive writes all progress at the same time:
+
+    chapter url -> [scrape chapter page] -> [resolve image urls] -> [download images] -> [write archive entries]
+
+    Every archived image is recorded in the series manifest: chapters already complete are skipped and
+    interrupted chapters only download the images their partial archive is missing. With an image store,
+    images whose url is known to be a duplicate are copied from the store instead of being fetched.
+    Finished chapters are added to the library catalog, which also tells which chapters are already on disk.
+    """
+
+    def __init__(self, downloader: "Downloader") -> None:
+        self.downloader = downloader
+        config = downloader.config
+        pipeline_config = config.pipeline
+        tracer = downloader.tracer
+        self.chapters: Stage[ChapterJob] = Stage("chapters", config.threads, self.scrape_chapter, tracer=tracer)
+        self.resolvers: Stage[ChapterJob] = Stage(
+            "resolve", pipeline_config.resolvers, self.resolve_chapter, pipeline_config.chapters_queue_size, tracer
+        )
+        self.images: Stage[ImageJob] = Stage(
+            "images", config.concurrency.images, self.download_image, pipeline_config.images_queue_size, tracer
+        )
+        self.writers: Stage[tuple[ImageJob, IO[bytes]]] = Stage(
+            "archive", pipeline_config.writers, self.write_image, pipeline_config.archive_queue_size, tracer
+        )
+        self.stages: list[Stage[Any]] = [self.chapters, self.resolvers, self.images, self.writers]
+        self.manifest: Manifest | None = None
+        self.series_id: int | None = None
+        # Cleared while a paused download waits to take its chapter slots back
+        self.running = asyncio.Event()
+        self.running.set()
+
+    def queue_depths(self) -> str:
+        metrics = self.downloader.metrics
+        for stage in self.stages:
+            metrics.set("queue_depth", stage.queue.qsize(), stage=stage.name)
+            metrics.set_max("queue_peak", stage.peak_depth, stage=stage.name)
+        return ", ".join(stage.depth() for stage in self.stages)
+
+    async def report_queue_depths(self) -> None:
+        while True:
+            await asyncio.sleep(self.downloader.config.pipeline.report_interval)
+            logger.info(f"Queue depths: {self.queue_depths()}")
+
+    def get_manifest(self) -> Manifest:
+        if self.manifest is None:
+            raise ValueError("The manifest is only open while the pipeline runs")
+        return self.manifest
+
+    async def run(self, chapter_number_to_url: dict[ChapterIndex, str], manga_title: str) -> DownloadReport:
+        report = DownloadReport(title=manga_title)
+        self.manifest = Manifest(os.path.join(self.downloader.config.path, manga_title))
+        await self.manifest.open()
+        store = self.downloader.store
+        if store is not None:
+            await store.open()
+        catalog = self.downloader.catalog
+        if catalog is not None:
+            await catalog.open()
+        try:
+            catalog_chapters = await self.open_series(manga_title)
+            report.skipped = [
+                chapter
+                for chapter in chapter_number_to_url
+                if self.manifest.is_completed(chapter) or os.path.exists(catalog_chapters.get(chapter, ""))
+            ]
+            if report.skipped:
+                logger.info(f"Skipping {len(report.skipped)} chapters already downloaded")
+                OnChapterDownloadFinished(self.downloader.event_manager).emit(len(report.skipped))
+            pending_chapters = {
+                chapter: url for chapter, url in chapter_number_to_url.items() if chapter not in report.skipped
+            }
+            jobs = await self.run_jobs(pending_chapters, manga_title)
+        finally:
+            await self.manifest.close()
+            if store is not None:
+                await store.close()
+            if catalog is not None:
+                await catalog.close()
+        for job in jobs:
+            if job.error is None:
+                report.completed.append(job.chapter)
+            else:
+                error = str(job.error) or repr(job.error)
+                report.failed.append(ChapterFailure(chapter=job.chapter, url=job.url, error=error))
+        return report
+
+    async def open_series(self, manga_title: str) -> dict[ChapterIndex, str]:
+        """Registers the series in the catalog. Returns the archive path of the chapters the catalog knows"""
+        catalog = self.downloader.catalog
+        if catalog is None:
+            return dict()
+        directory = os.path.join(self.downloader.config.path, manga_title)
+        try:
+            self.series_id = await catalog.register_series(self.downloader.config.url, manga_title, directory)
+            return await catalog.completed_chapters(self.downloader.config.url)
+        except Exception as e:
+            logger.warning(f"Could not read the library catalog, using the manifest alone: {e!r}")
+            return dict()
+
+    async def catalog_chapter(self, job: ChapterJob) -> None:
+        """Adds a finished chapter to the catalog. The archive is already complete, so a catalog error is not fatal"""
+        catalog = self.downloader.catalog
+        if catalog is None or self.series_id is None:
+            return
+        try:
+            images = self.get_manifest().get_images(job.chapter)
+            await catalog.record_chapter(self.series_id, job.chapter, job.url, job.path, images)
+        except Exception as e:
+            logger.warning(f"Could not add chapter {job.chapter} to the library catalog: {e!r}")
+
+    async def run_jobs(self, chapter_number_to_url: dict[ChapterIndex, str], manga_title: str) -> list[ChapterJob]:
+        jobs = [ChapterJob(chapter, url, manga_title) for chapter, url in chapter_number_to_url.items()]
+        for stage in self.stages:
+            stage.start()
+        reporter = asyncio.ensure_future(self.report_queue_depths())
+        pauser = asyncio.ensure_future(self.release_slots_while_paused(jobs))
+        try:
+            for job in jobs:
+                await self.chapters.put(job)
+            await asyncio.gather(*(job.done for job in jobs))
+        finally:
+            await cancel_all([reporter, pauser])
+            for stage in self.stages:
+                await stage.stop()
+            await asyncio.gather(*(self.abort(job) for job in jobs if not job.finished))
+        logger.info(f"Queue depths: {self.queue_depths()}")
+        return jobs
+
+    async def checkpoint(self) -> None:
+        """Waits while the download is paused, and until it holds its chapter slots again"""
+        await self.downloader.control.checkpoint()
+        await self.running.wait()
+
+    async def release_slots_while_paused(self, jobs: list[ChapterJob]) -> None:
+        """Gives the chapter slots of a paused download to the other jobs, and takes them back once it resumes"""
+        control = self.downloader.control
+        chapters = self.downloader.scheduler.chapters
+        if control.pausing is None:
+            return
+        while True:
+            await control.wait_for_pause()
+            self.running.clear()
+            held_jobs = [job for job in jobs if job.holds_slot]
+            for job in held_jobs:
+                self.release(job)
+            try:
+                await control.checkpoint()
+            except DownloadCancelledException:
+                return
+            for job in held_jobs:
+                await chapters.acquire(self.downloader.config.url)
+                job.holds_slot = True
+            # Chapters whose last images were archived during the pause no longer need theirs
+            for job in held_jobs:
+                if job.finished:
+                    self.release(job)
+            self.running.set()
+
+    async def acquire_chapter_slot(self, job: ChapterJob) -> None:
+        """The chapter slot bounds the archives open at the same time, it is released once the chapter is finished"""
+        chapters = self.downloader.scheduler.chapters
+        while True:
+            # A paused download does not open chapters, their slots go to the other jobs
+            await self.checkpoint()
+            await chapters.acquire(self.downloader.config.url)
+            if not self.downloader.control.paused:
+                job.holds_slot = True
+                return
+            chapters.release()
+
+    async def scrape_chapter(self, job: ChapterJob) -> None:
+        job.started_at = time.monotonic()
+        try:
+            job.data = await self.downloader.scrape_url(job.url, "chapter")
+            chapter_filename = await self.downloader.run_parser(
+                self.downloader.get_chapter_filename, job.chapter, job.data
+            )
+            if self.downloader.config.archive.format == "folder":
+                chapter_filename = chapter_filename.removesuffix(".zip")
+            job.path = os.path.join(self.downloader.config.path, job.manga_title, chapter_filename)
+            job.part_path = self.get_manifest().get_part_path(chapter_filename)
+        except Exception as e:
+            job.fail(e)
+            job.resolved = True
+            await self.finish(job)
+            return
+        await self.resolvers.put(job)
+
+    async def resolve_chapter(self, job: ChapterJob) -> None:
+        try:
+            await self.acquire_chapter_slot(job)
+            logger.info(f"Downloading chapter: {os.path.basename(job.path)}")
+            manifest = self.get_manifest()
+            previous_images = manifest.get_images(job.chapter)
+            job.existing_images = await manifest.resume_chapter(job.chapter, job.url, os.path.basename(job.path))
+            store = self.downloader.store
+            if store is not None:
+                # The entries of an archive that starts over no longer reference their images
+                for name, image in previous_images.items():
+                    if name not in job.existing_images:
+                        await store.release(image.sha256)
+            job.writer = self.create_writer(job)
+            await job.writer.open()
+            assert job.data is not None
+            async with aclosing(self.downloader.iter_images_src(job.data)) as images_src:
+                async for index, image_url in images_src:
+                    if job.error is not None:
+                        break
+                    if self.downloader.get_image_name(index, image_url) in job.existing_images:
+                        continue
+                    job.pending += 1
+                    await self.images.put(ImageJob(job, index, image_url))
+        except Exception as e:
+            job.fail(e)
+        finally:
+            job.resolved = True
+            await self.finish(job)
+
+    def create_writer(self, job: ChapterJob) -> ArchiveWriter:
+        archive_config = self.downloader.config.archive
+        mode = "a" if job.existing_images else "w"
+        tracer = self.downloader.tracer
+        if archive_config.format == "folder":
+            return FolderWriter(
+                job.part_path,
+                archive_config.chunk_size,
+                archive_config.write_queue_size,
+                mode,
+                self.downloader.store,
+                tracer,
+            )
+        return ArchiveWriter(job.part_path, archive_config.chunk_size, archive_config.write_queue_size, mode, tracer)
+
+    async def download_image(self, image_job: ImageJob) -> None:
+        job = image_job.chapter_job
+        spool: IO[bytes] | None = None
+        try:
+            if job.error is None and self.downloader.store is not None:
+                spool = await self.downloader.store.lookup(image_job.url)
+                if spool is not None:
+                    await self.writers.put((image_job, spool))
+                    return
+            if job.error is None:
+                await self.checkpoint()
+                spool = SpooledTemporaryFile(max_size=self.downloader.config.archive.spool_max_size)
+                await self.downloader.download_image_to(image_job.url, spool)
+                await self.writers.put((image_job, spool))
+                return
+        except Exception as e:
+            job.fail(e)
+        if spool is not None:
+            spool.close()
+        job.pending -= 1
+        await self.finish(job)
+
+    async def write_image(self, item: tuple[ImageJob, IO[bytes]]) -> None:
+        image_job, spool = item
+        job = image_job.chapter_job
+        try:
+            # Images downloaded before the chapter failed are still archived, for the next run to resume from
+            if job.writer is not None:
+                image_name = self.downloader.get_image_name(image_job.page, image_job.url)
+                size, sha256 = await job.writer.write(image_name, spool)
+                image = ImageRecord(size=size, sha256=sha256, url=image_job.url)
+                await self.get_manifest().record_image(job.chapter, image_name, image)
+                OnImageDownloaded(self.downloader.event_manager).emit(1, size)
+                self.downloader.metrics.inc("images_total")
+                self.downloader.metrics.inc("bytes_total", size)
+                if self.downloader.store is not None:
+                    await self.downloader.store.reference(image_job.url, sha256, spool)
+        except Exception as e:
+            job.fail(e)
+        finally:
+            spool.close()
+            job.pending -= 1
+            await self.finish(job)
+
+    async def finish(self, job: ChapterJob) -> None:
+        if not job.resolved or job.pending or job.finished:
+            return
+        job.finished = True
+        try:
+            if job.writer is not None:
+                await job.writer.close()
+            if job.error is None:
+                # Only a complete archive takes the final name
+                replace_path(job.part_path, job.path)
+                await self.get_manifest().complete_chapter(job.chapter)
+                await self.catalog_chapter(job)
+        except Exception as e:
+            job.fail(e)
+        finally:
+            self.release(job)
+            try:
+                self.record_outcome(job)
+            except Exception as e:
+                logger.warning(f"Could not clean up chapter {job.chapter}: {e!r}")
+            # Whatever happens above, the download waits on this future
+            job.done.set_result(None)
+
+    def record_outcome(self, job: ChapterJob) -> None:
+        if job.error is not None:
+            self.downloader.metrics.inc("chapters_total", status="failed")
+            self.remove_archive(job)
+        else:
+            self.downloader.metrics.inc("chapters_total", status="completed")
+            self.downloader.metrics.observe("chapter_seconds", time.monotonic() - job.started_at)
+            OnChapterDownloadFinished(self.downloader.event_manager).emit()
+
+    async def abort(self, job: ChapterJob) -> None:
+        """Closes what a chapter left open when the pipeline stops before the chapter is finished"""
+        try:
+            if job.writer is not None:
+                await job.writer.close()
+        finally:
+            self.release(job)
+            self.remove_archive(job)
+
+    def release(self, job: ChapterJob) -> None:
+        if job.holds_slot:
+            job.holds_slot = False
+            self.downloader.scheduler.chapters.release()
+
+    def remove_archive(self, job: ChapterJob) -> None:
+        # A partial archive is kept for the next run to resume, unless it holds no image yet
+        if job.part_path and os.path.exists(job.part_path) and not self.get_manifest().has_images(job.chapter):
+            remove_path(job.part_path)
@@ -0,0 +1,59 @@
+# Standard Library
+import cProfile
+import io
+import logging
+import os
+import pstats
+import tracemalloc
+from types import TracebackType
+
+logger = logging.getLogger(__name__)
+
+PROFILE_NAME = "mangadanga-profile"
+
+
+class Profiler:
+    """
+    Profiles a run with cProfile and tracemalloc. On exit it writes '<path>/mangadanga-profile.prof', for pstats or
+    snakeviz, and a text report of the CPU hotspots and the lines holding the most memory.
+    cProfile only sees the thread that enters the profiler: the event loop. The parser and archive threads show up
+    in the trace of the run instead.
+    """
+
+    def __init__(self, path: str, limit: int = 40) -> None:
+        self.path = path
+        self.limit = limit
+        self.profile = cProfile.Profile()
+
+    def __enter__(self) -> "Profiler":
+        tracemalloc.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        self.profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        try:
+            self.write_report(snapshot, peak)
+        except OSError as e:
+            logger.warning(f"Could not write the profile: {e!r}")
+
+    def write_report(self, snapshot: tracemalloc.Snapshot, peak: int) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        base_path = os.path.join(self.path, PROFILE_NAME)
+        self.profile.dump_stats(f"{base_path}.prof")
+        report = io.StringIO()
+        report.write(f"CPU hotspots, by cumulative time (top {self.limit})\n\n")
+        pstats.Stats(self.profile, stream=report).sort_stats("cumulative").print_stats(self.limit)
+        report.write(f"CPU hotspots, by own time (top {self.limit})\n\n")
+        pstats.Stats(self.profile, stream=report).sort_stats("tottime").print_stats(self.limit)
+        report.write(f"Memory peak: {peak / 2**20:.1f} MiB. Lines holding the most memory at the end\n\n")
+        for statistic in snapshot.statistics("lineno")[: self.limit]:
+            report.write(f"{statistic}\n")
+        with open(f"{base_path}.txt", "w", encoding="utf-8") as file:
+            file.write(report.getvalue())
+        logger.info(f"Wrote the profile to '{base_path}.txt' and '{base_path}.prof'")
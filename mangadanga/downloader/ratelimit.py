@@ -0,0 +1,110 @@
+# Standard Library
+import asyncio
+import logging
+import time
+import urllib.parse
+from email.utils import parsedate_to_datetime
+
+# Local imports
+from .config import RateLimitConfig
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUSES = {429, 503}
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Reads a 'Retry-After' header, either a number of seconds or an HTTP date. Returns the delay in seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_date.timestamp() - time.time())
+
+
+class TokenBucket:
+    """
+    Token bucket whose rate adapts to the host: throttled responses cut the rate (and pause the bucket for as
+    long as the host asks), successful ones raise it back slowly. The rate settles just under the throttle threshold.
+    """
+
+    def __init__(self, config: RateLimitConfig) -> None:
+        self.config = config
+        self.rate = config.requests_per_second
+        self.tokens = float(config.burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(float(self.config.burst), self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def throttle(self, retry_after: float | None = None) -> None:
+        self.rate = max(self.config.min_rate, self.rate * self.config.decrease_factor)
+        self.tokens = 0.0
+        delay = retry_after if retry_after is not None else 1 / self.rate
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+    def succeed(self) -> None:
+        self.rate = min(self.config.max_rate, self.rate + self.config.increase_step)
+
+
+class RateLimiter:
+    """Keeps a token bucket per host. The hosts of a site, the 'DOMAINS' of its driver, share a single bucket"""
+
+    def __init__(self, config: RateLimitConfig, domains: set[str] | None = None) -> None:
+        self.config = config
+        # Host -> key of the bucket of its site
+        self.sites: dict[str, str] = dict()
+        self.buckets: dict[str, TokenBucket] = dict()
+        self.add_site(domains or set())
+
+    def add_site(self, domains: set[str]) -> None:
+        """Makes the hosts of a site share a bucket. A limiter shared by several drivers knows each of their sites"""
+        key = ",".join(sorted(domains))
+        for domain in domains:
+            self.sites[domain] = key
+
+    def get_key(self, url: str) -> str:
+        parsed_url = urllib.parse.urlparse(url)
+        for host in (parsed_url.netloc, parsed_url.hostname):
+            if host in self.sites:
+                return self.sites[host]
+        return parsed_url.netloc
+
+    def get_bucket(self, url: str) -> TokenBucket:
+        key = self.get_key(url)
+        if key not in self.buckets:
+            self.buckets[key] = TokenBucket(self.config)
+        return self.buckets[key]
+
+    async def acquire(self, url: str) -> None:
+        await self.get_bucket(url).acquire()
+
+    def throttle(self, url: str, retry_after: float | None = None) -> None:
+        bucket = self.get_bucket(url)
+        bucket.throttle(retry_after)
+        logger.warning(f"Throttled by {self.get_key(url)}. Slowing down to {bucket.rate:.2f} requests per second")
+
+    def succeed(self, url: str) -> None:
+        self.get_bucket(url).succeed()
@@ -0,0 +1,109 @@
+# Standard Library
+import importlib
+import logging
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Iterable, Type
+
+# Local imports
+from .exceptions import DownloaderException
+
+if TYPE_CHECKING:
+    # Local imports
+    from .base import Downloader
+
+logger = logging.getLogger(__name__)
+
+# Drivers of other packages are entry points of this group, named after the domain they download from:
+# [project.entry-points."mangadanga.drivers"]
+# "example.com" = "mangadanga_example.driver:Example"
+ENTRY_POINT_GROUP = "mangadanga.drivers"
+
+BUILTIN_DRIVERS: dict[str, str] = {
+    "manganato.com": "mangadanga.downloader.drivers.manganato:Manganato",
+    "chapmanganato.com": "mangadanga.downloader.drivers.manganato:Manganato",
+    "www.mangatown.com": "mangadanga.downloader.drivers.mangatown:Mangatown",
+    "www.mngdoom.com": "mangadanga.downloader.drivers.mangadoom:Mangadoom",
+    "www.asurascans.com": "mangadanga.downloader.drivers.asurascans:Asurascans",
+    "asura.gg": "mangadanga.downloader.drivers.asurascans:Asurascans",
+}
+
+
+def load_driver(path: str) -> Type["Downloader"]:
+    """Imports a driver from its 'module:class' path. The downloader base is only imported with the first driver"""
+    # Local imports
+    from .base import Downloader
+
+    module_name, _, class_name = path.partition(":")
+    driver = getattr(importlib.import_module(module_name), class_name)
+    if not isinstance(driver, type) or not issubclass(driver, Downloader):
+        raise DownloaderException(f"'{path}' is not a Downloader driver")
+    return driver
+
+
+class DriverRegistry:
+    """
+    Maps each domain to its driver in a dict, so finding the driver of a url is a single lookup however many
+    drivers there are. Drivers are known by their import path and only imported the first time their domain is
+    used. The drivers of other packages are discovered through entry points, the first time a domain is not known
+    """
+
+    def __init__(self, paths: dict[str, str] | None = None, discover: bool = True) -> None:
+        # domain -> 'module:class' of drivers not imported yet
+        self.paths: dict[str, str] = dict(paths or {})
+        # domain -> imported driver
+        self.drivers: dict[str, Type["Downloader"]] = dict()
+        self.discovered = not discover
+
+    @classmethod
+    def from_drivers(cls, drivers: Iterable[Type["Downloader"]]) -> "DriverRegistry":
+        """Registry of the given drivers only"""
+        registry = cls(discover=False)
+        for driver in drivers:
+            registry.register(driver)
+        return registry
+
+    def register(self, driver: Type["Downloader"]) -> None:
+        for domain in driver.DOMAINS:
+            self.drivers[domain] = driver
+
+    def register_path(self, domain: str, path: str) -> None:
+        self.drivers.pop(domain, None)
+        self.paths[domain] = path
+
+    def discover(self) -> None:
+        """Registers the drivers other packages declare as entry points. Built-in drivers take precedence"""
+        self.discovered = True
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            if entry_point.name not in self.drivers and entry_point.name not in self.paths:
+                self.paths[entry_point.name] = entry_point.value
+
+    def get(self, domain: str) -> Type["Downloader"] | None:
+        driver = self.drivers.get(domain)
+        if driver is not None:
+            return driver
+        if domain not in self.paths and not self.discovered:
+            self.discover()
+        path = self.paths.get(domain)
+        if path is None:
+            return None
+        driver = load_driver(path)
+        logger.debug(f"Loaded driver {driver.__name__} for {domain}")
+        self.drivers[domain] = driver
+        return driver
+
+    def domains(self) -> list[str]:
+        if not self.discovered:
+            self.discover()
+        return sorted(self.drivers.keys() | self.paths.keys())
+
+    def load_all(self) -> set[Type["Downloader"]]:
+        """Every registered driver, imported"""
+        drivers = set()
+        for domain in self.domains():
+            driver = self.get(domain)
+            if driver is not None:
+                drivers.add(driver)
+        return drivers
+
+
+REGISTRY = DriverRegistry(BUILTIN_DRIVERS)
@@ -0,0 +1,54 @@
+# Standard Library
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class Worker:
+    """Thread running the blocking calls of an object one at a time, in the order they are made"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.executor: ThreadPoolExecutor | None = None
+
+    def start(self) -> None:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.name)
+
+    def stop(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    async def run(self, function: Callable[..., T], *args: Any) -> T:
+        if self.executor is None:
+            raise ValueError(f"'{self.name}' is not open")
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+
+class SharedResource:
+    """Resource several downloaders may share. The first to open it sets it up, the last to close it tears it down"""
+
+    def __init__(self) -> None:
+        self.users = 0
+        self.lock = asyncio.Lock()
+
+    async def open(self) -> None:
+        async with self.lock:
+            self.users += 1
+            if self.users == 1:
+                await self.setup()
+
+    async def close(self) -> None:
+        async with self.lock:
+            self.users -= 1
+            if self.users == 0:
+                await self.teardown()
+
+    async def setup(self) -> None:
+        pass
+
+    async def teardown(self) -> None:
+        pass
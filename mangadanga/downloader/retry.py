@@ -0,0 +1,168 @@
+# Standard Library
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+# Dependencies
+import aiohttp
+
+# Local imports
+from .config import RetryConfig
+from .exceptions import CircuitOpenException, RequestException
+from .metrics import Metrics
+from .utils import get_host
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """Time left to a request. Only its attempts and the backoff between them spend it"""
+
+    def __init__(self, seconds: float) -> None:
+        self.remaining = seconds
+
+    def spend(self, seconds: float) -> None:
+        self.remaining -= seconds
+
+
+# Deadline of the request 'RetryPolicy.call' is sending, its attempts run deeper in the same task
+current_deadline: ContextVar[Deadline | None] = ContextVar("current_deadline", default=None)
+
+
+class CircuitBreaker:
+    """
+    Counts consecutive failures per host. Once a host reaches the threshold its circuit opens and requests fail
+    fast until the reset timeout expires; then a single trial request decides whether it closes again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures: dict[str, int] = dict()
+        self.opened_at: dict[str, float] = dict()
+        self.trials: set[str] = set()
+
+    def is_open(self, url: str) -> bool:
+        host = get_host(url)
+        if host not in self.opened_at:
+            return False
+        if time.monotonic() - self.opened_at[host] < self.reset_timeout or host in self.trials:
+            return True
+        # Half open: lets one request through to probe the host
+        self.trials.add(host)
+        return False
+
+    def check(self, url: str) -> bool:
+        """Raises when the circuit of the host is open. Returns whether the request is the trial of a half open one"""
+        if self.is_open(url):
+            raise CircuitOpenException(f"Too many failures from '{get_host(url)}'. Giving it a break")
+        return get_host(url) in self.trials
+
+    def end_trial(self, url: str) -> None:
+        """Lets another request probe the host when the trial ended without telling whether it is up"""
+        self.trials.discard(get_host(url))
+
+    def record_success(self, url: str) -> None:
+        host = get_host(url)
+        self.failures.pop(host, None)
+        self.opened_at.pop(host, None)
+        self.trials.discard(host)
+
+    def record_failure(self, url: str) -> None:
+        host = get_host(url)
+        self.failures[host] = self.failures.get(host, 0) + 1
+        self.trials.discard(host)
+        if self.failures[host] >= self.failure_threshold:
+            if host not in self.opened_at:
+                logger.warning(f"Opening circuit for '{host}' after {self.failures[host]} consecutive failures")
+            self.opened_at[host] = time.monotonic()
+
+
+class RetryPolicy:
+    """
+    Retries transient failures with exponential backoff and full jitter, within a deadline for the whole request.
+    The deadline counts the attempts and backoff only, never the time spent waiting for a slot, a rate limit token
+    or a paused download
+    """
+
+    def __init__(
+        self, config: RetryConfig, circuit_breaker: CircuitBreaker | None = None, metrics: Metrics | None = None
+    ) -> None:
+        self.config = config
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(config.failure_threshold, config.reset_timeout)
+        self.metrics = metrics
+
+    def get_delay(self, attempt: int) -> float:
+        max_delay = min(self.config.max_delay, self.config.base_delay * 2**attempt)
+        return random.uniform(0, max_delay) if self.config.jitter else max_delay
+
+    @staticmethod
+    def is_retryable(exception: Exception) -> bool:
+        if isinstance(exception, RequestException):
+            return exception.retryable
+        return isinstance(exception, (aiohttp.ClientError, asyncio.TimeoutError))
+
+    @asynccontextmanager
+    async def attempt(self) -> AsyncIterator[None]:
+        """
+        Times a single attempt and spends it from the deadline of the request. Requests enter it once they hold
+        their slot and rate limit token, so only the network I/O is timed and waiting in local queues never counts
+        as a failure of the host
+        """
+        deadline = current_deadline.get()
+        timeout = self.config.attempt_timeout
+        if deadline is not None:
+            timeout = min(timeout, deadline.remaining)
+        started_at = time.monotonic()
+        try:
+            async with asyncio.timeout(timeout):
+                yield
+        finally:
+            if deadline is not None:
+                deadline.spend(time.monotonic() - started_at)
+
+    async def call(
+        self, url: str, request: Callable[[], Awaitable[T]], checkpoint: Callable[[], Awaitable[None]] | None = None
+    ) -> T:
+        """Sends the request until it succeeds. 'checkpoint' runs before every attempt, to hold a paused download"""
+        attempt = 0
+        deadline = Deadline(self.config.deadline)
+        token = current_deadline.set(deadline)
+        try:
+            while True:
+                if checkpoint is not None:
+                    await checkpoint()
+                trial = self.circuit_breaker.check(url)
+                try:
+                    result = await request()
+                except Exception as e:
+                    if not self.is_retryable(e):
+                        if isinstance(e, RequestException):
+                            # The host answered, it is reachable even if the resource is not
+                            self.circuit_breaker.record_success(url)
+                        raise
+                    self.circuit_breaker.record_failure(url)
+                    attempt += 1
+                    delay = self.get_delay(attempt - 1)
+                    if attempt >= self.config.max_attempts or delay >= deadline.remaining:
+                        raise
+                    if self.metrics is not None:
+                        self.metrics.inc("retries_total", host=get_host(url))
+                    logger.warning(f"Request to '{url}' failed ({e!r}). Retrying in {delay:.2f} seconds")
+                    await asyncio.sleep(delay)
+                    deadline.spend(delay)
+                else:
+                    self.circuit_breaker.record_success(url)
+                    return result
+                finally:
+                    if trial:
+                        # Parse errors and cancellations neither close nor reopen the circuit
+                        self.circuit_breaker.end_trial(url)
+        finally:
+            current_deadline.reset(token)
@@ -0,0 +1,165 @@
+# Standard Library
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any
+
+# Dependencies
+import aiohttp
+
+# Local imports
+from .base import Downloader, create_connector
+from .batch import Batch
+from .catalog import CATALOG_NAME, Catalog
+from .concurrency import Scheduler
+from .config import DownloaderConfig
+from .control import DownloadControl
+from .downloader_factory import downloader_factory
+from .exceptions import DownloaderException
+from .metrics import Metrics
+from .models import DownloadReport
+from .retry import RetryPolicy
+from .store import STORE_NAME, ImageStore
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadService(Batch):
+    """
+    Long-lived event loop in a background thread, downloading the series other threads submit. Every job shares
+    the connection pool, rate limiter and circuit breaker of 'config', like the series of a batch, and at most
+    'series' jobs run at the same time while the others wait their turn. The concurrency limits come from each
+    submitted config, jobs with the same settings share them, and the catalog, image store and metrics are those
+    of the job's download path. 'submit' is thread-safe and returns a future, so
+    a GUI thread never blocks on a download. A job submitted with its own 'control' is paused or cancelled on its
+    own, the others follow the control of the service.
+    """
+
+    def __init__(self, config: DownloaderConfig, series: int = 2, **kwargs: Any) -> None:
+        super().__init__(config, [], series, **kwargs)
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+        self.connector: aiohttp.BaseConnector | None = None
+        self.jobs: set[asyncio.Task[Any]] = set()
+        # Submitted jobs not finished yet, running or waiting for their turn
+        self.pending = 0
+        self.pending_lock = threading.Lock()
+        # Shared by the jobs with the same limits, or the same download path
+        self.schedulers: dict[tuple[int, ...], Scheduler] = dict()
+        self.retry_policies: dict[str, RetryPolicy] = dict()
+        self.stores: dict[str, ImageStore] = dict()
+        self.catalogs: dict[str, Catalog] = dict()
+
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="downloads", daemon=True)
+        self.thread.start()
+
+    def submit(self, config: DownloaderConfig, control: DownloadControl | None = None) -> Future[DownloadReport]:
+        """Queues the download of a series. Safe to call from any thread"""
+        if self.loop is None:
+            raise DownloaderException("The download service is not started")
+        with self.pending_lock:
+            self.pending += 1
+        future = asyncio.run_coroutine_threadsafe(self.download(config, control), self.loop)
+        future.add_done_callback(self.job_done)
+        return future
+
+    def job_done(self, _: Future[DownloadReport]) -> None:
+        with self.pending_lock:
+            self.pending -= 1
+
+    def get_connector(self) -> aiohttp.BaseConnector:
+        # Created in the loop thread, which the connector belongs to
+        if self.connector is None:
+            self.connector = create_connector(self.config.connection)
+        return self.connector
+
+    def get_scheduler(self, config: DownloaderConfig) -> Scheduler:
+        concurrency = config.concurrency
+        key = (config.threads, concurrency.images, concurrency.pages, concurrency.per_host)
+        if key not in self.schedulers:
+            self.schedulers[key] = Scheduler.from_config(config.threads, concurrency)
+        return self.schedulers[key]
+
+    def get_retry_policy(self, config: DownloaderConfig) -> RetryPolicy:
+        # One set of metrics per download path, summarized there. Every path shares the circuit breaker
+        path = os.path.abspath(config.path)
+        if path not in self.retry_policies:
+            metrics = Metrics.from_config(config)
+            self.retry_policies[path] = RetryPolicy(config.retry, self.retry_policy.circuit_breaker, metrics)
+        return self.retry_policies[path]
+
+    def get_store(self, config: DownloaderConfig) -> ImageStore | None:
+        if not config.store.enabled:
+            return None
+        path = os.path.abspath(config.store.path or os.path.join(config.path, STORE_NAME))
+        if path not in self.stores:
+            self.stores[path] = ImageStore(path, config.archive.chunk_size)
+        return self.stores[path]
+
+    def get_catalog(self, config: DownloaderConfig) -> Catalog | None:
+        if not config.catalog.enabled:
+            return None
+        path = os.path.abspath(config.catalog.path or os.path.join(config.path, CATALOG_NAME))
+        if path not in self.catalogs:
+            self.catalogs[path] = Catalog(path)
+        return self.catalogs[path]
+
+    def create_downloader(
+        self, config: DownloaderConfig, connector: aiohttp.BaseConnector, control: DownloadControl | None = None
+    ) -> Downloader:
+        retry_policy = self.get_retry_policy(config)
+        return downloader_factory(
+            config,
+            registry=self.registry,
+            event_manager=self.event_manager,
+            scheduler=self.get_scheduler(config),
+            rate_limiter=self.rate_limiter,
+            retry_policy=retry_policy,
+            parser_executor=self.parser_executor,
+            connector=connector,
+            store=self.get_store(config),
+            catalog=self.get_catalog(config),
+            control=control or self.control,
+            metrics=retry_policy.metrics,
+            tracer=self.tracer,
+        )
+
+    async def download(self, config: DownloaderConfig, control: DownloadControl | None = None) -> DownloadReport:
+        task = asyncio.current_task()
+        assert task is not None
+        self.jobs.add(task)
+        try:
+            async with self.series:
+                downloader = self.create_downloader(config, self.get_connector(), control)
+                return await downloader.download()
+        finally:
+            self.jobs.discard(task)
+
+    async def shutdown(self) -> None:
+        for task in list(self.jobs):
+            task.cancel()
+        await asyncio.gather(*self.jobs, return_exceptions=True)
+        if self.connector is not None:
+            await self.connector.close()
+            self.connector = None
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Cancels the jobs left, closes the shared connections and stops the loop thread"""
+        if self.loop is None or self.thread is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Download service did not shut down cleanly: {e!r}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+        self.loop.close()
+        self.parser_executor.shutdown(wait=False)
+        self.loop = None
+        self.thread = None
@@ -0,0 +1,162 @@
+# Standard Library
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from typing import IO, Any
+
+# Local imports
+from .resources import SharedResource, Worker
+
+logger = logging.getLogger(__name__)
+
+STORE_NAME = ".mangadanga-store"
+
+
+def hash_file(file: IO[bytes], chunk_size: int = 64 * 1024) -> tuple[int, str]:
+    """Size and sha256 of a file, read from the start"""
+    file.seek(0)
+    size = 0
+    digest = hashlib.sha256()
+    while chunk := file.read(chunk_size):
+        digest.update(chunk)
+        size += len(chunk)
+    return size, digest.hexdigest()
+
+
+class ImageStore(SharedResource):
+    """Content-addressed store of the images of a library, so an image repeated across chapters is fetched once"""
+
+    def __init__(self, directory: str, chunk_size: int = 64 * 1024) -> None:
+        super().__init__()
+        self.directory = directory
+        self.objects_path = os.path.join(directory, "objects")
+        self.index_path = os.path.join(directory, "index.jsonl")
+        self.chunk_size = chunk_size
+        # url -> sha256 of its content
+        self.urls: dict[str, str] = dict()
+        # sha256 -> chapter entries referencing it
+        self.references: dict[str, int] = dict()
+        self.reused = 0
+        self.worker = Worker("image-store")
+        self.file: IO[str] | None = None
+
+    async def setup(self) -> None:
+        self.worker.start()
+        await self.worker.run(self.load)
+
+    async def teardown(self) -> None:
+        try:
+            if self.file is not None:
+                await self.worker.run(self.file.close)
+                self.file = None
+        finally:
+            self.worker.stop()
+        if self.reused:
+            logger.info(f"Reused {self.reused} images from the image store")
+
+    def load(self) -> None:
+        os.makedirs(self.objects_path, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        self.apply(json.loads(line))
+                    except (ValueError, KeyError) as e:
+                        logger.warning(f"Ignoring unreadable image store line in '{self.index_path}': {e!r}")
+        self.compact()
+
+    def compact(self) -> None:
+        compact_path = f"{self.index_path}.tmp"
+        with open(compact_path, "w", encoding="utf-8") as file:
+            for sha256, references in self.references.items():
+                file.write(json.dumps({"event": "count", "sha256": sha256, "references": references}) + "\n")
+            for url, sha256 in self.urls.items():
+                file.write(json.dumps({"event": "url", "sha256": sha256, "url": url}) + "\n")
+        os.replace(compact_path, self.index_path)
+        self.file = open(self.index_path, "a", encoding="utf-8")
+
+    def apply(self, entry: dict[str, Any]) -> None:
+        event, sha256 = entry["event"], entry["sha256"]
+        if event == "count":
+            self.references[sha256] = entry["references"]
+        elif event == "url":
+            self.urls[entry["url"]] = sha256
+        elif event == "reference":
+            self.urls[entry["url"]] = sha256
+            self.references[sha256] = self.references.get(sha256, 0) + 1
+        elif event == "release":
+            self.references[sha256] = self.references.get(sha256, 0) - 1
+            if self.references[sha256] <= 0:
+                del self.references[sha256]
+        else:
+            raise KeyError(event)
+
+    def append(self, entry: dict[str, Any]) -> None:
+        if self.file is None:
+            raise ValueError(f"Image store '{self.directory}' is not open")
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+
+    def get_object_path(self, sha256: str) -> str:
+        return os.path.join(self.objects_path, sha256[:2], sha256)
+
+    def has_object(self, sha256: str) -> bool:
+        return os.path.exists(self.get_object_path(sha256))
+
+    def put_object(self, sha256: str, file: IO[bytes]) -> str:
+        """Copies a file into the store unless its content is already there. Safe to call from any thread"""
+        object_path = self.get_object_path(sha256)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            # Concurrent writers of the same content each write their own file, the last rename wins
+            temporary_path = f"{object_path}.{uuid.uuid4().hex}.tmp"
+            file.seek(0)
+            with open(temporary_path, "wb") as object_file:
+                shutil.copyfileobj(file, object_file, self.chunk_size)
+            os.replace(temporary_path, object_path)
+        return object_path
+
+    def link_object(self, sha256: str, path: str) -> None:
+        """Hardlinks an image of the store to a path, copying it where hardlinks are not supported"""
+        object_path = self.get_object_path(sha256)
+        if os.path.exists(path):
+            os.remove(path)
+        try:
+            os.link(object_path, path)
+        except OSError:
+            shutil.copyfile(object_path, path)
+
+    def remove_object(self, sha256: str) -> None:
+        object_path = self.get_object_path(sha256)
+        if os.path.exists(object_path):
+            os.remove(object_path)
+
+    async def lookup(self, url: str) -> IO[bytes] | None:
+        """The stored content of a url already seen, opened for reading. None when it has to be fetched"""
+        sha256 = self.urls.get(url)
+        if sha256 is None or not await self.worker.run(self.has_object, sha256):
+            return None
+        self.reused += 1
+        return await self.worker.run(open, self.get_object_path(sha256), "rb")
+
+    async def reference(self, url: str, sha256: str, file: IO[bytes]) -> None:
+        """
+        Counts a chapter entry holding the content of a url. The content is kept in the store once a second
+        entry references it
+        """
+        entry = {"event": "reference", "sha256": sha256, "url": url}
+        self.apply(entry)
+        await self.worker.run(self.append, entry)
+        if self.references[sha256] > 1:
+            await self.worker.run(self.put_object, sha256, file)
+
+    async def release(self, sha256: str) -> None:
+        """Uncounts a chapter entry. Content nothing references anymore is deleted"""
+        entry = {"event": "release", "sha256": sha256}
+        self.apply(entry)
+        await self.worker.run(self.append, entry)
+        if sha256 not in self.references:
+            await self.worker.run(self.remove_object, sha256)
@@ -0,0 +1,27 @@
+# Standard Library
+from typing import Any
+
+# Local imports
+from .batch import Batch
+from .config import ChapterStrategyConfig, DownloaderConfig
+
+
+def read_watchlist(path: str) -> list[str]:
+    """Series urls of a watchlist: one per line, blank lines and lines starting with '#' are skipped"""
+    with open(path, encoding="utf-8") as file:
+        lines = (line.strip() for line in file)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+class LibrarySync(Batch):
+    """
+    Brings every series of a watchlist up to date. Each series page is scraped and its chapters diffed against
+    the library catalog and the archives on disk, so only the new chapters are downloaded. All series share one
+    concurrency budget.
+    """
+
+    def __init__(self, config: DownloaderConfig, urls: list[str], series: int = 4, **kwargs: Any) -> None:
+        # Every chapter of the series is wanted, the ones already on disk are skipped by the pipeline
+        config = config.model_copy(update={"chapter_strategy": ChapterStrategyConfig()})
+        series_configs = [config.model_copy(update={"url": url}) for url in urls]
+        super().__init__(config, series_configs, series, **kwargs)
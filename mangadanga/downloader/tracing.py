@@ -0,0 +1,131 @@
+# Standard Library
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import AbstractContextManager, nullcontext
+from types import TracebackType
+from typing import Any, Callable, TypeVar
+
+# Local imports
+from .config import DownloaderConfig
+from .metrics import write_file
+from .resources import SharedResource
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+TRACE_NAME = "mangadanga-trace.json"
+NULL_SPAN: AbstractContextManager[None] = nullcontext()
+
+
+class Span:
+    def __init__(self, tracer: "Tracer", name: str, args: dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.started_at = 0.0
+
+    def __enter__(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        if exc is not None:
+            self.args["error"] = repr(exc)
+        self.tracer.record(self.name, self.started_at, time.perf_counter(), self.args)
+
+
+class Tracer(SharedResource):
+    """Records timed spans of the downloads as a Chrome trace. A tracer without a path records nothing"""
+
+    def __init__(self, path: str = "", max_events: int = 1_000_000) -> None:
+        super().__init__()
+        self.path = path
+        self.enabled = bool(path)
+        self.max_events = max_events
+        self.events: list[dict[str, Any]] = []
+        self.dropped = 0
+        # Row of the trace of every task and thread, by name
+        self.rows: dict[str, int] = dict()
+        self.rows_lock = threading.Lock()
+        self.pid = os.getpid()
+        self.started_at = time.perf_counter()
+
+    @classmethod
+    def from_config(cls, config: DownloaderConfig) -> "Tracer":
+        return cls(config.tracing.path, config.tracing.max_events)
+
+    def span(self, name: str, /, **args: Any) -> AbstractContextManager[None]:
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def wrap(self, name: str, function: Callable[..., T], /, **args: Any) -> Callable[..., T]:
+        """Function recording a span in the thread that runs it, for the work handed to executors"""
+        if not self.enabled:
+            return function
+
+        def traced(*function_args: Any) -> T:
+            with self.span(name, **args):
+                return function(*function_args)
+
+        return traced
+
+    def get_row(self) -> int:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        name = task.get_name() if task is not None else threading.current_thread().name
+        row = self.rows.get(name)
+        if row is None:
+            with self.rows_lock:
+                row = self.rows.setdefault(name, len(self.rows) + 1)
+        return row
+
+    def record(self, name: str, started_at: float, finished_at: float, args: dict[str, Any]) -> None:
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+            return
+        # Appending to a list is atomic, spans of the worker threads need no lock
+        self.events.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (started_at - self.started_at) * 1e6,
+                "dur": (finished_at - started_at) * 1e6,
+                "pid": self.pid,
+                "tid": self.get_row(),
+                "args": args,
+            }
+        )
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        rows = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": row, "args": {"name": name}}
+            for name, row in list(self.rows.items())
+        ]
+        return {
+            "traceEvents": rows + list(self.events),
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped": self.dropped},
+        }
+
+    async def teardown(self) -> None:
+        if self.enabled:
+            await self.export()
+
+    async def export(self) -> None:
+        """Writes the trace in a thread"""
+        trace = json.dumps(self.to_chrome_trace())
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, write_file, self.path, trace)
+        except OSError as e:
+            logger.warning(f"Could not write the trace: {e!r}")
+            return
+        logger.info(f"Wrote {len(self.events)} spans to '{self.path}'")
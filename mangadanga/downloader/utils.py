@@ -1,5 +1,6 @@
 # Standard Library
 import platform
+import urllib.parse
 
 
 def get_forbidden_chars() -> set[str]:
@@ -13,6 +14,10 @@ def get_forbidden_chars() -> set[str]:
     return os_to_forbidden_chars[operating_system] if operating_system in os_to_forbidden_chars else default
 
 
+def get_host(url: str) -> str:
+    return urllib.parse.urlparse(url).netloc
+
+
 def format_name(name: str) -> str:
     forbidden_chars = get_forbidden_chars()
     if not forbidden_chars:
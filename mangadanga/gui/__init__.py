@@ -1,18 +1,34 @@
-from .style import GUIStyle
-from .widgets import MainWindow
-from .mangadanga_gui import MangadangaGUI
+import importlib
+from typing import Any
+
 from .events import (
     EventManager,
     EVENT_MANAGER,
     Event,
+    ProgressEvent,
     OnCloseProgress,
     OnMangaInfoUpdate,
     OnChapterDownloadFinished,
     OnDownloadFinished,
+    OnImageDownloaded,
     OnDownloadFinishedGUI,
     OnStartDownload,
 )
 
+# Tk widgets are only imported once they are used, so importing the events does not need Tk
+LAZY_IMPORTS = {
+    "GUIStyle": ".style",
+    "MainWindow": ".widgets",
+    "MangadangaGUI": ".mangadanga_gui",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in LAZY_IMPORTS:
+        return getattr(importlib.import_module(LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
 __all__ = [
     "GUIStyle",
     "MainWindow",
@@ -20,10 +36,12 @@ __all__ = [
     "EventManager",
     "EVENT_MANAGER",
     "Event",
+    "ProgressEvent",
     "OnCloseProgress",
     "OnMangaInfoUpdate",
     "OnChapterDownloadFinished",
     "OnDownloadFinished",
+    "OnImageDownloaded",
     "OnDownloadFinishedGUI",
     "OnStartDownload",
 ]
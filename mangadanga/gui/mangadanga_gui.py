@@ -2,6 +2,7 @@ import tkinter
 import tkinter.ttk
 
 from ..downloader.config import DownloaderConfig
+from ..downloader.service import DownloadService
 from .style import GUIStyle
 from .widgets import MainWindow
 
@@ -13,13 +14,21 @@ class MangadangaGUI:
         init_config: DownloaderConfig | None = None,
         widgets: MainWindow | None = None,
         styles: GUIStyle | None = None,
+        service: DownloadService | None = None,
     ) -> None:
         self.container = container or tkinter.Tk()
         self.init_config = init_config or DownloaderConfig()
+        # A single event loop thread runs every download, sharing connections. The limits and paths are per job
+        self.service = service or DownloadService(self.init_config)
+        self.service.start()
         self.set_main_window()
-        self.widgets = widgets or MainWindow(self.container, self.init_config)
+        self.widgets = widgets or MainWindow(self.container, self.init_config, self.service)
         self.styles = styles or GUIStyle(self.container)
 
+    def close(self) -> None:
+        """Cancels the downloads left and stops the download thread"""
+        self.service.stop(timeout=5)
+
     def set_main_window(self) -> None:
         self.main_window_column_row_config()
         self.center_main_window()
@@ -33,7 +42,7 @@ class MangadangaGUI:
 
     def center_main_window(self) -> None:
         main_window_width = 500
-        main_window_height = 410
+        main_window_height = 530
         screen_width = self.container.winfo_screenwidth()
         screen_height = self.container.winfo_screenheight()
         x_axis = int((screen_width / 2) - (main_window_width / 2))
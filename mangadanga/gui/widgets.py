@@ -1,50 +1,67 @@
-import asyncio
-import threading
+# Standard Library
+import logging
 import tkinter
-from tkinter import Misc, ttk, filedialog, messagebox
-from mangadanga.downloader import downloader_factory, DownloaderConfig
+from concurrent.futures import Future
+from tkinter import Misc, filedialog, messagebox, ttk
 from typing import Callable, Literal
-import logging
+
+# Local imports
+from ..downloader.config import ChapterStrategyConfig, ConcurrencyConfig, DownloaderConfig
+from ..downloader.control import DownloadControl
+from ..downloader.exceptions import DownloaderException
+from ..downloader.models import DownloadReport
+from ..downloader.service import DownloadService
 from .events import (
-    EventManager,
     EVENT_MANAGER,
+    EventManager,
     OnChapterDownloadFinished,
     OnCloseProgress,
     OnDownloadFinished,
     OnDownloadFinishedGUI,
+    OnImageDownloaded,
     OnMangaInfoUpdate,
     OnStartDownload,
 )
-from ..downloader.config import ChapterStrategyConfig
-from ..downloader.exceptions import DownloaderException
 from .utils import validate_non_empty, validate_numeric
 
 logger = logging.getLogger("MangaDanga-GUI")
 
+EVENTS_INTERVAL_MS = 100
+# Seconds of each tick spent processing events
+EVENTS_BUDGET = 0.02
+
 
 class MainWindow:
     def __init__(
-        self, container: tkinter.Tk, init_config: DownloaderConfig, event_manager: EventManager = EVENT_MANAGER
+        self,
+        container: tkinter.Tk,
+        init_config: DownloaderConfig,
+        service: DownloadService,
+        event_manager: EventManager = EVENT_MANAGER,
     ) -> None:
         self.init_config = init_config
         self.container = container
         self.top_banner = TopBanner(container)
         self.main_tabs = NotebookComponent(container, init_config)
-        self.download_button = DownloadButton(container, self.get_config, event_manager=event_manager)
+        self.download_button = DownloadButton(container, self.get_config, service, event_manager=event_manager)
         self.event_manager = event_manager
         self.task_process_event_queue()
         self.window_general_management()
 
     def task_process_event_queue(self) -> None:
-        self.event_manager.process_queue()
-        self.container.after(100, self.task_process_event_queue)
+        # Events left once the budget is spent wait for the next tick, so the window keeps responding
+        self.event_manager.process_queue(budget=EVENTS_BUDGET)
+        self.container.after(EVENTS_INTERVAL_MS, self.task_process_event_queue)
 
     def get_config(self) -> DownloaderConfig:
         url = self.main_tabs.download_tab.url_component.get_url()
         path = self.main_tabs.download_tab.local_path_component.get_path()
         chapter_strategy_config = self.main_tabs.settings_tab.download_management.get_chapter_selection_strategy()
         threads = self.main_tabs.settings_tab.multithreading.get_threads()
-        return DownloaderConfig(url=url, path=path, chapter_strategy=chapter_strategy_config, threads=threads)
+        concurrency = self.main_tabs.settings_tab.multithreading.get_concurrency()
+        return DownloaderConfig(
+            url=url, path=path, chapter_strategy=chapter_strategy_config, threads=threads, concurrency=concurrency
+        )
 
     def window_general_management(self) -> None:
         self.container.bind("<Escape>", lambda _: self.quit())
@@ -57,17 +74,33 @@ class MainWindow:
 
 
 class ProgressWindow:
-    def __init__(self, container: tkinter.Toplevel | None = None, event_manager: EventManager = EVENT_MANAGER) -> None:
+    def __init__(
+        self,
+        container: tkinter.Toplevel | None = None,
+        event_manager: EventManager = EVENT_MANAGER,
+        control: DownloadControl | None = None,
+        on_close: Callable[[], None] | None = None,
+    ) -> None:
         self.container = container or tkinter.Toplevel()
         self.container.title("Progress")
         self.container.resizable(False, False)
+        self.container.protocol("WM_DELETE_WINDOW", self.on_window_close)
+        # Pauses or cancels every series the window shows
+        self.control = control or DownloadControl()
+        self.on_close = on_close
 
         progress_bar, progress_label = self.setup_widgets()
         self.progress_bar = progress_bar
         self.progress_label = progress_label
+        self.pause_button, self.cancel_button = self.setup_buttons()
+
+        self.chapters = 0
+        self.images = 0
+        self.bytes = 0
 
         self.event_manager = event_manager
         OnChapterDownloadFinished(self.event_manager).subscribe(self.on_chapter_download_finished)
+        OnImageDownloaded(self.event_manager).subscribe(self.on_image_downloaded)
         OnMangaInfoUpdate(self.event_manager).subscribe(self.on_manga_info_updated)
         OnCloseProgress(self.event_manager).subscribe(self.on_close_progress)
 
@@ -79,23 +112,60 @@ class ProgressWindow:
         progress_label.pack()
         return progress_bar, progress_label
 
+    def setup_buttons(self) -> tuple[ttk.Button, ttk.Button]:
+        buttons = ttk.Frame(self.container)
+        buttons.pack(pady=5)
+        pause_button = ttk.Button(buttons, text="Pause", command=self.on_pause, width=10, style="TButton")
+        pause_button.grid(row=0, column=0, padx=5)
+        cancel_button = ttk.Button(buttons, text="Cancel", command=self.on_cancel, width=10, style="TButton")
+        cancel_button.grid(row=0, column=1, padx=5)
+        return pause_button, cancel_button
+
+    def on_pause(self) -> None:
+        if self.control.paused:
+            self.control.resume()
+            self.pause_button["text"] = "Pause"
+        else:
+            self.control.pause()
+            self.pause_button["text"] = "Resume"
+
+    def on_cancel(self) -> None:
+        # Each series then reports its end, the window closes after the last one
+        self.control.cancel()
+        self.pause_button.state(["disabled"])
+        self.cancel_button.state(["disabled"])
+        self.progress_label["text"] = "Cancelling..."
+
+    def on_window_close(self) -> None:
+        # Closing the window cancels the series it shows, their end is no longer displayed
+        self.control.cancel()
+        self.on_close_progress()
+        if self.on_close is not None:
+            self.on_close()
+
     def update_label(self) -> None:
-        self.progress_label[
-            "text"
-        ] = f"Chapters downloaded {self.progress_bar['value']}/{self.progress_bar['maximum']}"
+        chapters = f"Chapters downloaded {self.progress_bar['value']}/{self.progress_bar['maximum']}"
+        self.progress_label["text"] = f"{chapters} ({self.images} images, {self.bytes / 2**20:.1f} MiB)"
 
     def on_manga_info_updated(self, chapter_count: int) -> None:
+        # Several series may download at the same time, each one adds its chapters
         logger.info(f"Received manga info. Chapter count: {chapter_count}")
-        self.progress_bar["maximum"] = chapter_count
-        self.progress_bar["value"] = 0
+        self.chapters += chapter_count
+        self.progress_bar["maximum"] = self.chapters
+        self.update_label()
+
+    def on_chapter_download_finished(self, chapters: int) -> None:
+        self.progress_bar["value"] += chapters
         self.update_label()
 
-    def on_chapter_download_finished(self) -> None:
-        self.progress_bar["value"] += 1
+    def on_image_downloaded(self, images: int, size: int) -> None:
+        self.images += images
+        self.bytes += size
         self.update_label()
 
     def on_close_progress(self) -> None:
         OnChapterDownloadFinished(self.event_manager).unsubscribe(self.on_chapter_download_finished)
+        OnImageDownloaded(self.event_manager).unsubscribe(self.on_image_downloaded)
         OnMangaInfoUpdate(self.event_manager).unsubscribe(self.on_manga_info_updated)
         OnCloseProgress(self.event_manager).unsubscribe(self.on_close_progress)
         self.container.destroy()
@@ -125,10 +195,15 @@ class DownloadButton:
         self,
         container: Misc,
         get_config: Callable[[], DownloaderConfig],
+        service: DownloadService,
         event_manager: EventManager = EVENT_MANAGER,
     ) -> None:
         self.container = container
         self.event_manager = event_manager
+        self.service = service
+        # Series submitted and not finished yet. The progress window stays open while there is any
+        self.jobs = 0
+        self.progress_window: ProgressWindow | None = None
         self.button = ttk.Button(
             container,
             text="Download",
@@ -144,28 +219,54 @@ class DownloadButton:
         OnDownloadFinishedGUI(self.event_manager).subscribe(self.on_download_finished_gui)
 
     def on_start_download(self) -> None:
-        status = "success"
         try:
             self.process_download()
         except DownloaderException as e:
-            status = "warning"
-            message = str(e)
             logger.exception(e)
+            OnDownloadFinishedGUI(self.event_manager).emit("warning", str(e))
         except Exception as e:
-            message = str(e)
             logger.exception(e)
-        finally:
-            OnDownloadFinished(self.event_manager).emit(status, message)
+            OnDownloadFinishedGUI(self.event_manager).emit("error", str(e))
 
     def process_download(self) -> None:
+        """Queues the series in the download service. The button stays enabled to queue more series"""
         config = self.get_config()
-        downloader = downloader_factory(config)
-        self.button["state"] = "disabled"
-        ProgressWindow()
-        self.threaded_coro(downloader.download())
+        # The window subscribes before the job starts, so it gets every event of the job
+        if self.progress_window is None:
+            self.progress_window = ProgressWindow(
+                event_manager=self.event_manager, control=DownloadControl(), on_close=self.forget_progress_window
+            )
+        try:
+            future = self.service.submit(config, self.progress_window.control)
+        except Exception:
+            if self.jobs == 0:
+                self.close_progress_window()
+            raise
+        self.jobs += 1
+        future.add_done_callback(self.on_job_done)
+
+    def close_progress_window(self) -> None:
+        self.forget_progress_window()
+        OnCloseProgress(self.event_manager).emit()
+
+    def forget_progress_window(self) -> None:
+        # The next series opens a new window
+        self.progress_window = None
+
+    def on_job_done(self, future: Future[DownloadReport]) -> None:
+        # Runs in the download thread. A downloader reports its own end, only a job that could not start is left
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            status = "warning" if isinstance(error, DownloaderException) else "error"
+            OnDownloadFinished(self.event_manager).emit(status, str(error))
 
     def on_download_finished(self, status: Literal["success", "warning"], message: str) -> None:
-        OnCloseProgress(self.event_manager).emit()
+        self.jobs -= 1
+        if self.jobs <= 0:
+            self.jobs = 0
+            self.close_progress_window()
         OnDownloadFinishedGUI(self.event_manager).emit(status, message)
 
     def on_download_finished_gui(self, status: Literal["success", "warning"], message: str) -> None:
@@ -175,11 +276,6 @@ class DownloadButton:
             messagebox.showwarning(title="Warning!", message=message)
         else:
             messagebox.showerror(title="Error!", message=f"Something unexpected happened: {message}")
-        self.button["state"] = "normal"
-
-    def threaded_coro(self, coro) -> None:
-        thread = threading.Thread(target=asyncio.run, args=(coro,))
-        thread.start()
 
 
 class DownloadTab:
@@ -414,8 +510,32 @@ class MultithreadingComponent:
         self.combo_box.set(init_config.threads)
         self.combo_box.grid(row=0, column=1, ipady=2, padx=10, pady=10)
 
+        concurrency = init_config.concurrency
+        self.images_combo_box = self.set_limit_combo_box(1, "Images in parallel:", concurrency.images, 33)
+        self.pages_combo_box = self.set_limit_combo_box(2, "Pages in parallel:", concurrency.pages, 17)
+        self.per_host_combo_box = self.set_limit_combo_box(3, "Requests per host:", concurrency.per_host, 17)
+
+    def set_limit_combo_box(self, row: int, text: str, value: int, max_value: int) -> ttk.Combobox:
+        label = ttk.Label(self.label_frame, text=text, style="Generic.TLabel")
+        label.grid(row=row, column=0, padx=10, pady=10, sticky=tkinter.W)
+        combo_box = ttk.Combobox(self.label_frame, values=list(range(1, max_value)), width=3, font=("consolas", 8))
+        combo_box.set(value)
+        combo_box.grid(row=row, column=1, ipady=2, padx=10, pady=10)
+        return combo_box
+
+    @staticmethod
+    def get_limit(combo_box: ttk.Combobox, name: str) -> int:
+        raw_limit = combo_box.get()
+        validate_non_empty(raw_limit, name)
+        validate_numeric(raw_limit, name)
+        return int(raw_limit)
+
     def get_threads(self) -> int:
-        raw_threads = self.combo_box.get()
-        validate_non_empty(raw_threads, "Number of threads")
-        validate_numeric(raw_threads, "Number of threads")
-        return int(raw_threads)
+        return self.get_limit(self.combo_box, "Number of threads")
+
+    def get_concurrency(self) -> ConcurrencyConfig:
+        return ConcurrencyConfig(
+            images=self.get_limit(self.images_combo_box, "Images in parallel"),
+            pages=self.get_limit(self.pages_combo_box, "Pages in parallel"),
+            per_host=self.get_limit(self.per_host_combo_box, "Requests per host"),
+        )
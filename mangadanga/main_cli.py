@@ -1,36 +1,112 @@
 import logging
+import os
 import sys
 import asyncio
+from argparse import Namespace
 
 from .downloader import (
+    Batch,
+    Catalog,
+    ConcurrencyConfig,
     DownloaderConfig,
-    chapters_selection_factory,
+    LibrarySync,
     downloader_factory,
+    read_watchlist,
 )
+from .downloader.catalog import CATALOG_NAME
+from .downloader.config import (
+    ArchiveConfig,
+    CatalogConfig,
+    ChapterStrategyConfig,
+    MetricsConfig,
+    ParserConfig,
+    StoreConfig,
+    TracingConfig,
+)
+from .downloader.profiling import Profiler
+from .downloader.tracing import TRACE_NAME
 from .parser import get_parser
 
-
 logger = logging.getLogger("MangaDanga")
 
 
-def get_config(argv: list[str] = sys.argv[1:]) -> DownloaderConfig:
+def get_chapter_strategy(
+    chapters: list[str] | None, chapter_ranges: list[list[str]] | None, latest: int = 0
+) -> ChapterStrategyConfig:
+    if not chapters and not chapter_ranges and not latest:
+        return ChapterStrategyConfig()
+    return ChapterStrategyConfig(
+        strategy="selection",
+        config={"chapters": chapters or [], "ranges": chapter_ranges or [], "latest": latest},
+    )
+
+
+def get_args(argv: list[str] = sys.argv[1:]) -> Namespace:
     parser = get_parser()
     args = parser.parse_args(argv)
+    if not args.urls and args.sync is None and not args.library:
+        parser.error("a url, a watchlist (--sync) or --library is required")
     logger.info(args)
-    # TODO: Refactor in order for CLI to work again
-    chapters = chapters_selection_factory(args.chapters, args.chapter_range)
+    return args
+
+
+def get_config(argv: list[str] = sys.argv[1:], args: Namespace | None = None) -> DownloaderConfig:
+    args = args or get_args(argv)
+    concurrency = ConcurrencyConfig(images=args.images, pages=args.pages, per_host=args.per_host)
     downloader_config = DownloaderConfig(
-        url=args.url, path=args.path, chapters_selection=chapters, threads=args.threads
+        url=args.urls[0] if args.urls else "",
+        path=args.path,
+        chapter_strategy=get_chapter_strategy(args.chapters, args.chapter_range, args.latest),
+        threads=args.threads,
+        concurrency=concurrency,
+        parser=ParserConfig(workers=args.parser_workers, backend=args.parser_backend),
+        archive=ArchiveConfig(format=args.format),
+        store=StoreConfig(enabled=args.store),
+        catalog=CatalogConfig(enabled=not args.no_catalog),
+        metrics=MetricsConfig(summary=not args.no_metrics_summary, prometheus_path=args.metrics),
+        tracing=TracingConfig(path=args.trace or (os.path.join(args.path, TRACE_NAME) if args.profile else "")),
     )
     return downloader_config
 
 
+async def print_library(config: DownloaderConfig) -> None:
+    catalog = Catalog(config.catalog.path or os.path.join(config.path, CATALOG_NAME))
+    await catalog.open()
+    try:
+        summary = await catalog.summary()
+    finally:
+        await catalog.close()
+    for series in summary:
+        print(f"{series.title}: {series.chapters} chapters, {series.images} images, {series.size / 2**20:.1f} MiB")
+    print(f"{len(summary)} series in the library")
+
+
+def run(args: Namespace, config: DownloaderConfig) -> None:
+    if args.library:
+        asyncio.run(print_library(config))
+        return
+    if args.sync is not None:
+        library_sync = LibrarySync(config, read_watchlist(args.sync), series=args.series)
+        asyncio.run(library_sync.run())
+        return
+    if len(args.urls) > 1:
+        batch = Batch.from_urls(config, args.urls, series=args.series)
+        asyncio.run(batch.run())
+        return
+    downloader = downloader_factory(config)
+    asyncio.run(downloader.download())
+
+
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
-    config = get_config()
+    args = get_args()
+    config = get_config(args=args)
     logger.info(f"Using configuration: {config}")
-    downloader = downloader_factory(config)
-    asyncio.run(downloader.download())
+    if args.profile:
+        with Profiler(config.path):
+            run(args, config)
+        return
+    run(args, config)
 
 
 if __name__ == "__main__":
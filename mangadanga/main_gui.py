@@ -5,7 +5,10 @@ import logging
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
     app = MangadangaGUI()
-    app.container.mainloop()
+    try:
+        app.container.mainloop()
+    finally:
+        app.close()
 
 
 if __name__ == "__main__":
@@ -9,13 +9,38 @@ PROGRAM_DESCRIPTION = (
     "By default, the downloaded files will be stored where you execute the program. Enjoy!"
 )
 PROGRAM_EPILOG = "Chachi"
-PROGRAM_URL_HELP = "Display a url of the graphic novel to download"
+PROGRAM_URL_HELP = "Display the url/s of the graphic novels to download. Several urls are downloaded concurrently"
+PROGRAM_SYNC_HELP = (
+    "Display a watchlist file with one url per line. Every series is updated with the chapters missing on disk"
+)
+PROGRAM_SERIES_HELP = "Display the maximum number of series downloaded or synced at the same time"
 PROGRAM_PATH_HELP = "Display the system path where the files will be stored"
 PROGRAM_THREADS_HELP = "Display a number of threads to use"
+PROGRAM_IMAGES_HELP = "Display the maximum number of images downloaded at the same time"
+PROGRAM_PAGES_HELP = "Display the maximum number of pages scrapped at the same time"
+PROGRAM_PER_HOST_HELP = "Display the maximum number of requests in flight against the same host"
+PROGRAM_PARSER_WORKERS_HELP = "Display the number of threads parsing html pages"
+PROGRAM_PARSER_BACKEND_HELP = "Display the html parser backend, auto uses lxml when it is installed"
+PROGRAM_FORMAT_HELP = "Display the output of each chapter: a zip archive or a folder of images"
+PROGRAM_STORE_HELP = (
+    "Keep repeated images (credits, banners...) once in a store shared by the library, and skip fetching them again"
+)
+PROGRAM_NO_CATALOG_HELP = "Do not record finished chapters in the library catalog kept in the path"
+PROGRAM_METRICS_HELP = (
+    "Display a file where the throughput metrics are written in Prometheus text format while downloading"
+)
+PROGRAM_NO_METRICS_SUMMARY_HELP = "Do not write the JSON summary of the throughput in the path at the end of a run"
+PROGRAM_TRACE_HELP = "Display a file where the spans of every stage are written as a Chrome trace at the end of a run"
+PROGRAM_PROFILE_HELP = (
+    "Profile the run with cProfile and tracemalloc and write the report in the path, along with a trace of the run"
+)
+PROGRAM_LIBRARY_HELP = "Display the series, chapters and size of the library catalog in the path, then exit"
 PROGRAM_C_HELP = "Display the chapter/s required to download. It takes one or more numbers"
 PROGRAM_R_HELP = (
-    "Display the range of chapters required to download. It takes two numbers, the first smaller than the second"
+    "Display the range of chapters required to download. It takes two numbers, the first smaller than the second. "
+    "It can be repeated, and combined with --chapters and --latest"
 )
+PROGRAM_LATEST_HELP = "Display the number of most recent chapters required to download"
 
 
 def get_parser() -> ArgumentParser:
@@ -24,10 +49,27 @@ def get_parser() -> ArgumentParser:
         description=PROGRAM_DESCRIPTION,
         epilog=PROGRAM_EPILOG,
     )
-    parser.add_argument("url", help=PROGRAM_URL_HELP)
+    parser.add_argument("urls", nargs="*", metavar="url", help=PROGRAM_URL_HELP)
+    parser.add_argument("-s", "--sync", metavar="WATCHLIST", help=PROGRAM_SYNC_HELP)
+    parser.add_argument("--series", default=4, type=int, help=PROGRAM_SERIES_HELP)
     parser.add_argument("-p", "--path", nargs="?", default=".", help=PROGRAM_PATH_HELP)
     parser.add_argument("-t", "--threads", default=1, type=int, help=PROGRAM_THREADS_HELP)
-    exclusive_group = parser.add_mutually_exclusive_group()
-    exclusive_group.add_argument("-c", "--chapters", nargs="+", type=str, help=PROGRAM_C_HELP)
-    exclusive_group.add_argument("-r", "--chapter_range", nargs=2, type=str, help=PROGRAM_R_HELP)
+    parser.add_argument("--images", default=8, type=int, help=PROGRAM_IMAGES_HELP)
+    parser.add_argument("--pages", default=4, type=int, help=PROGRAM_PAGES_HELP)
+    parser.add_argument("--per-host", default=6, type=int, help=PROGRAM_PER_HOST_HELP)
+    parser.add_argument("--parser-workers", default=2, type=int, help=PROGRAM_PARSER_WORKERS_HELP)
+    parser.add_argument(
+        "--parser-backend", default="auto", choices=["auto", "lxml", "html.parser"], help=PROGRAM_PARSER_BACKEND_HELP
+    )
+    parser.add_argument("--format", default="zip", choices=["zip", "folder"], help=PROGRAM_FORMAT_HELP)
+    parser.add_argument("--store", action="store_true", help=PROGRAM_STORE_HELP)
+    parser.add_argument("--no-catalog", action="store_true", help=PROGRAM_NO_CATALOG_HELP)
+    parser.add_argument("--metrics", metavar="FILE", default="", help=PROGRAM_METRICS_HELP)
+    parser.add_argument("--no-metrics-summary", action="store_true", help=PROGRAM_NO_METRICS_SUMMARY_HELP)
+    parser.add_argument("--trace", metavar="FILE", default="", help=PROGRAM_TRACE_HELP)
+    parser.add_argument("--profile", action="store_true", help=PROGRAM_PROFILE_HELP)
+    parser.add_argument("--library", action="store_true", help=PROGRAM_LIBRARY_HELP)
+    parser.add_argument("-c", "--chapters", nargs="+", type=str, help=PROGRAM_C_HELP)
+    parser.add_argument("-r", "--chapter_range", nargs=2, type=str, action="append", help=PROGRAM_R_HELP)
+    parser.add_argument("-l", "--latest", default=0, type=int, help=PROGRAM_LATEST_HELP)
     return parser
@@ -1,4 +1,4 @@
-from mangadanga.downloader import Mangatown
+from mangadanga.downloader import DownloaderConfig, Mangatown
 import pytest
 
 [
@@ -37,8 +37,16 @@ import pytest
 ]
 
 
-def test_get_src_numbers_suffix():
-    assert False
+@pytest.mark.parametrize(
+    "src, expected_suffix",
+    [
+        pytest.param("https://zjcdn.mangahere.org/store/manga/32/001-003.0/compressed/fma_03_01.jpg", "01"),
+        pytest.param("https://zjcdn.mangahere.org/store/manga/32/001-004.0/compressed/fma01cover_a.jpg", ""),
+    ],
+)
+def test_get_src_numbers_suffix(src: str, expected_suffix: str):
+    downloader = Mangatown(DownloaderConfig())
+    assert downloader.get_src_numbers_suffix(src) == expected_suffix
 
 
 @pytest.mark.parametrize(
@@ -53,7 +61,7 @@ def test_get_src_numbers_suffix():
     ],
 )
 def test_extrapolate_image_url(base_url: str, page_index: int, padding: int, expected_url: str):
-    downloader = Mangatown(base_url)
+    downloader = Mangatown(DownloaderConfig(url=base_url))
     new_url = downloader.extrapolate_image_url(base_url, page_index, padding)
     assert expected_url == new_url
 
@@ -168,3 +176,19 @@ def test_extrapolate_image_url(base_url: str, page_index: int, padding: int, exp
     "https://zjcdn.mangahere.org/store/manga/32/001-004.0/compressed/fma01cover_c.jpg",
     "https://zjcdn.mangahere.org/store/manga/32/001-004.0/compressed/fma_omake01_02.jpg",
 }
+
+
+@pytest.mark.parametrize(
+    "first_src, page_index, expected_src",
+    [
+        pytest.param(
+            "https://zjcdn.mangahere.org/store/manga/32/001-003.0/compressed/fma_03_01.jpg",
+            13,
+            "https://zjcdn.mangahere.org/store/manga/32/001-003.0/compressed/fma_03_14.jpg",
+        ),
+        pytest.param("https://zjcdn.mangahere.org/store/manga/32/001-004.0/compressed/fma01cover_a.jpg", 1, None),
+    ],
+)
+def test_predictions_fall_back_on_the_page_number_suffix(first_src: str, page_index: int, expected_src: str | None):
+    downloader = Mangatown(DownloaderConfig())
+    assert downloader.predict_image_src(first_src, page_index) == expected_src
@@ -0,0 +1,80 @@
+# Standard Library
+import asyncio
+import io
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import IO
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader import ConcurrencyConfig
+from mangadanga.downloader.archive import ArchiveWriter
+from mangadanga.downloader.config import ArchiveConfig
+from mangadanga.downloader.events import EventManager
+
+IMAGE_SIZE = 256 * 1024
+
+
+def download_chapter_peak_memory(path: Path, pages: int) -> int:
+    async def run() -> None:
+        async with StandInServer(chapters=1, pages=pages, image_size=IMAGE_SIZE) as server:
+            config = server.config(
+                path=str(path),
+                concurrency=ConcurrencyConfig(images=2),
+                archive=ArchiveConfig(chunk_size=16 * 1024, spool_max_size=64 * 1024),
+            )
+            await StandInDownloader(config, EventManager()).download()
+
+    tracemalloc.start()
+    try:
+        asyncio.run(run())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def test_images_are_streamed_into_the_archive(tmp_path: Path):
+    async def run() -> StandInServer:
+        async with StandInServer(chapters=1, pages=5, image_size=100_000) as server:
+            config = server.config(path=str(tmp_path), archive=ArchiveConfig(spool_max_size=1024))
+            await StandInDownloader(config, EventManager()).download()
+            return server
+
+    server = asyncio.run(run())
+    with ZipFile(tmp_path / "Stand-in" / "1_Chapter_1.zip") as zipf:
+        assert sorted(zipf.namelist()) == [f"{index:04}.jpg" for index in range(5)]
+        assert zipf.read("0003.jpg") == server.image_body("1-3.jpg")
+
+
+def test_memory_per_chapter_does_not_grow_with_chapter_size(tmp_path: Path):
+    short_chapter_peak = download_chapter_peak_memory(tmp_path / "short", pages=8)
+    long_chapter_peak = download_chapter_peak_memory(tmp_path / "long", pages=64)
+    assert long_chapter_peak < 64 * IMAGE_SIZE / 4
+    assert long_chapter_peak < short_chapter_peak * 2
+
+
+def test_archive_writer_runs_off_the_event_loop(tmp_path: Path):
+    path = str(tmp_path / "chapter.zip")
+    writer_threads: set[str] = set()
+
+    async def run() -> None:
+        async with ArchiveWriter(path) as writer:
+            original_write_entry = writer.write_entry
+
+            def write_entry(name: str, file: IO[bytes]) -> None:
+                writer_threads.add(threading.current_thread().name)
+                original_write_entry(name, file)
+
+            writer.write_entry = write_entry  # type: ignore[method-assign]
+            for name in ("0001.jpg", "0000.webp", "ComicInfo.xml"):
+                await writer.write(name, io.BytesIO(b"a" * 1000))
+
+    asyncio.run(run())
+    assert threading.current_thread().name not in writer_threads
+    with ZipFile(path) as zipf:
+        assert zipf.namelist() == ["0001.jpg", "0000.webp", "ComicInfo.xml"]
+        compress_types = [info.compress_type for info in zipf.infolist()]
+        assert compress_types == [ZIP_STORED, ZIP_STORED, ZIP_DEFLATED]
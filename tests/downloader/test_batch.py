@@ -0,0 +1,76 @@
+# Standard Library
+import asyncio
+from pathlib import Path
+from typing import Any
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader import Batch, BatchReport, ConcurrencyConfig, DownloaderConfig
+from mangadanga.downloader.concurrency import FairSemaphore
+from mangadanga.downloader.events import EventManager
+
+
+def test_fair_semaphore_serves_flows_in_turn():
+    async def run() -> list[str]:
+        semaphore = FairSemaphore(1)
+        granted: list[str] = []
+
+        async def worker(flow: str) -> None:
+            async with semaphore.slot(flow):
+                granted.append(flow)
+                await asyncio.sleep(0)
+
+        await semaphore.acquire()
+        tasks = [asyncio.ensure_future(worker("long")) for _ in range(6)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.ensure_future(worker("short")) for _ in range(2)]
+        await asyncio.sleep(0)
+        semaphore.release()
+        await asyncio.gather(*tasks)
+        return granted
+
+    assert asyncio.run(run()) == ["long", "short", "long", "short", "long", "long", "long", "long"]
+
+
+def test_fair_semaphore_skips_cancelled_waiters():
+    async def run() -> int:
+        semaphore = FairSemaphore(1)
+        await semaphore.acquire()
+        cancelled = asyncio.ensure_future(semaphore.acquire("a"))
+        waiting = asyncio.ensure_future(semaphore.acquire("b"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        semaphore.release()
+        await waiting
+        return semaphore.value
+
+    assert asyncio.run(run()) == 0
+
+
+class LateBatch(Batch):
+    """Starts the series after the first one once the first one fills its queues"""
+
+    async def download_series(self, config: DownloaderConfig, *args: Any) -> None:
+        if config is not self.series_configs[0]:
+            await asyncio.sleep(0.2)
+        await super().download_series(config, *args)
+
+
+def test_slow_site_does_not_idle_the_other_series(tmp_path: Path):
+    async def run() -> tuple[BatchReport, StandInServer, StandInServer]:
+        async with (
+            StandInServer(chapters=1, pages=24, latency=0.05, title="Slow") as slow,
+            StandInServer(chapters=1, pages=24, title="Fast") as fast,
+        ):
+            # Both stand-ins listen on 127.0.0.1: the host cap applies to each port
+            concurrency = ConcurrencyConfig(images=4, per_host=2)
+            config = slow.config(path=str(tmp_path), threads=2, concurrency=concurrency)
+            series_configs = [config, fast.config(path=str(tmp_path))]
+            batch = LateBatch(config, series_configs, event_manager=EventManager(), downloaders={StandInDownloader})
+            return await batch.run(), slow, fast
+
+    report, slow, fast = asyncio.run(run())
+    assert sorted(series.title for series in report.series) == ["Fast", "Slow"]
+    assert fast.times[-1] - fast.times[0] < 0.1
+    assert fast.times[-1] < slow.times[-1] - 0.1
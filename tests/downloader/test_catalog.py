@@ -0,0 +1,115 @@
+# Standard Library
+import asyncio
+import hashlib
+from pathlib import Path
+
+# Dependencies
+import pytest
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader import ArchiveConfig, Catalog, ChapterIndex, SeriesSummary
+from mangadanga.downloader.catalog import CATALOG_NAME
+from mangadanga.downloader.events import EventManager
+from mangadanga.downloader.models import ImageRecord
+
+CHAPTERS = 3
+PAGES = 4
+
+
+def download(path: Path, **kwargs) -> str:
+    async def run() -> str:
+        async with StandInServer(chapters=CHAPTERS, pages=PAGES) as server:
+            await StandInDownloader(server.config(path=str(path), **kwargs), EventManager()).download()
+            return server.url()
+
+    return asyncio.run(run())
+
+
+def read_catalog(path: Path, url: str) -> tuple[dict[ChapterIndex, str], list[SeriesSummary]]:
+    async def run() -> tuple[dict[ChapterIndex, str], list[SeriesSummary]]:
+        catalog = Catalog(str(path / CATALOG_NAME))
+        await catalog.open()
+        try:
+            return await catalog.completed_chapters(url), await catalog.summary()
+        finally:
+            await catalog.close()
+
+    return asyncio.run(run())
+
+
+def test_finished_chapters_are_cataloged(tmp_path: Path):
+    url = download(tmp_path)
+    chapters, summary = read_catalog(tmp_path, url)
+    series_path = tmp_path / "Stand-in"
+    assert chapters == {
+        str(chapter): str(series_path / f"{chapter}_Chapter_{chapter}.zip") for chapter in range(1, CHAPTERS + 1)
+    }
+    assert all(isinstance(chapter, ChapterIndex) for chapter in chapters)
+    archives = [Path(path) for path in chapters.values()]
+    assert summary == [
+        SeriesSummary(
+            url=url,
+            title="Stand-in",
+            chapters=CHAPTERS,
+            images=CHAPTERS * PAGES,
+            size=sum(archive.stat().st_size for archive in archives),
+        )
+    ]
+
+
+def test_archive_hashes_are_recorded(tmp_path: Path):
+    url = download(tmp_path)
+    catalog = Catalog(str(tmp_path / CATALOG_NAME))
+    catalog.connect()
+    connection = catalog.get_connection()
+    try:
+        rows = connection.execute("SELECT path, sha256 FROM chapters").fetchall()
+        [(indexed,)] = connection.execute(
+            "SELECT COUNT(*) FROM images JOIN chapters ON chapters.id = images.chapter_id "
+            "WHERE images.url LIKE ? AND chapters.chapter = '2'",
+            (f"{url.rstrip('/')}/image/2-%",),
+        ).fetchall()
+    finally:
+        connection.close()
+    assert {sha256 for _, sha256 in rows} == {hashlib.sha256(Path(path).read_bytes()).hexdigest() for path, _ in rows}
+    assert indexed == PAGES
+
+
+def test_folder_chapters_are_hashed_by_their_images(tmp_path: Path):
+    url = download(tmp_path, archive=ArchiveConfig(format="folder"))
+    chapters, [series] = read_catalog(tmp_path, url)
+    assert chapters["1"] == str(tmp_path / "Stand-in" / "1_Chapter_1")
+    assert series.size == sum(
+        image.stat().st_size for chapter in chapters.values() for image in Path(chapter).iterdir()
+    )
+
+
+def test_a_chapter_downloaded_again_replaces_its_images(tmp_path: Path):
+    catalog = Catalog(str(tmp_path / CATALOG_NAME))
+    (tmp_path / "1_Chapter").mkdir()
+    catalog.connect()
+    try:
+        series_id = catalog.upsert_series("https://example.com/series", "Series", str(tmp_path))
+        for pages in (3, 2):
+            images = {f"{index:04}.jpg": ImageRecord(size=10, sha256=f"{index:064}") for index in range(pages)}
+            catalog.add_chapter(series_id, "1", "https://example.com/1", str(tmp_path / "1_Chapter"), images)
+        assert catalog.upsert_series("https://example.com/series", "Series", str(tmp_path)) == series_id
+        [series] = catalog.get_summary()
+    finally:
+        catalog.get_connection().close()
+    assert (series.chapters, series.images, series.size) == (1, 2, 20)
+
+
+def test_relative_download_paths_are_cataloged_absolute(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.chdir(tmp_path)
+    url = download(Path("library"))
+    chapters, _ = read_catalog(tmp_path / "library", url)
+    assert chapters["1"] == str(tmp_path / "library" / "Stand-in" / "1_Chapter_1.zip")
+    catalog = Catalog(str(tmp_path / "library" / CATALOG_NAME))
+    catalog.connect()
+    try:
+        [(directory,)] = catalog.get_connection().execute("SELECT directory FROM series").fetchall()
+    finally:
+        catalog.get_connection().close()
+    assert directory == str(tmp_path / "library" / "Stand-in")
@@ -0,0 +1,55 @@
+# Dependencies
+import pytest
+
+# From apps
+from mangadanga.downloader import (
+    ChapterIndex,
+    ChapterRangeSelection,
+    ChapterSelection,
+    DownloaderException,
+    chapters_selection_factory,
+)
+from mangadanga.downloader.config import ChapterStrategyConfig
+
+SERIES = {chapter: f"https://example.com/{chapter}" for chapter in ["12", "extra", "10.5", "2", "10", "1", "11"]}
+
+
+def test_chapter_index_sorts_numerically():
+    chapters = sorted(ChapterIndex(chapter) for chapter in SERIES)
+    assert chapters == ["1", "2", "10", "10.5", "11", "12", "extra"]
+    assert ChapterIndex("10.5").number == 10.5
+    assert ChapterIndex("extra").number is None
+    assert ChapterIndex("9") < "10"
+
+
+def test_selection_returns_chapters_in_numeric_order():
+    selection = chapters_selection_factory(ChapterStrategyConfig())
+    assert list(selection.select(SERIES)) == ["1", "2", "10", "10.5", "11", "12", "extra"]
+
+
+def test_ranges_chapters_and_latest_are_combined():
+    selection = ChapterSelection(
+        chapters=["extra", "2.0"], ranges=[("10", "10.5"), ("1", "1"), ("10.2", "10.7")], latest=1
+    )
+    assert list(selection.select(SERIES)) == ["1", "2", "10", "10.5", "12", "extra"]
+    assert selection.starts == [1.0, 10.0]
+    assert selection.ends == [1.0, 10.7]
+
+
+def test_latest_chapters_skip_unnumbered_extras():
+    selection = chapters_selection_factory(ChapterStrategyConfig(strategy="latest", config={"count": 2}))
+    assert list(selection.select(SERIES)) == ["11", "12"]
+
+
+def test_latest_chapters_beyond_the_series_select_all_of_it():
+    selection = chapters_selection_factory(ChapterStrategyConfig(strategy="latest", config={"count": 10}))
+    assert list(selection.select(SERIES)) == ["1", "2", "10", "10.5", "11", "12"]
+
+
+def test_range_selection_keeps_its_checks():
+    assert ChapterRangeSelection("2", "10").chapter_in_selection(ChapterIndex("10"))
+    assert not ChapterRangeSelection("2", "10").chapter_in_selection(ChapterIndex("10.5"))
+    with pytest.raises(DownloaderException):
+        ChapterRangeSelection("10", "2")
+    with pytest.raises(DownloaderException):
+        ChapterRangeSelection("extra", "2")
@@ -0,0 +1,43 @@
+# Standard Library
+import asyncio
+from pathlib import Path
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader import ConcurrencyConfig, Scheduler
+from mangadanga.downloader.events import EventManager
+
+
+def test_scheduler_caps_requests_per_host():
+    scheduler = Scheduler(images=10, per_host=2)
+    in_flight: dict[str, int] = {"a": 0, "b": 0}
+    peaks: dict[str, int] = {"a": 0, "b": 0}
+
+    async def request(host: str) -> None:
+        async with scheduler.image_slot(f"http://{host}/image.jpg"):
+            in_flight[host] += 1
+            peaks[host] = max(peaks[host], in_flight[host])
+            await asyncio.sleep(0.01)
+            in_flight[host] -= 1
+
+    async def run() -> None:
+        await asyncio.gather(*(request(host) for host in ("a", "b") * 10))
+
+    asyncio.run(run())
+    assert peaks == {"a": 2, "b": 2}
+
+
+def test_in_flight_requests_do_not_depend_on_chapter_size(tmp_path: Path):
+    async def run() -> StandInServer:
+        async with StandInServer(chapters=4, pages=30, latency=0.005) as server:
+            config = server.config(
+                path=str(tmp_path),
+                threads=4,
+                concurrency=ConcurrencyConfig(images=5, pages=2, per_host=100),
+            )
+            await StandInDownloader(config, EventManager()).download()
+            return server
+
+    server = asyncio.run(run())
+    assert server.requests == 1 + 4 + 4 * 30
+    assert server.max_in_flight <= 5 + 2
@@ -0,0 +1,129 @@
+# Standard Library
+import asyncio
+from pathlib import Path
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from benchmarks.site import FakeMangaSite
+from mangadanga.downloader.concurrency import Scheduler
+from mangadanga.downloader.config import ConcurrencyConfig, RetryConfig
+from mangadanga.downloader.control import DownloadControl
+from mangadanga.downloader.events import EventManager
+
+FAST_RETRIES = RetryConfig(max_attempts=1)
+# One image at a time, so a cancelled chapter is left half downloaded
+ONE_IMAGE = ConcurrencyConfig(images=1)
+PAGES = 10
+
+
+async def wait_for_requests(server: StandInServer, requests: int) -> None:
+    while server.requests < requests:
+        await asyncio.sleep(0.005)
+
+
+def test_paused_download_starts_no_request_until_resumed(tmp_path: Path):
+    async def run() -> None:
+        async with StandInServer(chapters=2, pages=PAGES, latency=0.01) as server:
+            control = DownloadControl()
+            config = server.config(path=str(tmp_path), threads=2, retry=FAST_RETRIES)
+            download = asyncio.create_task(StandInDownloader(config, EventManager(), control=control).download())
+            await wait_for_requests(server, 6)
+            control.pause()
+            # Requests in flight finish, no other one starts
+            await asyncio.sleep(0.05)
+            requests = server.requests
+            await asyncio.sleep(0.1)
+            assert server.requests == requests and not download.done()
+            control.resume()
+            report = await download
+            assert report.completed == ["1", "2"]
+            assert server.requests == 3 + 2 * PAGES
+
+    asyncio.run(run())
+
+
+def test_cancelled_download_keeps_its_partial_archives_for_the_next_run(tmp_path: Path):
+    async def run() -> None:
+        async with StandInServer(chapters=1, pages=PAGES, latency=0.01) as server:
+            control = DownloadControl()
+            config = server.config(path=str(tmp_path), concurrency=ONE_IMAGE, retry=FAST_RETRIES)
+            download = asyncio.create_task(StandInDownloader(config, EventManager(), control=control).download())
+            await wait_for_requests(server, 6)
+            control.cancel()
+            report = await download
+            assert report.cancelled and report.error is not None
+            assert report.completed == []
+            assert (tmp_path / "Stand-in" / "1_Chapter_1.zip.part").exists()
+            downloaded = len([path for path in server.paths if path.startswith("/image/")])
+
+        async with StandInServer(chapters=1, pages=PAGES) as server:
+            config = server.config(path=str(tmp_path), threads=1, retry=FAST_RETRIES)
+            report = await StandInDownloader(config, EventManager()).download()
+            assert report.completed == ["1"]
+            assert len([path for path in server.paths if path.startswith("/image/")]) < PAGES
+            assert len([path for path in server.paths if path.startswith("/image/")]) >= PAGES - downloaded
+
+    asyncio.run(run())
+
+
+def test_cancelled_control_stops_downloads_before_they_start(tmp_path: Path):
+    async def run() -> None:
+        async with StandInServer(chapters=1, pages=PAGES) as server:
+            control = DownloadControl()
+            control.cancel()
+            config = server.config(path=str(tmp_path), retry=FAST_RETRIES)
+            report = await StandInDownloader(config, EventManager(), control=control).download()
+            assert report.cancelled
+            assert server.requests == 0
+
+    asyncio.run(run())
+
+
+def test_paused_download_gives_its_chapter_slot_to_the_other_jobs(tmp_path: Path):
+    async def run() -> None:
+        servers = [StandInServer(chapters=2, pages=PAGES, latency=0.01, title=title) for title in ("A", "B")]
+        async with servers[0] as paused_server, servers[1] as other_server:
+            # One chapter at a time for both jobs
+            scheduler = Scheduler(chapters=1)
+            paused_control = DownloadControl()
+            paused_config = paused_server.config(path=str(tmp_path), retry=FAST_RETRIES)
+            paused_download = asyncio.create_task(
+                StandInDownloader(
+                    paused_config, EventManager(), scheduler=scheduler, control=paused_control
+                ).download()
+            )
+            await wait_for_requests(paused_server, 6)
+            paused_control.pause()
+            other_config = other_server.config(path=str(tmp_path), retry=FAST_RETRIES)
+            other_download = StandInDownloader(other_config, EventManager(), scheduler=scheduler).download()
+            report = await asyncio.wait_for(other_download, 5)
+            assert report.completed == ["1", "2"]
+            assert not paused_download.done()
+            paused_control.resume()
+            report = await paused_download
+            assert report.completed == ["1", "2"]
+            assert scheduler.chapters.value == 1
+
+    asyncio.run(run())
+
+
+def test_requests_waiting_for_a_slot_stay_queued_while_paused(tmp_path: Path):
+    async def run() -> None:
+        # Every page of the chapter is checked at once, behind a single image slot
+        async with FakeMangaSite("mangadoom", chapters=1, pages=40, latency=0.01) as site:
+            control = DownloadControl()
+            config = site.config(
+                path=str(tmp_path), concurrency=ConcurrencyConfig(images=1, pages=1), retry=FAST_RETRIES
+            )
+            download = asyncio.create_task(site.driver()(config, EventManager(), control=control).download())
+            await wait_for_requests(site, 6)
+            control.pause()
+            await asyncio.sleep(0.05)
+            requests = site.requests
+            await asyncio.sleep(0.3)
+            assert site.requests == requests
+            control.resume()
+            report = await download
+            assert report.completed == ["1"]
+
+    asyncio.run(run())
@@ -0,0 +1,109 @@
+# Standard Library
+from pathlib import Path
+
+# Dependencies
+import pytest
+
+# From apps
+from mangadanga.downloader import Asurascans, DownloaderConfig, Mangadoom, Manganato, Mangatown
+from mangadanga.downloader.base import Downloader
+from mangadanga.downloader.config import ParserConfig
+from mangadanga.downloader.parsing import LXML_AVAILABLE, PageKind
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+PARSERS = [
+    pytest.param(ParserConfig(backend="html.parser", partial=False), id="html.parser"),
+    pytest.param(ParserConfig(backend="html.parser"), id="html.parser-partial"),
+    pytest.param(
+        ParserConfig(backend="lxml"),
+        id="lxml-partial",
+        marks=pytest.mark.skipif(not LXML_AVAILABLE, reason="lxml is not installed"),
+    ),
+]
+
+
+def parse_fixture(downloader: Downloader, driver: str, page: PageKind):
+    html_doc = (FIXTURES / driver / f"{page}.html").read_text()
+    return downloader.html_parser.parse(html_doc, page)
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize(
+    "driver_class, title, first_url",
+    [
+        (Manganato, "Fullmetal Alchemist", "https://chapmanganato.com/manga-aa951409/chapter-1"),
+        (Mangatown, "Fullmetal Alchemist", "https://www.mangatown.com//manga/fullmetal_alchemist/c001/"),
+        (Mangadoom, "Fullmetal Alchemist", "https://www.mngdoom.com/fullmetal-alchemist/1"),
+        (Asurascans, "Solo Leveling", "https://asura.gg/2226495089-solo-leveling-chapter-1/"),
+    ],
+)
+def test_series_page(driver_class: type[Downloader], title: str, first_url: str, parser: ParserConfig):
+    downloader = driver_class(DownloaderConfig(parser=parser))
+    data = parse_fixture(downloader, driver_class.__name__.lower(), "series")
+    assert downloader.get_title(data) == title
+    chapters = downloader.get_all_chapters_to_url(data)
+    assert list(chapters) == [str(i) for i in range(1, 121)]
+    assert chapters["1"] == first_url
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize(
+    "driver_class, chapter_filename, last_src",
+    [
+        (
+            Manganato,
+            "1_FULLMETAL_ALCHEMIST_CHAPTER_1:_THE_TWO_ALCHEMISTS.zip",
+            "https://v3.mkklcdnv6tempv5.com/img/tab_3/00/00/01/aa951409/chapter_1/16-o.jpg",
+        ),
+        (Asurascans, "1_Solo_Leveling_Chapter_1.zip", "https://www.asurascans.com/wp-content/uploads/2021/01/16.jpg"),
+    ],
+)
+def test_single_page_chapter(
+    driver_class: type[Downloader], chapter_filename: str, last_src: str, parser: ParserConfig
+):
+    downloader = driver_class(DownloaderConfig(parser=parser))
+    data = parse_fixture(downloader, driver_class.__name__.lower(), "chapter")
+    assert downloader.get_chapter_filename(1, data) == chapter_filename
+    images_src = downloader.get_images_src_from_page(data)  # type: ignore[attr-defined]
+    assert len(images_src) == 16
+    assert images_src[-1] == last_src
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize(
+    "driver_class, chapter_filename, second_page_url, page_src",
+    [
+        (
+            Mangatown,
+            "1_Fullmetal_Alchemist_1.zip",
+            "https://www.mangatown.com//manga/fullmetal_alchemist/c001/2.html",
+            "https://zjcdn.mangahere.org/store/manga/32/001-001.0/compressed/fma_01_05.jpg",
+        ),
+        (
+            Mangadoom,
+            "1_Fullmetal_Alchemist_1.zip",
+            "https://www.mngdoom.com/fullmetal-alchemist/1/2",
+            "https://www.mngdoom.com/uploads/manga/fullmetal-alchemist/1/005.jpg",
+        ),
+    ],
+)
+def test_paged_chapter(
+    driver_class: type[Downloader], chapter_filename: str, second_page_url: str, page_src: str, parser: ParserConfig
+):
+    downloader = driver_class(DownloaderConfig(parser=parser))
+    driver = driver_class.__name__.lower()
+    data = parse_fixture(downloader, driver, "chapter")
+    assert downloader.get_chapter_filename(1, data) == chapter_filename
+    pages_urls = downloader.get_pages_urls(data)  # type: ignore[attr-defined]
+    assert len(pages_urls) == 16
+    assert pages_urls[1] == second_page_url
+    page_data = parse_fixture(downloader, driver, "page")
+    assert downloader.get_page_image_src(page_data) == page_src  # type: ignore[attr-defined]
+
+
+def test_partial_parse_keeps_only_what_the_driver_reads():
+    downloader = Manganato(DownloaderConfig(parser=ParserConfig(backend="html.parser")))
+    data = parse_fixture(downloader, "manganato", "series")
+    assert data.find(class_="sidebar") is None
+    assert data.find("script") is None
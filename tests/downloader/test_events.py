@@ -0,0 +1,100 @@
+# Standard Library
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader.events import (
+    EventManager,
+    OnChapterDownloadFinished,
+    OnDownloadFinished,
+    OnImageDownloaded,
+    OnMangaInfoUpdate,
+)
+
+
+def test_progress_is_delivered_as_one_snapshot_per_tick():
+    event_manager = EventManager()
+    snapshots = []
+    OnImageDownloaded(event_manager).subscribe(lambda images, size: snapshots.append((images, size)))
+
+    def emit() -> None:
+        for _ in range(1000):
+            OnImageDownloaded(event_manager).emit(1, 10)
+
+    threads = [threading.Thread(target=emit) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    event_manager.process_queue()
+    event_manager.process_queue()
+    assert snapshots == [(4000, 40000)]
+
+
+def test_discrete_events_wait_for_the_next_tick_once_the_budget_is_spent():
+    event_manager = EventManager()
+    received = []
+
+    def slow_listener(index: int) -> None:
+        time.sleep(0.01)
+        received.append(index)
+
+    OnMangaInfoUpdate(event_manager).subscribe(slow_listener)
+    for index in range(10):
+        OnMangaInfoUpdate(event_manager).emit(index)
+    event_manager.process_queue(budget=0.015)
+    assert 0 < len(received) < 10
+    event_manager.process_queue()
+    assert received == list(range(10))
+
+
+def test_events_nobody_listens_to_are_dropped():
+    event_manager = EventManager()
+    OnChapterDownloadFinished(event_manager).emit()
+    OnDownloadFinished(event_manager).emit("success", "")
+    assert not event_manager.progress
+    assert event_manager.events_queue.empty()
+    assert event_manager.dropped == 2
+
+
+def test_a_full_queue_drops_the_newest_events():
+    event_manager = EventManager(max_queued_events=10)
+    finished = []
+    OnDownloadFinished(event_manager).subscribe(lambda status, message: finished.append(status))
+    for _ in range(15):
+        OnDownloadFinished(event_manager).emit("success", "")
+    event_manager.process_queue()
+    assert len(finished) == 10
+    assert event_manager.dropped == 5
+
+
+def test_headless_downloads_leave_nothing_queued(tmp_path: Path):
+    event_manager = EventManager()
+
+    async def run() -> None:
+        async with StandInServer(chapters=3, pages=5) as server:
+            await StandInDownloader(server.config(path=str(tmp_path), threads=3), event_manager).download()
+
+    asyncio.run(run())
+    assert event_manager.events_queue.empty()
+    assert not event_manager.progress
+    assert event_manager.dropped > 0
+
+
+def test_download_progress_reaches_the_listeners(tmp_path: Path):
+    event_manager = EventManager()
+    chapters, images = [], []
+    OnChapterDownloadFinished(event_manager).subscribe(chapters.append)
+    OnImageDownloaded(event_manager).subscribe(lambda count, size: images.append((count, size)))
+
+    async def run() -> None:
+        async with StandInServer(chapters=3, pages=5, image_size=100) as server:
+            await StandInDownloader(server.config(path=str(tmp_path), threads=3), event_manager).download()
+
+    asyncio.run(run())
+    event_manager.process_queue()
+    assert chapters == [3]
+    assert images == [(15, 1500)]
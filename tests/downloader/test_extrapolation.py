@@ -0,0 +1,59 @@
+# Dependencies
+import pytest
+
+# From apps
+from mangadanga.downloader.extrapolation import UrlExtrapolator
+
+BASE = "https://zjcdn.mangahere.org/store/manga/32"
+
+
+@pytest.mark.parametrize(
+    "first_src, second_src, expected_src",
+    [
+        pytest.param(
+            f"{BASE}/001-003.0/compressed/fma_03_01.jpg",
+            f"{BASE}/001-003.0/compressed/fma_03_02.jpg",
+            f"{BASE}/001-003.0/compressed/fma_03_14.jpg",
+            id="file-name",
+        ),
+        pytest.param(
+            f"{BASE}/001-003.0/compressed/fma_03_01.jpg",
+            f"{BASE}/002-003.0/compressed/fma_03_02.jpg",
+            f"{BASE}/014-003.0/compressed/fma_03_14.jpg",
+            id="folder-and-file-name",
+        ),
+        pytest.param(
+            "https://cdn.example.com/series/9/page_98.webp?v=2",
+            "https://cdn.example.com/series/9/page_100.webp?v=2",
+            "https://cdn.example.com/series/9/page_124.webp?v=2",
+            id="step-and-growing-width",
+        ),
+    ],
+)
+def test_learned_pattern_predicts_pages(first_src: str, second_src: str, expected_src: str):
+    extrapolator = UrlExtrapolator()
+    assert extrapolator.learn(first_src, second_src)
+    assert extrapolator.predict(first_src, 13) == expected_src
+
+
+def test_pattern_is_reused_for_other_chapters():
+    extrapolator = UrlExtrapolator()
+    extrapolator.learn(f"{BASE}/001-003.0/compressed/fma_03_01.jpg", f"{BASE}/001-003.0/compressed/fma_03_02.jpg")
+    first_src = f"{BASE}/001-004.0/compressed/fma_04_01.jpg"
+    assert extrapolator.predict(first_src, 39) == f"{BASE}/001-004.0/compressed/fma_04_40.jpg"
+    assert extrapolator.predict("https://other.example.com/1.jpg", 1) is None
+
+
+def test_unrelated_urls_are_not_learned():
+    extrapolator = UrlExtrapolator()
+    assert not extrapolator.learn(f"{BASE}/fma_04_39.jpg", f"{BASE}/fma_omake01_01.jpg")
+    assert not extrapolator.learn(f"{BASE}/fma01cover_a.jpg", f"{BASE}/fma01cover_b.jpg")
+    assert not extrapolator.knows_pattern
+
+
+def test_default_pattern_uses_the_last_number_of_the_file_name():
+    extrapolator = UrlExtrapolator()
+    extrapolator.learn_default(f"{BASE}/001-003.0/compressed/fma_03_01.jpg")
+    assert extrapolator.predict(f"{BASE}/001-003.0/compressed/fma_03_01.jpg", 2) == (
+        f"{BASE}/001-003.0/compressed/fma_03_03.jpg"
+    )
@@ -0,0 +1,26 @@
+# Standard Library
+import subprocess
+import sys
+
+# Dependencies
+import pytest
+
+# From apps
+from benchmarks.import_time import ENTRY_POINTS, get_forbidden, measure_imports
+
+
+@pytest.mark.parametrize("module", ENTRY_POINTS.values())
+def test_headless_entry_points_do_not_import_the_gui_or_the_drivers(module: str):
+    assert get_forbidden(measure_imports(module)) == []
+
+
+def test_cli_runs_without_tk():
+    # A None entry in sys.modules makes any import of tkinter fail, as on a Python built without Tk
+    code = (
+        "import sys; sys.modules['tkinter'] = None; "
+        "from mangadanga.main_cli import get_config; from mangadanga.gui.events import OnStartDownload; "
+        "from mangadanga.downloader import downloader_factory; "
+        "print(type(downloader_factory(get_config(['https://manganato.com/manga-a']))).__name__)"
+    )
+    process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert process.stdout.strip() == "Manganato"
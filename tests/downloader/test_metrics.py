@@ -0,0 +1,73 @@
+# Standard Library
+import asyncio
+import json
+from pathlib import Path
+
+# Dependencies
+import pytest
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader.config import MetricsConfig, RetryConfig
+from mangadanga.downloader.events import EventManager
+from mangadanga.downloader.metrics import METRICS_NAME, Histogram, Metrics
+
+FAST_RETRIES = RetryConfig(base_delay=0.01, max_delay=0.05, failure_threshold=100)
+
+
+def test_histogram_quantiles_stay_within_the_observed_values():
+    histogram = Histogram(buckets=(0.1, 1.0, 10.0))
+    for value in [0.05] * 50 + [0.5] * 45 + [5.0] * 5:
+        histogram.observe(value)
+    assert histogram.counts == [50, 45, 5, 0]
+    assert histogram.quantile(0.5) == pytest.approx(0.1)
+    assert 0.1 < histogram.quantile(0.95) <= 1.0
+    assert histogram.quantile(1.0) == 5.0
+    assert histogram.summary()["mean"] == pytest.approx((50 * 0.05 + 45 * 0.5 + 5 * 5.0) / 100)
+
+
+def test_prometheus_text_has_labelled_counters_and_cumulative_buckets():
+    metrics = Metrics(MetricsConfig())
+    metrics.inc("requests_total", host="a.com")
+    metrics.inc("requests_total", 2, host="b.com")
+    metrics.observe("request_seconds", 0.02, host="a.com")
+    metrics.set_max("queue_peak", 3, stage="images")
+    metrics.set_max("queue_peak", 1, stage="images")
+    text = metrics.to_prometheus()
+    assert "# TYPE mangadanga_requests_total counter" in text
+    assert 'mangadanga_requests_total{host="b.com"} 2' in text
+    assert 'mangadanga_queue_peak{stage="images"} 3' in text
+    assert 'mangadanga_request_seconds_bucket{host="a.com",le="0.01"} 0' in text
+    assert 'mangadanga_request_seconds_bucket{host="a.com",le="+Inf"} 1' in text
+    assert 'mangadanga_request_seconds_count{host="a.com"} 1' in text
+    assert metrics.get_counter("requests_total") == 3
+
+
+def test_download_writes_a_summary_and_a_prometheus_file(tmp_path: Path):
+    prometheus_path = tmp_path / "metrics" / "mangadanga.prom"
+
+    async def run() -> str:
+        async with StandInServer(chapters=2, pages=5, image_size=1000, throttled=1, errors=1) as server:
+            config = server.config(
+                path=str(tmp_path),
+                retry=FAST_RETRIES,
+                metrics=MetricsConfig(prometheus_path=str(prometheus_path), interval=0.01),
+            )
+            await StandInDownloader(config, EventManager()).download()
+            return server.url().split("/")[2]
+
+    host = asyncio.run(run())
+    summary = json.loads((tmp_path / METRICS_NAME).read_text())
+    assert summary["images"] == 10
+    assert summary["bytes"] == 10 * 1000
+    assert summary["images_per_second"] > 0
+    assert summary["chapters"]["completed"] == 2 and summary["chapters"]["seconds"]["count"] == 2
+    assert summary["retries"] == 1
+    assert summary["hosts"][host]["throttled"] == 1
+    assert summary["hosts"][host]["errors"] == 1
+    # Series page, two chapter pages and the images, plus the throttled and the failed request
+    assert summary["hosts"][host]["requests"] == 1 + 2 + 10 + 2
+    assert set(summary["queues"]) == {"chapters", "resolve", "images", "archive"}
+    text = prometheus_path.read_text()
+    assert "mangadanga_images_total 10" in text
+    assert f'mangadanga_retries_total{{host="{host}"}} 1' in text
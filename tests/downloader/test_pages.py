@@ -0,0 +1,130 @@
+# Standard Library
+import asyncio
+
+# Dependencies
+import pytest
+from bs4 import BeautifulSoup
+
+# From apps
+from mangadanga.downloader import ConcurrencyConfig, DownloaderConfig, Mangadoom, Mangatown
+from mangadanga.downloader.base import Downloader
+from mangadanga.downloader.parsing import PageKind
+
+PAGES = 12
+
+MANGATOWN_CHAPTER = (
+    '<select class="page_select">'
+    + '<option value="manga/fma/c{chapter}/featured.html">Featured</option>'
+    + "".join(f'<option value="manga/fma/c{{chapter}}/{page}.html">{page}</option>' for page in range(PAGES))
+    + '</select><div class="read_img"><img src="//cdn.mangatown.com/fma/{chapter}/fma_{chapter}_00.jpg"></div>'
+)
+MANGATOWN_PAGE = (
+    '<div class="read_img"><img src="//cdn.mangatown.com/fma/{chapter}/fma_{chapter}_{page:02}.jpg"></div>'
+)
+MANGATOWN_SRC = "https://cdn.mangatown.com/fma/{chapter}/fma_{chapter}_{page:02}.jpg"
+MANGADOOM_CHAPTER = (
+    '<select class="selectPage pull-right chapter-page1">'
+    + "".join(
+        f'<option value="https://www.mngdoom.com/fma/{{chapter}}/{page}">{page}</option>' for page in range(PAGES)
+    )
+    + '</select><img class="img-responsive" src="https://cdn.mngdoom.com/fma/{chapter}/001.jpg">'
+)
+MANGADOOM_PAGE = '<img class="img-responsive" src="https://cdn.mngdoom.com/fma/{chapter}/{image:03}.jpg">'
+MANGADOOM_SRC = "https://cdn.mngdoom.com/fma/{chapter}/{image:03}.jpg"
+
+
+class FakeSiteMixin:
+    """Serves the chapter pages from memory, the later pages answering first"""
+
+    PAGE_TEMPLATE = ""
+    SRC_TEMPLATE = ""
+
+    def __init__(self, config: DownloaderConfig) -> None:
+        super().__init__(config)  # type: ignore[call-arg]
+        self.scrapped_pages = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.existing_images: set[str] = set()
+
+    async def scrape_url(self, url: str, page: PageKind | None = None) -> BeautifulSoup:
+        chapter, page = url.removesuffix(".html").rsplit("/", 2)[1:]
+        chapter, page = chapter.strip("c"), int(page)
+        async with self.scheduler.page_slot(url):  # type: ignore[attr-defined]
+            self.scrapped_pages += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.001 * (PAGES - page))
+            self.in_flight -= 1
+        return BeautifulSoup(self.PAGE_TEMPLATE.format(chapter=chapter, page=page, image=page + 1), "html.parser")
+
+    async def url_exists(self, url: str) -> bool:
+        return url in self.existing_images
+
+    def get_expected_src(self, chapter: str) -> list[str]:
+        return [self.SRC_TEMPLATE.format(chapter=chapter, page=page, image=page + 1) for page in range(PAGES)]
+
+
+class FakeMangatown(FakeSiteMixin, Mangatown):
+    PAGE_TEMPLATE = MANGATOWN_PAGE
+    SRC_TEMPLATE = MANGATOWN_SRC
+
+
+class FakeMangadoom(FakeSiteMixin, Mangadoom):
+    PAGE_TEMPLATE = MANGADOOM_PAGE
+    SRC_TEMPLATE = MANGADOOM_SRC
+
+
+DRIVERS = [
+    pytest.param(FakeMangatown, MANGATOWN_CHAPTER, id="mangatown"),
+    pytest.param(FakeMangadoom, MANGADOOM_CHAPTER, id="mangadoom"),
+]
+
+
+@pytest.mark.parametrize("downloader_cls, chapter_html", DRIVERS)
+def test_pages_are_scraped_concurrently_in_order(downloader_cls: type[FakeSiteMixin], chapter_html: str):
+    downloader = downloader_cls(DownloaderConfig(concurrency=ConcurrencyConfig(pages=4)))
+    assert isinstance(downloader, Downloader)
+    chapter_data = BeautifulSoup(chapter_html.format(chapter="01"), "html.parser")
+    pages_urls = downloader.get_pages_urls(chapter_data)  # type: ignore[attr-defined]
+
+    async def run() -> tuple[list[int], list[str]]:
+        pages = downloader.scrape_pages(pages_urls, downloader.get_page_image_src)  # type: ignore[attr-defined]
+        completion_order = [index async for index, _ in pages]
+        images_src = await downloader.get_images_src_exhaustive_search(chapter_data)  # type: ignore[attr-defined]
+        return completion_order, images_src
+
+    completion_order, images_src = asyncio.run(run())
+    assert images_src == downloader.get_expected_src("01")
+    assert sorted(completion_order) == list(range(PAGES))
+    assert completion_order != list(range(PAGES))
+    assert downloader.max_in_flight == 4
+
+
+@pytest.mark.parametrize("downloader_cls, chapter_html", DRIVERS)
+def test_predicted_urls_skip_page_scraping(downloader_cls: type[FakeSiteMixin], chapter_html: str):
+    downloader = downloader_cls(DownloaderConfig())
+    assert isinstance(downloader, Downloader)
+
+    async def get_images_src(chapter: str) -> list[str]:
+        chapter_data = BeautifulSoup(chapter_html.format(chapter=chapter), "html.parser")
+        return await downloader.get_images_src(chapter_data)
+
+    downloader.existing_images = set(downloader.get_expected_src("01") + downloader.get_expected_src("02"))
+    assert asyncio.run(get_images_src("01")) == downloader.get_expected_src("01")
+    assert downloader.scrapped_pages == 1
+    # The pattern learned from the first chapter is reused
+    assert asyncio.run(get_images_src("02")) == downloader.get_expected_src("02")
+    assert downloader.scrapped_pages == 1
+
+
+@pytest.mark.parametrize("downloader_cls, chapter_html", DRIVERS)
+def test_mispredicted_urls_fall_back_to_page_scraping(downloader_cls: type[FakeSiteMixin], chapter_html: str):
+    downloader = downloader_cls(DownloaderConfig())
+    assert isinstance(downloader, Downloader)
+    chapter_data = BeautifulSoup(chapter_html.format(chapter="01"), "html.parser")
+    expected_src = downloader.get_expected_src("01")
+    downloader.existing_images = set(expected_src[:-3])
+
+    assert asyncio.run(downloader.get_images_src(chapter_data)) == expected_src
+    assert downloader.scrapped_pages == 1 + 3
+    assert not downloader.url_extrapolator.knows_pattern
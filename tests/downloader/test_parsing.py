@@ -0,0 +1,69 @@
+# Standard Library
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+
+# Dependencies
+import pytest
+from bs4 import BeautifulSoup
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader import DownloaderConfig, EventManager
+
+LARGE_SERIES_PAGE = '<h1 class="title">Stand-in</h1><div class="chapter-list">{}</div>'.format(
+    "".join(f'<li><a href="https://example.com/chapter/{i}">{i}</a><span>date</span></li>' for i in range(10_000))
+)
+
+
+def test_parsing_does_not_block_the_event_loop():
+    downloader = StandInDownloader(DownloaderConfig())
+    parser_threads: set[str] = set()
+
+    def parse(html_doc: str) -> BeautifulSoup:
+        parser_threads.add(threading.current_thread().name)
+        return BeautifulSoup(html_doc, "html.parser")
+
+    async def run() -> tuple[float, float]:
+        ticks = [time.monotonic()]
+
+        async def tick() -> None:
+            while True:
+                await asyncio.sleep(0.001)
+                ticks.append(time.monotonic())
+
+        ticker = asyncio.ensure_future(tick())
+        await asyncio.sleep(0.01)
+        start = time.monotonic()
+        web_data = await downloader.run_parser(parse, LARGE_SERIES_PAGE)
+        chapters = await downloader.run_parser(downloader.get_all_chapters_to_url, web_data)
+        parse_duration = time.monotonic() - start
+        ticker.cancel()
+        assert len(chapters) == 10_000
+        max_gap = max(later - earlier for earlier, later in zip(ticks, ticks[1:]))
+        return parse_duration, max_gap
+
+    parse_duration, max_gap = asyncio.run(run())
+    assert parser_threads and all(name.startswith("parser") for name in parser_threads)
+    assert max_gap < parse_duration / 4
+
+
+def test_the_parser_pool_of_a_download_is_shut_down_unless_it_is_shared(tmp_path: Path):
+    shared_executor = ThreadPoolExecutor(max_workers=1)
+
+    async def run() -> Executor:
+        async with StandInServer(chapters=1, pages=2) as server:
+            config = server.config(path=str(tmp_path))
+            downloader = StandInDownloader(config, EventManager())
+            owned_executor = downloader.parser_executor
+            await downloader.download()
+            await StandInDownloader(config, EventManager(), parser_executor=shared_executor).download()
+            return owned_executor
+
+    owned_executor = asyncio.run(run())
+    with pytest.raises(RuntimeError):
+        owned_executor.submit(lambda: True)
+    assert shared_executor.submit(lambda: True).result()
+    shared_executor.shutdown()
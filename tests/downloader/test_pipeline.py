@@ -0,0 +1,62 @@
+# Standard Library
+import asyncio
+import os
+from pathlib import Path
+
+# Dependencies
+import pytest
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader import pipeline as pipeline_module
+from mangadanga.downloader.config import PipelineConfig, RetryConfig
+from mangadanga.downloader.events import EventManager
+from mangadanga.downloader.models import DownloadReport
+from mangadanga.downloader.pipeline import Pipeline
+
+
+def test_chapter_scraping_overlaps_image_downloads(tmp_path: Path):
+    async def run() -> tuple[DownloadReport, StandInServer]:
+        async with StandInServer(chapters=3, pages=20, latency=0.002) as server:
+            config = server.config(path=str(tmp_path), threads=1)
+            report = await StandInDownloader(config, EventManager()).download()
+            return report, server
+
+    report, server = asyncio.run(run())
+    assert report.completed == ["1", "2", "3"]
+    archives = sorted(name for name in os.listdir(tmp_path / "Stand-in") if name.endswith(".zip"))
+    assert archives == ["1_Chapter_1.zip", "2_Chapter_2.zip", "3_Chapter_3.zip"]
+    last_image_of_first_chapter = max(index for index, path in enumerate(server.paths) if path.startswith("/image/1-"))
+    assert server.paths.index("/chapter/2") < last_image_of_first_chapter
+
+
+def test_queue_depths_are_reported(tmp_path: Path):
+    async def run() -> Pipeline:
+        async with StandInServer(chapters=2, pages=10) as server:
+            config = server.config(path=str(tmp_path), pipeline=PipelineConfig(images_queue_size=4))
+            downloader = StandInDownloader(config, EventManager())
+            downloader.create_directory("Stand-in")
+            pipeline = Pipeline(downloader)
+            async with downloader.open_session():
+                await pipeline.run({"1": server.url("/chapter/1"), "2": server.url("/chapter/2")}, "Stand-in")
+            return pipeline
+
+    pipeline = asyncio.run(run())
+    assert pipeline.images.peak_depth == 4
+    assert "images 0/4 (peak 4)" in pipeline.queue_depths()
+
+
+def test_a_failing_cleanup_still_finishes_the_chapter(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    def locked_file(path: str) -> None:
+        raise PermissionError(f"'{path}' is in use")
+
+    monkeypatch.setattr(pipeline_module, "remove_path", locked_file)
+    missing = {f"/image/1-{page}.jpg" for page in range(3)}
+
+    async def run() -> DownloadReport:
+        async with StandInServer(chapters=1, pages=3, missing=missing) as server:
+            config = server.config(path=str(tmp_path), retry=RetryConfig(max_attempts=1))
+            return await asyncio.wait_for(StandInDownloader(config, EventManager()).download(), 5)
+
+    report = asyncio.run(run())
+    assert [failure.chapter for failure in report.failed] == ["1"]
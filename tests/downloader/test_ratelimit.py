@@ -0,0 +1,62 @@
+# Standard Library
+import asyncio
+import time
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader import DownloaderConfig, RateLimitConfig, RateLimiter, TokenBucket
+from mangadanga.downloader.ratelimit import parse_retry_after
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket(RateLimitConfig(requests_per_second=100, burst=1))
+
+    async def run() -> float:
+        start = time.monotonic()
+        for _ in range(21):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.18
+
+
+def test_token_bucket_adapts_rate():
+    config = RateLimitConfig(requests_per_second=4, min_rate=1, max_rate=5, increase_step=0.5, decrease_factor=0.5)
+    bucket = TokenBucket(config)
+    bucket.throttle(retry_after=0)
+    assert bucket.rate == 2
+    bucket.throttle(retry_after=0)
+    bucket.throttle(retry_after=0)
+    assert bucket.rate == 1
+    for _ in range(10):
+        bucket.succeed()
+    assert bucket.rate == 5
+
+
+def test_driver_domains_share_a_bucket():
+    limiter = RateLimiter(RateLimitConfig(), {"manganato.com", "chapmanganato.com"})
+    assert limiter.get_bucket("https://manganato.com/a") is limiter.get_bucket("https://chapmanganato.com/b")
+    assert limiter.get_bucket("https://manganato.com/a") is not limiter.get_bucket("https://cdn.example.com/1.jpg")
+
+
+def test_throttled_responses_are_retried_after_delay():
+    async def run() -> tuple[bytes, float, StandInServer]:
+        async with StandInServer(throttled=2, retry_after="0.1") as server:
+            downloader = StandInDownloader(DownloaderConfig(url=server.url()))
+            async with downloader.open_session():
+                start = time.monotonic()
+                image = await downloader.download_image(server.url("/image/1.jpg"))
+                ellapsed_time = time.monotonic() - start
+            return image, ellapsed_time, server
+
+    image, ellapsed_time, server = asyncio.run(run())
+    assert image == server.image_body("1.jpg")
+    assert server.requests == 3
+    assert ellapsed_time >= 0.2
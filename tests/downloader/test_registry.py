@@ -0,0 +1,63 @@
+# Standard Library
+import sys
+from importlib.metadata import EntryPoint
+
+# Dependencies
+import pytest
+
+# From apps
+from benchmarks.server import StandInDownloader
+from mangadanga.downloader import (
+    DownloaderConfig,
+    DownloaderException,
+    downloader_factory,
+    registry as registry_module,
+)
+from mangadanga.downloader.registry import BUILTIN_DRIVERS, DriverRegistry, load_driver
+
+
+def test_builtin_paths_match_the_driver_domains():
+    for domain, path in BUILTIN_DRIVERS.items():
+        assert domain in load_driver(path).DOMAINS
+    drivers = {load_driver(path) for path in BUILTIN_DRIVERS.values()}
+    assert {domain for driver in drivers for domain in driver.DOMAINS} == BUILTIN_DRIVERS.keys()
+
+
+def test_drivers_are_imported_when_their_domain_is_first_used(monkeypatch: pytest.MonkeyPatch):
+    module = "mangadanga.downloader.drivers.mangatown"
+    monkeypatch.delitem(sys.modules, module, raising=False)
+    registry = DriverRegistry(BUILTIN_DRIVERS, discover=False)
+    registry.get("manganato.com")
+    assert module not in sys.modules
+    driver = registry.get("www.mangatown.com")
+    assert module in sys.modules
+    assert driver is not None and registry.drivers["www.mangatown.com"] is driver
+
+
+def test_entry_points_are_discovered_on_unknown_domains(monkeypatch: pytest.MonkeyPatch):
+    entry_point = EntryPoint("127.0.0.1", "benchmarks.server:StandInDownloader", registry_module.ENTRY_POINT_GROUP)
+    calls = []
+
+    def fake_entry_points(group: str) -> list[EntryPoint]:
+        calls.append(group)
+        return [entry_point]
+
+    monkeypatch.setattr(registry_module, "entry_points", fake_entry_points)
+    registry = DriverRegistry(BUILTIN_DRIVERS)
+    assert registry.get("manganato.com") is not None
+    assert calls == []
+    assert registry.get("127.0.0.1") is StandInDownloader
+    assert registry.get("example.com") is None
+    assert calls == [registry_module.ENTRY_POINT_GROUP]
+
+
+def test_factory_lists_the_known_domains():
+    with pytest.raises(DownloaderException, match="www.mangatown.com"):
+        downloader_factory(DownloaderConfig(url="https://example.com/manga"))
+    downloader = downloader_factory(DownloaderConfig(url="http://127.0.0.1:1/"), {StandInDownloader})
+    assert isinstance(downloader, StandInDownloader)
+
+
+def test_paths_that_are_not_drivers_are_rejected():
+    with pytest.raises(DownloaderException, match="not a Downloader driver"):
+        load_driver("mangadanga.downloader.config:DownloaderConfig")
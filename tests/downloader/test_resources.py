@@ -0,0 +1,50 @@
+# Standard Library
+import asyncio
+import threading
+
+# Dependencies
+import pytest
+
+# From apps
+from mangadanga.downloader.resources import SharedResource, Worker
+
+
+class CountingResource(SharedResource):
+    def __init__(self) -> None:
+        super().__init__()
+        self.setups = 0
+        self.teardowns = 0
+
+    async def setup(self) -> None:
+        self.setups += 1
+
+    async def teardown(self) -> None:
+        self.teardowns += 1
+
+
+def test_a_shared_resource_is_set_up_by_the_first_user_and_torn_down_by_the_last():
+    async def run() -> CountingResource:
+        resource = CountingResource()
+        await asyncio.gather(resource.open(), resource.open())
+        await resource.close()
+        assert resource.teardowns == 0
+        await resource.close()
+        return resource
+
+    resource = asyncio.run(run())
+    assert (resource.setups, resource.teardowns, resource.users) == (1, 1, 0)
+
+
+def test_a_worker_runs_in_its_own_thread_only_while_started():
+    async def run() -> None:
+        worker = Worker("test-worker")
+        with pytest.raises(ValueError):
+            await worker.run(threading.current_thread)
+        worker.start()
+        thread = await worker.run(threading.current_thread)
+        assert thread.name.startswith("test-worker")
+        worker.stop()
+        with pytest.raises(ValueError):
+            await worker.run(threading.current_thread)
+
+    asyncio.run(run())
@@ -0,0 +1,90 @@
+# Standard Library
+import asyncio
+import os
+from pathlib import Path
+from zipfile import ZipFile
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader.config import RetryConfig
+from mangadanga.downloader.events import EventManager
+from mangadanga.downloader.manifest import MANIFEST_NAME, Manifest
+from mangadanga.downloader.models import DownloadReport, ImageRecord
+
+FAST_RETRIES = RetryConfig(max_attempts=1)
+PAGES = 10
+
+
+def download(path: Path, missing: set[str] | None = None) -> tuple[DownloadReport, StandInServer]:
+    async def run() -> tuple[DownloadReport, StandInServer]:
+        async with StandInServer(chapters=3, pages=PAGES, missing=missing) as server:
+            config = server.config(path=str(path), threads=3, retry=FAST_RETRIES)
+            report = await StandInDownloader(config, EventManager()).download()
+            return report, server
+
+    return asyncio.run(run())
+
+
+def test_rerun_skips_finished_chapters_and_completes_partial_archives(tmp_path: Path):
+    report, _ = download(tmp_path, missing={"/image/2-5.jpg"})
+    assert [failure.chapter for failure in report.failed] == ["2"]
+    series_path = tmp_path / "Stand-in"
+    with ZipFile(series_path / "2_Chapter_2.zip.part") as zipf:
+        partial_images = set(zipf.namelist())
+    assert partial_images and "0005.jpg" not in partial_images
+
+    report, server = download(tmp_path)
+    assert report.skipped == ["1", "3"]
+    assert report.completed == ["2"]
+    assert not any(path.endswith(("/1", "/3")) or path.startswith(("/image/1-", "/image/3-")) for path in server.paths)
+    downloaded_images = [path for path in server.paths if path.startswith("/image/2-")]
+    assert len(downloaded_images) == PAGES - len(partial_images)
+    assert not (series_path / "2_Chapter_2.zip.part").exists()
+    with ZipFile(series_path / "2_Chapter_2.zip") as zipf:
+        assert sorted(zipf.namelist()) == [f"{index:04}.jpg" for index in range(PAGES)]
+        assert zipf.read("0005.jpg") == server.image_body("2-5.jpg")
+
+
+def test_unreadable_partial_archive_starts_the_chapter_over(tmp_path: Path):
+    download(tmp_path, missing={"/image/2-5.jpg"})
+    series_path = tmp_path / "Stand-in"
+    # A crash leaves the archive without its central directory
+    part_path = series_path / "2_Chapter_2.zip.part"
+    part_path.write_bytes(part_path.read_bytes()[:100])
+
+    report, server = download(tmp_path)
+    assert report.completed == ["2"]
+    assert len([path for path in server.paths if path.startswith("/image/2-")]) == PAGES
+    with ZipFile(series_path / "2_Chapter_2.zip") as zipf:
+        assert len(zipf.namelist()) == PAGES
+
+
+def test_manifest_ignores_a_truncated_last_line(tmp_path: Path):
+    async def record() -> None:
+        manifest = Manifest(str(tmp_path))
+        await manifest.open()
+        await manifest.resume_chapter("1", "https://example.com/1", "1_Chapter.zip")
+        await manifest.record_image("1", "0000.jpg", ImageRecord(size=10, sha256="a" * 64))
+        await manifest.close()
+
+    async def reload() -> Manifest:
+        manifest = Manifest(str(tmp_path))
+        await manifest.open()
+        await manifest.close()
+        return manifest
+
+    asyncio.run(record())
+    with open(tmp_path / MANIFEST_NAME, "a") as file:
+        file.write('{"event": "image", "chapter": "1", "na')
+    manifest = asyncio.run(reload())
+    assert list(manifest.chapters["1"].images) == ["0000.jpg"]
+    assert os.path.getsize(tmp_path / MANIFEST_NAME) < 300
+
+
+def test_archives_downloaded_before_the_manifest_are_skipped(tmp_path: Path):
+    download(tmp_path)
+    os.remove(tmp_path / "Stand-in" / MANIFEST_NAME)
+
+    report, server = download(tmp_path)
+    assert report.skipped == ["1", "2", "3"]
+    assert server.paths == ["/"]
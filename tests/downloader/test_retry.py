@@ -0,0 +1,153 @@
+# Standard Library
+import asyncio
+import os
+from pathlib import Path
+
+# Dependencies
+import pytest
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader.config import RateLimitConfig, RetryConfig
+from mangadanga.downloader.events import EventManager
+from mangadanga.downloader.exceptions import CircuitOpenException, RequestException
+from mangadanga.downloader.models import DownloadReport
+from mangadanga.downloader.retry import CircuitBreaker, RetryPolicy
+
+FAST_RETRIES = RetryConfig(base_delay=0.01, max_delay=0.05, failure_threshold=100)
+
+
+def test_backoff_grows_exponentially_up_to_max_delay():
+    policy = RetryPolicy(RetryConfig(base_delay=1, max_delay=5, jitter=False))
+    assert [policy.get_delay(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+    jittered_policy = RetryPolicy(RetryConfig(base_delay=1, max_delay=5))
+    assert all(0 <= jittered_policy.get_delay(3) <= 5 for _ in range(20))
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    url = "https://cdn.example.com/1.jpg"
+    breaker.record_failure(url)
+    breaker.check(url)
+    breaker.record_failure(url)
+    with pytest.raises(CircuitOpenException):
+        breaker.check("https://cdn.example.com/2.jpg")
+    breaker.check("https://other.example.com/1.jpg")
+    asyncio.run(asyncio.sleep(0.06))
+    breaker.check(url)
+    with pytest.raises(CircuitOpenException):
+        breaker.check(url)
+    breaker.record_success(url)
+    breaker.check(url)
+
+
+def test_transient_errors_are_retried():
+    async def run() -> tuple[bytes, StandInServer]:
+        async with StandInServer(errors=2) as server:
+            downloader = StandInDownloader(server.config(retry=FAST_RETRIES))
+            async with downloader.open_session():
+                image = await downloader.download_image(server.url("/image/1.jpg"))
+            return image, server
+
+    image, server = asyncio.run(run())
+    assert image == server.image_body("1.jpg")
+    assert server.requests == 3
+
+
+def test_missing_resources_are_not_retried():
+    async def run() -> StandInServer:
+        async with StandInServer(missing={"/image/1.jpg"}) as server:
+            downloader = StandInDownloader(server.config(retry=FAST_RETRIES))
+            async with downloader.open_session():
+                with pytest.raises(RequestException):
+                    await downloader.download_image(server.url("/image/1.jpg"))
+            return server
+
+    assert asyncio.run(run()).requests == 1
+
+
+def test_failed_chapters_are_reported_without_stopping_the_others(tmp_path: Path):
+    async def run() -> DownloadReport:
+        async with StandInServer(chapters=3, pages=4, missing={"/image/2-3.jpg"}) as server:
+            config = server.config(path=str(tmp_path), threads=3, retry=FAST_RETRIES)
+            return await StandInDownloader(config, EventManager()).download()
+
+    report = asyncio.run(run())
+    assert report.completed == ["1", "3"]
+    assert [failure.chapter for failure in report.failed] == ["2"]
+    archives = sorted(name for name in os.listdir(tmp_path / "Stand-in") if name.endswith(".zip"))
+    assert archives == ["1_Chapter_1.zip", "3_Chapter_3.zip"]
+
+
+def test_a_probe_answered_with_an_error_status_closes_the_circuit():
+    async def run() -> None:
+        policy = RetryPolicy(RetryConfig(failure_threshold=1, reset_timeout=0.01))
+        url = "https://cdn.example.com/1.jpg"
+        policy.circuit_breaker.record_failure(url)
+        await asyncio.sleep(0.02)
+
+        async def missing() -> bytes:
+            raise RequestException(url, 404)
+
+        async def found() -> bytes:
+            return b"image"
+
+        with pytest.raises(RequestException):
+            await policy.call(url, missing)
+        assert await policy.call(url, found) == b"image"
+
+    asyncio.run(run())
+
+
+def test_a_cancelled_probe_lets_another_request_probe_the_host():
+    async def run() -> None:
+        policy = RetryPolicy(RetryConfig(failure_threshold=1, reset_timeout=0.01))
+        url = "https://cdn.example.com/1.jpg"
+        policy.circuit_breaker.record_failure(url)
+        await asyncio.sleep(0.02)
+
+        async def hang() -> bytes:
+            await asyncio.sleep(10)
+            return b""
+
+        async def found() -> bytes:
+            return b"image"
+
+        probe = asyncio.create_task(policy.call(url, hang))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenException):
+            await policy.call(url, found)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        assert await policy.call(url, found) == b"image"
+
+    asyncio.run(run())
+
+
+def test_waiting_out_a_retry_after_is_not_timed_as_an_attempt():
+    async def run() -> tuple[bytes, StandInServer]:
+        async with StandInServer(throttled=1, retry_after="0.3") as server:
+            retry = RetryConfig(max_attempts=1, attempt_timeout=0.1, failure_threshold=1)
+            downloader = StandInDownloader(server.config(retry=retry))
+            async with downloader.open_session():
+                image = await downloader.download_image(server.url("/image/1.jpg"))
+            return image, server
+
+    image, server = asyncio.run(run())
+    assert image == server.image_body("1.jpg")
+    assert server.requests == 2
+
+
+def test_waiting_for_the_rate_limiter_does_not_spend_the_deadline(tmp_path: Path):
+    async def run() -> DownloadReport:
+        async with StandInServer(chapters=1, pages=20) as server:
+            config = server.config(
+                path=str(tmp_path),
+                rate_limit=RateLimitConfig(requests_per_second=10, burst=1, max_rate=10),
+                retry=RetryConfig(max_attempts=1, deadline=0.5),
+            )
+            return await StandInDownloader(config, EventManager()).download()
+
+    report = asyncio.run(run())
+    assert report.completed == ["1"]
+    assert report.failed == []
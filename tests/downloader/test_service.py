@@ -0,0 +1,80 @@
+# Standard Library
+import asyncio
+import threading
+from pathlib import Path
+
+# Dependencies
+import pytest
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader import ConcurrencyConfig, DownloaderConfig, DownloaderException, DownloadService
+from mangadanga.downloader.catalog import CATALOG_NAME
+from mangadanga.downloader.events import EventManager
+from mangadanga.downloader.metrics import METRICS_NAME
+from mangadanga.downloader.models import DownloadReport
+
+
+def test_jobs_submitted_from_another_thread_share_the_loop_and_connections(tmp_path: Path):
+    servers = [StandInServer(chapters=2, pages=3, title=title) for title in ("Series A", "Series B")]
+    server_loop = asyncio.new_event_loop()
+    server_thread = threading.Thread(target=server_loop.run_forever, daemon=True)
+    server_thread.start()
+    for server in servers:
+        asyncio.run_coroutine_threadsafe(server.__aenter__(), server_loop).result(5)
+    config = servers[0].config(path=str(tmp_path))
+    service = DownloadService(config, series=1, event_manager=EventManager(), downloaders={StandInDownloader})
+    service.start()
+    try:
+        futures = [service.submit(config.model_copy(update={"url": server.url()})) for server in servers]
+        reports = [future.result(10) for future in futures]
+        connector = service.connector
+        assert connector is not None and not connector.closed
+    finally:
+        service.stop(5)
+        for server in servers:
+            asyncio.run_coroutine_threadsafe(server.__aexit__(None, None, None), server_loop).result(5)
+        server_loop.call_soon_threadsafe(server_loop.stop)
+        server_thread.join(5)
+        server_loop.close()
+    assert [(report.title, report.completed) for report in reports] == [
+        ("Series_A", ["1", "2"]),
+        ("Series_B", ["1", "2"]),
+    ]
+    assert connector.closed
+    assert service.thread is None and service.pending == 0
+
+
+def test_jobs_of_unknown_sites_fail_their_future(tmp_path: Path):
+    service = DownloadService(DownloaderConfig(path=str(tmp_path)), downloaders={StandInDownloader})
+    with pytest.raises(DownloaderException):
+        service.submit(DownloaderConfig(url="https://example.com/manga"))
+    service.start()
+    try:
+        future = service.submit(DownloaderConfig(url="https://example.com/manga"))
+        with pytest.raises(DownloaderException, match="not covered"):
+            future.result(5)
+    finally:
+        service.stop(5)
+
+
+def test_jobs_use_their_own_limits_and_download_path(tmp_path: Path):
+    async def run() -> tuple[DownloadService, DownloadReport]:
+        async with StandInServer(chapters=2, pages=3) as server:
+            service = DownloadService(
+                DownloaderConfig(path=str(tmp_path / "default")),
+                event_manager=EventManager(),
+                downloaders={StandInDownloader},
+            )
+            config = server.config(path=str(tmp_path / "chosen"), threads=3, concurrency=ConcurrencyConfig(images=2))
+            report = await service.download(config)
+            await service.shutdown()
+            return service, report
+
+    service, report = asyncio.run(run())
+    assert report.completed == ["1", "2"]
+    [scheduler] = service.schedulers.values()
+    assert scheduler.chapters.value == 3 and scheduler.images.value == 2
+    assert (tmp_path / "chosen" / CATALOG_NAME).exists()
+    assert (tmp_path / "chosen" / METRICS_NAME).exists()
+    assert not (tmp_path / "default").exists()
@@ -0,0 +1,51 @@
+# Standard Library
+import asyncio
+import os
+from pathlib import Path
+
+# Dependencies
+import pytest
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader import DownloaderConfig, DownloaderException
+from mangadanga.downloader.events import EventManager
+
+
+def test_requests_outside_open_session_fail():
+    downloader = StandInDownloader(DownloaderConfig())
+    with pytest.raises(DownloaderException):
+        asyncio.run(downloader.download_image("http://127.0.0.1/image/0.jpg"))
+
+
+def test_pooled_session_reuses_connections():
+    async def run() -> StandInServer:
+        async with StandInServer() as server:
+            config = server.config()
+            config.connection.limit_per_host = 2
+            downloader = StandInDownloader(config)
+            async with downloader.open_session():
+                urls = [server.url(f"/image/{i}.jpg") for i in range(50)]
+                images = await asyncio.gather(*(downloader.download_image(url) for url in urls))
+            assert downloader.session is None
+            assert images[7] == server.image_body("7.jpg")
+            return server
+
+    server = asyncio.run(run())
+    assert server.requests == 50
+    assert len(server.connections) <= 2
+
+
+def test_download_uses_a_single_session(tmp_path: Path):
+    async def run() -> StandInServer:
+        async with StandInServer(chapters=3, pages=5) as server:
+            config = server.config(path=str(tmp_path), threads=3)
+            config.connection.limit_per_host = 4
+            await StandInDownloader(config, EventManager()).download()
+            return server
+
+    server = asyncio.run(run())
+    archives = sorted(name for name in os.listdir(tmp_path / "Stand-in") if name.endswith(".zip"))
+    assert archives == ["1_Chapter_1.zip", "2_Chapter_2.zip", "3_Chapter_3.zip"]
+    assert server.requests == 1 + 3 + 3 * 5
+    assert len(server.connections) <= 4
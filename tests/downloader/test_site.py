@@ -0,0 +1,70 @@
+# Standard Library
+import asyncio
+from pathlib import Path
+from zipfile import ZipFile
+
+# Dependencies
+import pytest
+
+# From apps
+from benchmarks.download import RETRIES, CaseResult, compare
+from benchmarks.site import LAYOUTS, FakeMangaSite
+from mangadanga.downloader.events import EventManager
+from mangadanga.downloader.models import DownloadReport
+
+
+def download(tmp_path: Path, layout: str, **kwargs) -> tuple[DownloadReport, FakeMangaSite]:
+    async def run() -> tuple[DownloadReport, FakeMangaSite]:
+        async with FakeMangaSite(layout, chapters=3, pages=4, image_size=500, **kwargs) as site:
+            config = site.config(path=str(tmp_path), retry=RETRIES)
+            report = await site.driver()(config, EventManager()).download()
+            return report, site
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_every_driver_downloads_the_fake_site(tmp_path: Path, layout: str):
+    report, site = download(tmp_path, layout)
+    assert report.title == "Solo_Leveling"
+    assert report.completed == ["1", "2", "3"] and report.failed == []
+    archives = sorted((tmp_path / "Solo_Leveling").glob("*.zip"))
+    assert len(archives) == 3
+    with ZipFile(archives[0]) as zipf:
+        assert sorted(zipf.namelist()) == [f"{index:04}.jpg" for index in range(4)]
+        assert all(len(zipf.read(name)) == 500 for name in zipf.namelist())
+    assert len([path for path in site.paths if path.startswith("/image/")]) >= site.images
+
+
+def test_injected_errors_are_retried_and_the_bandwidth_is_capped(tmp_path: Path):
+    report, site = download(tmp_path, "manganato", error_rate=0.2, bandwidth=50_000, seed=1)
+    assert report.completed == ["1", "2", "3"]
+    assert site.requests > 1 + 3 + site.images
+    # 12 images of 500 bytes, at most 50 000 bytes per second each
+    assert site.times[-1] - site.times[0] > 0.01
+
+
+def test_benchmark_comparison_flags_regressions_past_the_tolerance():
+    def result(images_per_second: float, request_p99: float, peak_memory_mib: float) -> CaseResult:
+        return CaseResult(
+            layout="manganato",
+            images=8,
+            threads=2,
+            elapsed_seconds=1.0,
+            images_per_second=images_per_second,
+            bytes_per_second=1.0,
+            peak_memory_mib=peak_memory_mib,
+            chapter_p50=0.1,
+            chapter_p99=0.2,
+            request_p50=0.02,
+            request_p95=0.03,
+            request_p99=request_p99,
+            retries=0,
+            failed_chapters=0,
+        )
+
+    baseline = [result(100, 0.05, 10)]
+    assert compare([result(90, 0.055, 11)], baseline) == []
+    regressions = compare([result(80, 0.07, 12)], baseline)
+    assert len(regressions) == 3
+    assert regressions[0].startswith("manganato images=8 threads=2: throughput")
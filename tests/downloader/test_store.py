@@ -0,0 +1,78 @@
+# Standard Library
+import asyncio
+import os
+from pathlib import Path
+from zipfile import ZipFile
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader import ArchiveConfig, ImageStore, StoreConfig
+from mangadanga.downloader.events import EventManager
+from mangadanga.downloader.store import STORE_NAME
+
+CHAPTERS = 5
+PAGES = 3
+
+
+def download(path: Path, **kwargs) -> StandInServer:
+    async def run() -> StandInServer:
+        async with StandInServer(chapters=CHAPTERS, pages=PAGES, credits=1) as server:
+            config = server.config(path=str(path), store=StoreConfig(enabled=True), **kwargs)
+            await StandInDownloader(config, EventManager()).download()
+            return server
+
+    return asyncio.run(run())
+
+
+def load_store(path: Path) -> ImageStore:
+    async def run() -> ImageStore:
+        store = ImageStore(str(path / STORE_NAME))
+        await store.open()
+        await store.close()
+        return store
+
+    return asyncio.run(run())
+
+
+def test_known_duplicate_urls_are_not_fetched_again(tmp_path: Path):
+    server = download(tmp_path)
+    credits_requests = server.paths.count("/image/credits-0.jpg")
+    # The url is known to be a duplicate once two chapters have referenced it
+    assert credits_requests == 2
+    for chapter in range(1, CHAPTERS + 1):
+        with ZipFile(tmp_path / "Stand-in" / f"{chapter}_Chapter_{chapter}.zip") as zipf:
+            assert zipf.read(f"{PAGES:04}.jpg") == server.image_body("credits-0.jpg")
+    store = load_store(tmp_path)
+    [credits_sha256] = [sha256 for url, sha256 in store.urls.items() if url.endswith("/image/credits-0.jpg")]
+    assert store.references[credits_sha256] == CHAPTERS
+    # Only the repeated content is kept in the store
+    assert [os.path.basename(path) for _, _, files in os.walk(store.objects_path) for path in files] == [
+        credits_sha256
+    ]
+
+
+def test_folder_output_links_duplicates_to_one_copy(tmp_path: Path):
+    server = download(tmp_path, archive=ArchiveConfig(format="folder"))
+    credits = [tmp_path / "Stand-in" / f"{chapter}_Chapter_{chapter}" / f"{PAGES:04}.jpg" for chapter in range(1, 6)]
+    assert credits[0].read_bytes() == server.image_body("credits-0.jpg")
+    assert len({credit.stat().st_ino for credit in credits}) == 1
+    assert sorted(os.listdir(tmp_path / "Stand-in" / "1_Chapter_1")) == [f"{index:04}.jpg" for index in range(4)]
+
+
+def test_released_images_leave_the_store(tmp_path: Path):
+    async def run() -> ImageStore:
+        store = ImageStore(str(tmp_path))
+        await store.open()
+        with open(tmp_path / "image.jpg", "w+b") as file:
+            file.write(b"credits")
+            for _ in range(2):
+                await store.reference("https://example.com/credits.jpg", "ab" * 32, file)
+        assert store.has_object("ab" * 32)
+        for _ in range(2):
+            await store.release("ab" * 32)
+        await store.close()
+        return store
+
+    store = asyncio.run(run())
+    assert not store.has_object("ab" * 32)
+    assert store.references == {}
@@ -0,0 +1,72 @@
+# Standard Library
+import asyncio
+from pathlib import Path
+
+# Dependencies
+import aiohttp
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader import BatchReport, DownloaderConfig, LibrarySync, read_watchlist
+from mangadanga.downloader.events import EventManager
+
+
+def sync(path: Path, chapters: dict[str, int]) -> tuple[BatchReport, dict[str, StandInServer]]:
+    async def run() -> tuple[BatchReport, dict[str, StandInServer]]:
+        servers = {title: StandInServer(chapters=count, pages=3, title=title) for title, count in chapters.items()}
+        for server in servers.values():
+            await server.__aenter__()
+        try:
+            config = next(iter(servers.values())).config(path=str(path), threads=2)
+            urls = [server.url() for server in servers.values()]
+            library_sync = LibrarySync(config, urls, event_manager=EventManager(), downloaders={StandInDownloader})
+            return await library_sync.run(), servers
+        finally:
+            for server in servers.values():
+                await server.__aexit__(None, None, None)
+
+    return asyncio.run(run())
+
+
+def test_sync_downloads_only_new_chapters(tmp_path: Path):
+    report, _ = sync(tmp_path, {"Series A": 3, "Series B": 2})
+    assert sorted((series.title, series.completed) for series in report.series) == [
+        ("Series_A", ["1", "2", "3"]),
+        ("Series_B", ["1", "2"]),
+    ]
+
+    report, servers = sync(tmp_path, {"Series A": 4, "Series B": 2})
+    series_by_title = {series.title: series for series in report.series}
+    assert series_by_title["Series_A"].completed == ["4"]
+    assert series_by_title["Series_A"].skipped == ["1", "2", "3"]
+    assert series_by_title["Series_B"].completed == []
+    assert servers["Series A"].paths == ["/", "/chapter/4"] + [f"/image/4-{i}.jpg" for i in range(3)]
+    assert servers["Series B"].paths == ["/"]
+    assert "Downloaded 2 series: 1 new chapters downloaded, 0 chapters failed" in report.summary
+
+
+def test_series_share_one_concurrency_budget(tmp_path: Path):
+    async def run() -> None:
+        config = DownloaderConfig(path=str(tmp_path))
+        library_sync = LibrarySync(config, [], downloaders={StandInDownloader})
+        connector = aiohttp.TCPConnector()
+        try:
+            first = library_sync.create_downloader(config.model_copy(update={"url": "http://127.0.0.1:1/"}), connector)
+            second = library_sync.create_downloader(
+                config.model_copy(update={"url": "http://127.0.0.1:2/"}), connector
+            )
+        finally:
+            await connector.close()
+        for downloader in (first, second):
+            assert downloader.scheduler is library_sync.scheduler
+            assert downloader.rate_limiter is library_sync.rate_limiter
+            assert downloader.parser_executor is library_sync.parser_executor
+            assert downloader.connector is connector
+
+    asyncio.run(run())
+
+
+def test_read_watchlist(tmp_path: Path):
+    watchlist = tmp_path / "watchlist.txt"
+    watchlist.write_text("# Ongoing\nhttps://manganato.com/manga-a\n\n  https://www.mangatown.com/manga/b/  \n")
+    assert read_watchlist(str(watchlist)) == ["https://manganato.com/manga-a", "https://www.mangatown.com/manga/b/"]
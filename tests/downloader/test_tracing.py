@@ -0,0 +1,65 @@
+# Standard Library
+import asyncio
+import json
+from pathlib import Path
+
+# From apps
+from benchmarks.server import StandInDownloader, StandInServer
+from mangadanga.downloader.config import TracingConfig
+from mangadanga.downloader.events import EventManager
+from mangadanga.downloader.profiling import PROFILE_NAME, Profiler
+from mangadanga.downloader.tracing import Tracer
+
+
+def test_download_writes_a_chrome_trace_of_every_stage(tmp_path: Path):
+    trace_path = tmp_path / "trace.json"
+
+    async def run() -> None:
+        async with StandInServer(chapters=2, pages=3) as server:
+            config = server.config(path=str(tmp_path), tracing=TracingConfig(path=str(trace_path)))
+            await StandInDownloader(config, EventManager()).download()
+
+    asyncio.run(run())
+    trace = json.loads(trace_path.read_text())
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    names = {span["name"] for span in spans}
+    assert {
+        "pipeline",
+        "scrape_url",
+        "fetch_html",
+        "parse",
+        "get_images_src",
+        "download_image",
+        "fetch_image",
+    } <= names
+    assert {"chapters", "resolve", "images", "archive", "write_entry"} <= names
+    images = sorted((span["args"]["chapter"], span["args"]["image"]) for span in spans if span["name"] == "images")
+    assert images == [(chapter, image) for chapter in ("1", "2") for image in range(3)]
+    assert all(span["dur"] >= 0 for span in spans)
+    rows = {event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"}
+    # The work handed to the parser and archive threads is on their own rows
+    assert any(row.startswith("parser") for row in rows)
+    assert any(row.startswith("archive-writer") for row in rows)
+    assert any(row.startswith("images ") for row in rows)
+
+
+def test_tracer_without_a_path_records_nothing():
+    tracer = Tracer()
+    with tracer.span("scrape_url", url="https://example.com"):
+        pass
+    assert tracer.wrap("parse", len)("abc") == 3
+    assert tracer.events == []
+
+    tracer = Tracer("trace.json", max_events=1)
+    for _ in range(3):
+        with tracer.span("scrape_url"):
+            pass
+    assert len(tracer.events) == 1 and tracer.dropped == 2
+
+
+def test_profiler_writes_cpu_and_memory_reports(tmp_path: Path):
+    with Profiler(str(tmp_path), limit=5):
+        sorted(str(number) for number in range(10_000))
+    report = (tmp_path / f"{PROFILE_NAME}.txt").read_text()
+    assert "CPU hotspots" in report and "Memory peak" in report
+    assert (tmp_path / f"{PROFILE_NAME}.prof").stat().st_size > 0